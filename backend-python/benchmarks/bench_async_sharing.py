@@ -0,0 +1,112 @@
+"""
+并发负载下的分片运算延迟基准
+对比内联执行与进程池执行时，任务延迟与事件循环阻塞（心跳延迟）的分布
+用法: python -m benchmarks.bench_async_sharing --size 1048576 --concurrency 16 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from typing import Any, Dict, List
+
+from config.settings import settings
+from utils.async_sharing_util import AsyncSharingUtil
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """计算百分位数（毫秒）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 2)
+
+
+async def _heartbeat(interval: float, lags: List[float], stop: asyncio.Event):
+    """按固定间隔唤醒，记录实际唤醒时间与预期的偏差（事件循环被阻塞的程度）"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _job(payload: bytes, k: int, n: int, latencies: List[float]):
+    """一次分割 + 恢复"""
+    start = time.perf_counter()
+    shares = (await AsyncSharingUtil.split_payloads([payload], k, n))[0]
+    recovered = (await AsyncSharingUtil.recover_payloads([shares[:k]]))[0]
+    latencies.append(time.perf_counter() - start)
+    if recovered != payload:
+        raise RuntimeError('恢复结果不一致')
+
+
+async def _run_once(size: int, concurrency: int, k: int, n: int) -> Dict[str, Any]:
+    """并发执行一批任务，统计任务延迟与心跳延迟"""
+    payloads = [os.urandom(size) for _ in range(concurrency)]
+    latencies: List[float] = []
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    heartbeat = asyncio.create_task(_heartbeat(0.001, lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(_job(payload, k, n, latencies) for payload in payloads))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await heartbeat
+
+    return {
+        'total_ms': round(elapsed * 1000, 2),
+        'job_p50_ms': _percentile(latencies, 50),
+        'job_p99_ms': _percentile(latencies, 99),
+        'loop_lag_p99_ms': _percentile(lags, 99),
+        'loop_lag_max_ms': round(max(lags, default=0.0) * 1000, 2),
+        'loop_lag_mean_ms': round(statistics.fmean(lags) * 1000, 2) if lags else 0.0,
+    }
+
+
+def run(size: int, concurrency: int, k: int, n: int, workers: int, max_in_flight: int) -> List[Dict[str, Any]]:
+    """分别以内联和进程池方式执行并返回统计结果"""
+    results = []
+    for mode, enabled in (('inline', False), ('process_pool', True)):
+        settings.SHARING_EXECUTOR_ENABLED = enabled
+        settings.SHARING_PROCESS_WORKERS = workers
+        settings.SHARING_MAX_IN_FLIGHT = max_in_flight
+        settings.SHARING_INLINE_THRESHOLD = 0
+        AsyncSharingUtil.shutdown()
+        try:
+            if enabled:
+                # 预热：进程启动与模块导入不计入统计
+                asyncio.run(_run_once(1024, workers, k, n))
+            row = asyncio.run(_run_once(size, concurrency, k, n))
+        finally:
+            AsyncSharingUtil.shutdown()
+        results.append({'mode': mode, 'size': size, 'concurrency': concurrency, **row})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='并发负载下的分片运算延迟基准')
+    parser.add_argument('--size', type=int, default=1024 * 1024)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--n', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-in-flight', type=int, default=8)
+    args = parser.parse_args()
+
+    print(
+        f'{"mode":>13} {"total ms":>10} {"job p50":>10} {"job p99":>10} '
+        f'{"lag p99":>10} {"lag max":>10} {"lag mean":>10}'
+    )
+    for row in run(args.size, args.concurrency, args.k, args.n, args.workers, args.max_in_flight):
+        print(
+            f'{row["mode"]:>13} {row["total_ms"]:>10} {row["job_p50_ms"]:>10} {row["job_p99_ms"]:>10} '
+            f'{row["loop_lag_p99_ms"]:>10} {row["loop_lag_max_ms"]:>10} {row["loop_lag_mean_ms"]:>10}'
+        )
+
+
+if __name__ == '__main__':
+    main()
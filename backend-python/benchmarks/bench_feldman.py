@@ -0,0 +1,87 @@
+"""
+Feldman 分片校验基准：逐个校验与随机线性组合批量校验的耗时对比
+用法: python -m benchmarks.bench_feldman --orders 100 1000 --k 3 --n 5
+"""
+
+import argparse
+import time
+
+from typing import Any, Dict, List
+
+from utils.feldman_util import FeldmanVSSUtil
+
+
+def _build_items(orders: int, k: int, n: int) -> List[tuple]:
+    """生成 orders 个订单的全部分片"""
+    items = []
+    for _ in range(orders):
+        shares, commitments = FeldmanVSSUtil.split(FeldmanVSSUtil.random_secret(), k, n)
+        commitments = tuple(commitments)
+        items.extend((x, y, commitments) for x, y in enumerate(shares, start=1))
+    return items
+
+
+def run(order_counts: List[int], k: int, n: int, corrupted: int) -> List[Dict[str, Any]]:
+    """统计分割、逐个校验、批量校验与定位无效分片的耗时"""
+    FeldmanVSSUtil.pow_g(1)  # 预热固定基预计算表
+
+    results = []
+    for orders in order_counts:
+        start = time.perf_counter()
+        items = _build_items(orders, k, n)
+        split_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single_ok = all(FeldmanVSSUtil.verify_share(*item) for item in items)
+        single_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_ok = FeldmanVSSUtil.batch_verify(items)
+        batch_elapsed = time.perf_counter() - start
+
+        if not (single_ok and batch_ok):
+            raise RuntimeError('有效分片校验失败')
+
+        step = max(1, len(items) // max(corrupted, 1))
+        for index in range(0, min(len(items), step * corrupted), step):
+            x, y, commitments = items[index]
+            items[index] = (x, (y + 1) % FeldmanVSSUtil.Q, commitments)
+
+        start = time.perf_counter()
+        invalid = FeldmanVSSUtil.find_invalid(items)
+        locate_elapsed = time.perf_counter() - start
+
+        results.append({
+            'orders': orders,
+            'shares': len(items),
+            'split_ms': round(split_elapsed * 1000, 2),
+            'single_ms': round(single_elapsed * 1000, 2),
+            'batch_ms': round(batch_elapsed * 1000, 2),
+            'speedup': round(single_elapsed / batch_elapsed, 1) if batch_elapsed > 0 else None,
+            'invalid_found': len(invalid),
+            'locate_ms': round(locate_elapsed * 1000, 2),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Feldman 分片校验基准')
+    parser.add_argument('--orders', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--n', type=int, default=5)
+    parser.add_argument('--corrupted', type=int, default=2, help='篡改的分片数，用于统计定位耗时')
+    args = parser.parse_args()
+
+    print(
+        f'{"orders":>8} {"shares":>8} {"split ms":>10} {"single ms":>10} {"batch ms":>10} '
+        f'{"speedup":>8} {"invalid":>8} {"locate ms":>10}'
+    )
+    for row in run(args.orders, args.k, args.n, args.corrupted):
+        print(
+            f'{row["orders"]:>8} {row["shares"]:>8} {row["split_ms"]:>10} {row["single_ms"]:>10} '
+            f'{row["batch_ms"]:>10} {row["speedup"]:>8} {row["invalid_found"]:>8} {row["locate_ms"]:>10}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+GF(256) 秘密共享吞吐量基准
+用法: python -m benchmarks.bench_gf256 --sizes 1024 1048576 --k 3 --n 5 --batch 10000
+"""
+
+import argparse
+import os
+import time
+
+from typing import Any, Dict, List
+
+from utils.gf256_util import GF256SecretSharing
+
+
+def _throughput(payload_size: int, elapsed: float) -> float:
+    """计算吞吐量（MB/s）"""
+    return payload_size / (1024 * 1024) / elapsed if elapsed > 0 else float('inf')
+
+
+def run(sizes: List[int], k: int, n: int, rounds: int) -> List[Dict[str, Any]]:
+    """对不同大小的载荷执行分割/恢复并统计吞吐量"""
+    results = []
+    for size in sizes:
+        secret = os.urandom(size)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            shares = GF256SecretSharing.split(secret, k, n)
+        split_elapsed = (time.perf_counter() - start) / rounds
+
+        xs = list(range(1, k + 1))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            recovered = GF256SecretSharing.recover(xs, shares[:k])
+        recover_elapsed = (time.perf_counter() - start) / rounds
+
+        if recovered != secret:
+            raise RuntimeError(f'恢复结果不一致: size={size}')
+
+        results.append({
+            'size': size,
+            'k': k,
+            'n': n,
+            'split_mb_s': round(_throughput(size, split_elapsed), 2),
+            'recover_mb_s': round(_throughput(size, recover_elapsed), 2),
+        })
+    return results
+
+
+def run_batch(count: int, size: int, k: int, n: int) -> Dict[str, Any]:
+    """对比逐个分割与 split_many 批量分割的耗时"""
+    payloads = [os.urandom(size) for _ in range(count)]
+
+    start = time.perf_counter()
+    for payload in payloads:
+        GF256SecretSharing.split(payload, k, n)
+    loop_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    GF256SecretSharing.split_many(payloads, k, n)
+    batch_elapsed = time.perf_counter() - start
+
+    return {
+        'count': count,
+        'size': size,
+        'loop_ms': round(loop_elapsed * 1000, 2),
+        'batch_ms': round(batch_elapsed * 1000, 2),
+        'speedup': round(loop_elapsed / batch_elapsed, 1) if batch_elapsed > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GF(256) 秘密共享吞吐量基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024])
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--n', type=int, default=5)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--batch', type=int, default=0, help='批量分割的载荷数量，0 表示跳过')
+    parser.add_argument('--batch-size', type=int, default=512, help='批量分割时单个载荷大小')
+    args = parser.parse_args()
+
+    print(f'{"size(B)":>12} {"k":>3} {"n":>3} {"split MB/s":>12} {"recover MB/s":>14}')
+    for row in run(args.sizes, args.k, args.n, args.rounds):
+        print(f'{row["size"]:>12} {row["k"]:>3} {row["n"]:>3} {row["split_mb_s"]:>12} {row["recover_mb_s"]:>14}')
+
+    if args.batch:
+        row = run_batch(args.batch, args.batch_size, args.k, args.n)
+        print(
+            f'split_many: {row["count"]} x {row["size"]}B  '
+            f'loop {row["loop_ms"]}ms  batch {row["batch_ms"]}ms  x{row["speedup"]}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+随机系数生成基准：逐个调用 CSPRNG 与随机数池批量分发对比
+用法: python -m benchmarks.bench_random_pool --counts 4 64 1024 --threads 4
+"""
+
+import argparse
+import os
+import secrets
+import threading
+import time
+
+from typing import Any, Callable, Dict, List
+
+from utils.feldman_util import FeldmanVSSUtil
+from utils.random_pool_util import RandomPoolUtil
+
+PRIME_127 = 2**127 - 1
+
+
+def _per_call_us(func: Callable[[], Any], rounds: int) -> float:
+    """单次调用耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def _threaded_us(func: Callable[[], Any], rounds: int, threads: int) -> float:
+    """多线程并发调用时的平均单次耗时（微秒，按总调用次数折算）"""
+    workers = [threading.Thread(target=lambda: [func() for _ in range(rounds)]) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (rounds * threads) * 1e6
+
+
+def run(counts: List[int], rounds: int, threads: int) -> List[Dict[str, Any]]:
+    """
+    对每个批次大小比较：
+    - 大整数系数：secrets.randbelow 逐个生成 vs randbelow_many（2^127-1 与 Feldman 子群阶 Q）
+    - 字节系数：每次 os.urandom vs random_array
+    """
+    pool = RandomPoolUtil.default()
+    results = []
+    for count in counts:
+        for label, bound in (('p127', PRIME_127), ('q256', FeldmanVSSUtil.Q)):
+            results.append({
+                'kind': label,
+                'count': count,
+                'baseline_us': round(_per_call_us(lambda: [secrets.randbelow(bound) for _ in range(count)], rounds), 2),
+                'pool_us': round(_per_call_us(lambda: pool.randbelow_many(bound, count), rounds), 2),
+                'pool_threads_us': round(_threaded_us(lambda: pool.randbelow_many(bound, count), rounds, threads), 2),
+            })
+
+        results.append({
+            'kind': 'bytes',
+            'count': count,
+            'baseline_us': round(_per_call_us(lambda: os.urandom(count), rounds), 2),
+            'pool_us': round(_per_call_us(lambda: pool.random_array((count,)), rounds), 2),
+            'pool_threads_us': round(_threaded_us(lambda: pool.random_array((count,)), rounds, threads), 2),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='随机系数生成基准')
+    parser.add_argument('--counts', type=int, nargs='+', default=[4, 64, 1024])
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f'{"kind":>6} {"count":>6} {"per-call us":>12} {"pool us":>10} {"pool(threads) us":>17}')
+    for row in run(args.counts, args.rounds, args.threads):
+        print(
+            f'{row["kind"]:>6} {row["count"]:>6} {row["baseline_us"]:>12} {row["pool_us"]:>10} '
+            f'{row["pool_threads_us"]:>17}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+流式分割/恢复基准：吞吐量与内存峰值（与一次性读入内存的分割对比）
+用法: python -m benchmarks.bench_stream --sizes 16777216 67108864 --chunk-size 1048576
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from typing import Any, Dict, List
+
+from utils.gf256_util import GF256SecretSharing
+
+
+def _write_random_file(path: str, size: int, block: int = 4 * 1024 * 1024):
+    """生成指定大小的随机文件"""
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            f.write(os.urandom(min(block, remaining)))
+            remaining -= block
+
+
+def _mb(size: int) -> float:
+    return round(size / (1024 * 1024), 2)
+
+
+def run(sizes: List[int], k: int, n: int, chunk_size: int) -> List[Dict[str, Any]]:
+    """对不同大小的文件执行流式分割/恢复，统计吞吐量与 tracemalloc 峰值"""
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            source = os.path.join(workdir, 'source.bin')
+            restored = os.path.join(workdir, 'restored.bin')
+            share_paths = [os.path.join(workdir, f'share_{i}.bin') for i in range(n)]
+            _write_random_file(source, size)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            with open(source, 'rb') as reader:
+                writers = [open(path, 'wb') for path in share_paths]
+                try:
+                    GF256SecretSharing.split_stream(reader, writers, k, chunk_size)
+                finally:
+                    for writer in writers:
+                        writer.close()
+            split_elapsed = time.perf_counter() - start
+            split_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+            start = time.perf_counter()
+            readers = [open(path, 'rb') for path in share_paths[n - k :]]
+            try:
+                with open(restored, 'wb') as writer:
+                    GF256SecretSharing.reconstruct_stream(readers, writer)
+            finally:
+                for reader in readers:
+                    reader.close()
+            recover_elapsed = time.perf_counter() - start
+            recover_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+            # 对照：整体读入内存后一次性分割
+            with open(source, 'rb') as f:
+                data = f.read()
+            GF256SecretSharing.split(data, k, n)
+            in_memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del data
+
+            with open(source, 'rb') as a, open(restored, 'rb') as b:
+                if a.read() != b.read():
+                    raise RuntimeError(f'恢复结果不一致: size={size}')
+
+        results.append({
+            'size': size,
+            'split_mb_s': round(size / (1024 * 1024) / split_elapsed, 2),
+            'recover_mb_s': round(size / (1024 * 1024) / recover_elapsed, 2),
+            'split_peak_mb': _mb(split_peak),
+            'recover_peak_mb': _mb(recover_peak),
+            'in_memory_peak_mb': _mb(in_memory_peak),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='流式分割/恢复基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16 * 1024 * 1024, 64 * 1024 * 1024])
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--n', type=int, default=5)
+    parser.add_argument('--chunk-size', type=int, default=GF256SecretSharing.STREAM_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print(
+        f'{"size(B)":>12} {"split MB/s":>11} {"recover MB/s":>13} '
+        f'{"split peak MB":>14} {"recover peak MB":>16} {"in-memory MB":>13}'
+    )
+    for row in run(args.sizes, args.k, args.n, args.chunk_size):
+        print(
+            f'{row["size"]:>12} {row["split_mb_s"]:>11} {row["recover_mb_s"]:>13} '
+            f'{row["split_peak_mb"]:>14} {row["recover_peak_mb"]:>16} {row["in_memory_peak_mb"]:>13}'
+        )
+
+
+if __name__ == '__main__':
+    main()
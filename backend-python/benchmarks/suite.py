@@ -0,0 +1,489 @@
+"""
+秘密共享基准测试套件
+覆盖各分片方案 × k/n × 载荷大小，统计分割/恢复吞吐量、p50/p99 延迟、内存分配与分片体积开销，
+结果可保存为 JSON 基线，后续运行与基线对比以发现性能回退
+
+用法:
+    python -m benchmarks.suite --profile quick
+    python -m benchmarks.suite --profile quick --save-baseline
+    python -m benchmarks.suite --profile full --compare --tolerance 0.3
+    pytest benchmarks            # 使用 BENCH_PROFILE（默认 smoke）并与对应基线对比
+"""
+
+import argparse
+import base64
+import json
+import os
+import platform
+import secrets
+import statistics
+import sys
+import time
+import tracemalloc
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from module_dvss.service.encryption_service import EncryptionService
+from utils.crypto_util import SecretSharingUtil
+from utils.gf256_util import GF256SecretSharing
+from utils.ida_util import IDAUtil
+from utils.packed_sharing_util import PackedSharingUtil
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# 参与回归对比的指标：(指标名, 数值越大越好)
+COMPARED_METRICS = (
+    ('split_mb_s', True),
+    ('recover_mb_s', True),
+    ('split_p99_ms', False),
+    ('recover_p99_ms', False),
+)
+
+# 低于该值的延迟主要反映调度与计时抖动，不参与回退判断
+LATENCY_NOISE_FLOOR_MS = 1.0
+
+
+class Scheme(NamedTuple):
+    """
+    分片方案适配器
+
+    split(payload, k, n) 返回 (分片列表, 集中存储的字节数, 恢复上下文)；
+    recover(context, shares) 由 k 个分片及分割时的上下文（如集中存储的密文）恢复载荷
+    """
+
+    name: str
+    split: Callable[[bytes, int, int], Tuple[List[Any], int, Any]]
+    recover: Callable[[Any, Sequence[Any]], bytes]
+    share_size: Callable[[Any], int]
+    max_size: Optional[int] = None
+    # 恢复所需分片数 threshold(k, n)，为空时为 k
+    threshold: Optional[Callable[[int, int], int]] = None
+
+    def needed(self, k: int, n: int) -> int:
+        return self.threshold(k, n) if self.threshold else k
+
+
+class Case(NamedTuple):
+    """单个基准用例"""
+
+    scheme: str
+    k: int
+    n: int
+    size: int
+
+    @property
+    def case_id(self) -> str:
+        return f'{self.scheme}/k{self.k}/n{self.n}/{self.size}'
+
+
+class Profile(NamedTuple):
+    """参数网格"""
+
+    ks: Tuple[int, ...]
+    ns: Tuple[int, ...]
+    sizes: Tuple[int, ...]
+    schemes: Tuple[str, ...]
+    time_budget: float
+    max_rounds: int
+
+
+# 旧版整数域实现（素数 2^127-1）只能正确处理不超过 15 字节的秘密
+LEGACY_MAX_SIZE = 15
+
+_KB = 1024
+_MB = 1024 * 1024
+
+ALL_SCHEMES = ('gf256', 'legacy_prime', 'encryption_service', 'hybrid', 'dispersal', 'ida', 'packed')
+
+PROFILES: Dict[str, Profile] = {
+    'smoke': Profile((2, 3), (3, 5), (64, 4 * _KB), ALL_SCHEMES, 0.1, 50),
+    'quick': Profile((2, 3, 5, 10), (5, 10, 15), (64, 4 * _KB, 256 * _KB, _MB), ALL_SCHEMES, 0.3, 100),
+    'full': Profile(
+        tuple(range(2, 11)),
+        tuple(range(3, 16)),
+        (64, _KB, 16 * _KB, 256 * _KB, _MB, 10 * _MB),
+        ALL_SCHEMES,
+        0.5,
+        200,
+    ),
+}
+
+
+def _service_split(payload: bytes, k: int, n: int) -> Tuple[List[bytes], int, None]:
+    return EncryptionService(None).create_shares({'data': payload.decode('ascii')}, k, n), 0, None
+
+
+def _service_recover(context: None, shares: Sequence[bytes]) -> bytes:
+    return EncryptionService(None).reconstruct_secret(list(shares))['data'].encode('ascii')
+
+
+def _legacy_split(payload: bytes, k: int, n: int) -> Tuple[List[str], int, None]:
+    return SecretSharingUtil().split_secret(payload.decode('ascii'), k, n), 0, None
+
+
+def _legacy_recover(context: None, shares: Sequence[str]) -> bytes:
+    return SecretSharingUtil().reconstruct_secret(list(shares)).encode('ascii')
+
+
+def _envelope_scheme(mode: str) -> Scheme:
+    """混合/分散模式：集中存储的密文计入分片体积"""
+
+    def split(payload: bytes, k: int, n: int) -> Tuple[List[bytes], int, Tuple[str, str]]:
+        algorithm, shares, ciphertext, _ = EncryptionService.encrypt_payloads([('BENCH', payload)], k, n, mode)[0]
+        encrypted_data = base64.b64encode(ciphertext).decode('ascii') if ciphertext else ''
+        return shares, len(ciphertext) if ciphertext else 0, (algorithm, encrypted_data)
+
+    def recover(context: Tuple[str, str], shares: Sequence[bytes]) -> bytes:
+        algorithm, encrypted_data = context
+        return EncryptionService.decrypt_payload(algorithm, 'BENCH', encrypted_data, shares)
+
+    return Scheme(mode, split, recover, len)
+
+
+# 打包共享方案：载荷按 32 字节切分为多个字段值，模拟订单中大量短字段
+PACKED_FIELD_SIZE = 32
+PACKED_PACK_SIZE = 2
+
+
+def _packed_split(payload: bytes, k: int, n: int) -> Tuple[List[bytes], int, None]:
+    values = [payload[i : i + PACKED_FIELD_SIZE] for i in range(0, len(payload), PACKED_FIELD_SIZE)]
+    return PackedSharingUtil.split_values(values, k, n, _packed_pack_size(k, n)), 0, None
+
+
+def _packed_pack_size(k: int, n: int) -> int:
+    return min(PACKED_PACK_SIZE, n - k + 1)
+
+
+def _packed_recover(context: None, shares: Sequence[bytes]) -> bytes:
+    return b''.join(PackedSharingUtil.recover_values(shares))
+
+
+SCHEMES: Dict[str, Scheme] = {
+    'gf256': Scheme(
+        'gf256',
+        lambda payload, k, n: (GF256SecretSharing.split_payload(payload, k, n), 0, None),
+        lambda context, shares: GF256SecretSharing.recover_payload(shares),
+        len,
+    ),
+    'legacy_prime': Scheme('legacy_prime', _legacy_split, _legacy_recover, len, LEGACY_MAX_SIZE),
+    'encryption_service': Scheme('encryption_service', _service_split, _service_recover, len),
+    'hybrid': _envelope_scheme('hybrid'),
+    'dispersal': _envelope_scheme('dispersal'),
+    'ida': Scheme(
+        'ida',
+        lambda payload, k, n: (IDAUtil.disperse_payload(payload, k, n), 0, None),
+        lambda context, shares: IDAUtil.reconstruct_payload(shares),
+        len,
+    ),
+    'packed': Scheme(
+        'packed',
+        _packed_split,
+        _packed_recover,
+        len,
+        threshold=lambda k, n: PackedSharingUtil.threshold(k, _packed_pack_size(k, n)),
+    ),
+}
+
+
+def build_cases(profile: Profile) -> List[Case]:
+    """展开参数网格；超出方案支持范围的载荷大小以方案上限代替（去重）"""
+    cases = []
+    seen = set()
+    for scheme_name in profile.schemes:
+        scheme = SCHEMES[scheme_name]
+        for k in profile.ks:
+            for n in profile.ns:
+                if k > n:
+                    continue
+                for size in profile.sizes:
+                    if scheme.max_size is not None:
+                        size = min(size, scheme.max_size)
+                    case = Case(scheme_name, k, n, size)
+                    if case not in seen:
+                        seen.add(case)
+                        cases.append(case)
+    return cases
+
+
+def _make_payload(size: int) -> bytes:
+    """生成可打印ASCII载荷（字符串接口的方案也可直接使用）"""
+    return base64.b64encode(secrets.token_bytes(size))[:size]
+
+
+def _percentile(samples: Sequence[float], percent: float) -> float:
+    """百分位数（毫秒）"""
+    return float(np.percentile(np.asarray(samples) * 1000, percent))
+
+
+def _measure_allocations(func: Callable[[], Any]) -> int:
+    """tracemalloc 统计单次调用的内存分配峰值（字节）"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(case: Case, profile: Profile) -> Dict[str, Any]:
+    """
+    执行单个用例
+
+    先各执行一次以预热并估算耗时，随后在时间预算内重复测量（至少 5 次，最多 max_rounds 次）；
+    恢复使用最后若干个分片，避免总是命中 x=1..k 的拉格朗日基
+    """
+    scheme = SCHEMES[case.scheme]
+    payload = _make_payload(case.size)
+    needed = scheme.needed(case.k, case.n)
+
+    shares, central_bytes, context = scheme.split(payload, case.k, case.n)
+    subset = shares[case.n - needed :]
+    if scheme.recover(context, subset) != payload:
+        raise AssertionError(f'{case.case_id}: 恢复结果与原载荷不一致')
+
+    start = time.perf_counter()
+    shares, central_bytes, context = scheme.split(payload, case.k, case.n)
+    scheme.recover(context, shares[case.n - needed :])
+    estimate = time.perf_counter() - start
+    rounds = max(5, min(profile.max_rounds, int(profile.time_budget / max(estimate, 1e-9))))
+
+    split_samples = []
+    recover_samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        shares, central_bytes, context = scheme.split(payload, case.k, case.n)
+        split_samples.append(time.perf_counter() - start)
+
+        subset = shares[case.n - needed :]
+        start = time.perf_counter()
+        scheme.recover(context, subset)
+        recover_samples.append(time.perf_counter() - start)
+
+    split_alloc = _measure_allocations(lambda: scheme.split(payload, case.k, case.n))
+    recover_alloc = _measure_allocations(lambda: scheme.recover(context, subset))
+
+    stored_bytes = sum(scheme.share_size(share) for share in shares) + central_bytes
+    split_median = statistics.median(split_samples)
+    recover_median = statistics.median(recover_samples)
+    return {
+        'scheme': case.scheme,
+        'k': case.k,
+        'n': case.n,
+        'size': case.size,
+        'rounds': rounds,
+        'split_mb_s': round(case.size / _MB / split_median, 3) if split_median > 0 else None,
+        'recover_mb_s': round(case.size / _MB / recover_median, 3) if recover_median > 0 else None,
+        'split_p50_ms': round(_percentile(split_samples, 50), 4),
+        'split_p99_ms': round(_percentile(split_samples, 99), 4),
+        'recover_p50_ms': round(_percentile(recover_samples, 50), 4),
+        'recover_p99_ms': round(_percentile(recover_samples, 99), 4),
+        'split_alloc_kb': round(split_alloc / 1024, 1),
+        'recover_alloc_kb': round(recover_alloc / 1024, 1),
+        'share_bytes': scheme.share_size(shares[0]),
+        'stored_bytes': stored_bytes,
+        'overhead': round(stored_bytes / case.size, 3),
+    }
+
+
+def iter_results(profile: Profile, cases: Optional[Sequence[Case]] = None) -> Iterator[Tuple[Case, Dict[str, Any]]]:
+    """依次执行用例（先空跑首个用例，避免冷启动计入首个结果）"""
+    cases = list(cases) if cases is not None else build_cases(profile)
+    if cases:
+        run_case(cases[0], profile)
+    for case in cases:
+        yield case, run_case(case, profile)
+
+
+def baseline_path(profile_name: str) -> str:
+    return os.path.join(BASELINE_DIR, f'{profile_name}.json')
+
+
+def calibrate(rounds: int = 15) -> float:
+    """
+    测量与本仓库代码无关的参考负载耗时（毫秒，取中位数）
+
+    基线中记录该值，对比时按当前/基线的比值缩放期望值，抵消机器差异和整体负载波动
+    """
+    data = np.frombuffer(secrets.token_bytes(_MB), dtype=np.uint8)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        sum(i * i for i in range(50000))
+        np.bitwise_xor(data, data[::-1])
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def load_baseline(profile_name: str) -> Dict[str, Any]:
+    """读取基线文档（meta + results），不存在时返回空字典"""
+    path = baseline_path(profile_name)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def baseline_scale(baseline: Dict[str, Any], calibration_ms: float) -> float:
+    """当前机器相对基线机器的耗时比（>1 表示当前更慢）"""
+    expected = baseline.get('meta', {}).get('calibration_ms')
+    return calibration_ms / expected if expected else 1.0
+
+
+def save_baseline(profile_name: str, results: Dict[str, Dict[str, Any]], calibration_ms: float):
+    """保存基线（附带运行环境信息与参考负载耗时，便于判断基线是否可比）"""
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    document = {
+        'meta': {
+            'profile': profile_name,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'calibration_ms': round(calibration_ms, 4),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+    with open(baseline_path(profile_name), 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    metrics=COMPARED_METRICS,
+    scale: float = 1.0,
+) -> List[str]:
+    """
+    与基线对比
+
+    Args:
+        result: 本次结果
+        baseline: 基线中同一用例的结果
+        tolerance: 允许的相对偏差
+        metrics: 参与对比的指标
+        scale: 当前机器相对基线机器的耗时比，用于缩放期望值
+
+    Returns:
+        回退描述列表；吞吐量低于基线 (1 - tolerance) 倍、或延迟高于基线 (1 + tolerance) 倍视为回退
+    """
+    regressions = []
+    for metric, higher_is_better in metrics:
+        current = result.get(metric)
+        expected = baseline.get(metric)
+        if current is None or not expected:
+            continue
+        expected = round(expected / scale if higher_is_better else expected * scale, 4)
+        if not higher_is_better and max(current, expected) < LATENCY_NOISE_FLOOR_MS:
+            continue
+        if higher_is_better and current < expected * (1 - tolerance):
+            regressions.append(f'{metric}: {current} < 基线 {expected}（已按机器耗时比缩放）')
+        elif not higher_is_better and current > expected * (1 + tolerance):
+            regressions.append(f'{metric}: {current} > 基线 {expected}（已按机器耗时比缩放）')
+    return regressions
+
+
+def check_case(
+    case: Case,
+    profile: Profile,
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    metrics=COMPARED_METRICS,
+    scale: float = 1.0,
+    retries: int = 2,
+) -> List[str]:
+    """
+    对比基线，出现回退时重新测量确认
+
+    每次重测后各指标取最优值（吞吐量取最大、延迟取最小），偶发的调度抖动不会被误报为回退
+    """
+    regressions = compare(result, baseline, tolerance, metrics, scale)
+    for _ in range(retries):
+        if not regressions:
+            break
+        retry = run_case(case, profile)
+        for metric, higher_is_better in metrics:
+            values = [v for v in (result.get(metric), retry.get(metric)) if v is not None]
+            if values:
+                result[metric] = max(values) if higher_is_better else min(values)
+        regressions = compare(result, baseline, tolerance, metrics, scale)
+    return regressions
+
+
+def _print_row(row: Dict[str, Any], note: str = ''):
+    print(
+        f'{row["scheme"]:>18} {row["k"]:>3} {row["n"]:>3} {row["size"]:>9} {row["split_mb_s"]!s:>10} '
+        f'{row["recover_mb_s"]!s:>10} {row["split_p50_ms"]:>10} {row["split_p99_ms"]:>10} '
+        f'{row["recover_p50_ms"]:>10} {row["recover_p99_ms"]:>10} {row["split_alloc_kb"]:>10} '
+        f'{row["overhead"]:>8} {note}'
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='秘密共享基准测试套件')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--schemes', nargs='+', choices=ALL_SCHEMES, help='只运行指定方案')
+    parser.add_argument('--k', type=int, nargs='+', help='覆盖 profile 的 k 取值')
+    parser.add_argument('--n', type=int, nargs='+', help='覆盖 profile 的 n 取值')
+    parser.add_argument('--sizes', type=int, nargs='+', help='覆盖 profile 的载荷大小')
+    parser.add_argument('--save-baseline', action='store_true', help='将结果写入 benchmarks/baselines/<profile>.json')
+    parser.add_argument('--compare', action='store_true', help='与基线对比，存在回退时返回非零退出码')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='允许的相对偏差')
+    parser.add_argument('--output', help='将结果另存为 JSON 文件')
+    args = parser.parse_args(argv)
+
+    profile = PROFILES[args.profile]
+    profile = profile._replace(
+        schemes=tuple(args.schemes or profile.schemes),
+        ks=tuple(args.k or profile.ks),
+        ns=tuple(args.n or profile.ns),
+        sizes=tuple(args.sizes or profile.sizes),
+    )
+    baseline = load_baseline(args.profile) if args.compare else {}
+    baseline_results = baseline.get('results', {})
+    calibration_ms = calibrate()
+    scale = baseline_scale(baseline, calibration_ms)
+    print(f'参考负载: {calibration_ms:.3f} ms' + (f'，相对基线耗时比 {scale:.2f}' if baseline else ''))
+
+    print(
+        f'{"scheme":>18} {"k":>3} {"n":>3} {"size":>9} {"split MB/s":>10} {"recov MB/s":>10} '
+        f'{"split p50":>10} {"split p99":>10} {"recov p50":>10} {"recov p99":>10} {"alloc KB":>10} '
+        f'{"overhead":>8}'
+    )
+    results: Dict[str, Dict[str, Any]] = {}
+    regression_count = 0
+    for case, row in iter_results(profile):
+        results[case.case_id] = row
+        note = ''
+        if case.case_id in baseline_results:
+            regressions = check_case(case, profile, row, baseline_results[case.case_id], args.tolerance, scale=scale)
+            regression_count += bool(regressions)
+            note = '回退: ' + '; '.join(regressions) if regressions else ''
+        _print_row(row, note)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, sort_keys=True)
+    if args.save_baseline:
+        if args.schemes or args.k or args.n or args.sizes:
+            # 只更新本次运行覆盖的用例，保留基线中的其他用例
+            merged = load_baseline(args.profile).get('results', {})
+            merged.update(results)
+            results = merged
+        save_baseline(args.profile, results, calibration_ms)
+        print(f'基线已保存: {baseline_path(args.profile)}')
+    if args.compare:
+        print(f'对比基线: {len(baseline_results)} 个用例，{regression_count} 个回退')
+        return 1 if regression_count else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
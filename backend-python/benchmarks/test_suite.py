@@ -0,0 +1,44 @@
+"""
+秘密共享基准测试套件的 pytest 入口
+
+    pytest benchmarks                                                   # smoke 网格，只做正确性检查
+    BENCH_COMPARE=1 BENCH_PROFILE=quick BENCH_TOLERANCE=0.3 pytest benchmarks
+
+每个用例校验恢复结果正确；设置 BENCH_COMPARE=1 且 benchmarks/baselines/<profile>.json 中存在该用例时，
+对比吞吐量，重测后仍低于基线 (1 - BENCH_TOLERANCE) 倍时失败。
+共享 CPU 的 CI 机器上吞吐量波动可达数倍，因此默认不做基线对比，应在固定的性能测试机上开启
+"""
+
+import os
+
+import pytest
+
+from benchmarks.suite import PROFILES, baseline_scale, build_cases, calibrate, check_case, load_baseline, run_case
+
+PROFILE_NAME = os.getenv('BENCH_PROFILE', 'smoke')
+PROFILE = PROFILES[PROFILE_NAME]
+TOLERANCE = float(os.getenv('BENCH_TOLERANCE', '0.5'))
+COMPARE_ENABLED = os.getenv('BENCH_COMPARE', '0') == '1'
+
+# 小载荷的单次耗时在几十微秒量级，尾延迟受调度抖动影响大，pytest 下只对比吞吐量（中位数）
+THROUGHPUT_METRICS = (('split_mb_s', True), ('recover_mb_s', True))
+
+CASES = build_cases(PROFILE)
+BASELINE = load_baseline(PROFILE_NAME) if COMPARE_ENABLED else {}
+
+
+@pytest.fixture(scope='module')
+def scale():
+    """当前机器相对基线机器的耗时比"""
+    return baseline_scale(BASELINE, calibrate()) if BASELINE else 1.0
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case.case_id for case in CASES])
+def test_sharing_benchmark(case, scale):
+    result = run_case(case, PROFILE)
+
+    assert result['overhead'] >= 1
+    baseline = BASELINE.get('results', {}).get(case.case_id)
+    if baseline:
+        regressions = check_case(case, PROFILE, result, baseline, TOLERANCE, THROUGHPUT_METRICS, scale)
+        assert not regressions, f'{case.case_id} 性能回退: ' + '; '.join(regressions)
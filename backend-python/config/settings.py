@@ -70,6 +70,12 @@ class Settings(BaseSettings):
     # 加密配置
     ENCRYPTION_ALGORITHM: str = 'AES-256-GCM'
     KEY_DERIVATION_ITERATIONS: int = 100000
+    # 订单序列化后超过该字节数时，使用AES-GCM加密订单并仅对数据密钥进行秘密共享
+    ENCRYPTION_HYBRID_THRESHOLD: int = 1024
+    # 超过阈值的订单所用模式：hybrid（密文集中存储一份）/ dispersal（密文经IDA分散到各分片，每片约1/k）
+    ENCRYPTION_LARGE_ORDER_MODE: str = 'hybrid'
+    # 按字段打包共享（packed 模式）时每个多项式嵌入的秘密数量，恢复阈值相应提高为 k + 该值 - 1（不超过 n）
+    ENCRYPTION_FIELD_PACK_SIZE: int = 2
 
     # 分片配置
     DEFAULT_SHARD_SIZE: int = 1000
@@ -90,6 +96,52 @@ class Settings(BaseSettings):
     # 密钥共享配置
     SECRET_SHARING_THRESHOLD: int = 3
     SECRET_SHARING_TOTAL: int = 5
+    # 分片/重构运算的进程池：工作进程数（0 表示按CPU核数），小于内联阈值（字节）的任务直接在事件循环中执行，
+    # 同时提交到进程池的任务数不超过 SHARING_MAX_IN_FLIGHT
+    SHARING_EXECUTOR_ENABLED: bool = True
+    SHARING_PROCESS_WORKERS: int = 0
+    SHARING_INLINE_THRESHOLD: int = 64 * 1024
+    SHARING_MAX_IN_FLIGHT: int = 8
+    # 随机系数池每次从 os.urandom 读取的字节数（双缓冲，后台预填充）
+    RANDOM_POOL_BLOCK_SIZE: int = 1024 * 1024
+    # 分片读取：只读取k个分片，某个节点的请求超过其延迟预算（平滑延迟 + 4倍平滑偏差，不低于最小对冲延迟）
+    # 或失败时向下一个节点发出对冲请求；连续失败的节点在冷却时间内排在最后
+    SHARD_READ_HEDGE_MIN_DELAY_MS: int = 20
+    SHARD_READ_TIMEOUT_SECONDS: float = 10.0
+    SHARD_READ_FAILURE_COOLDOWN_SECONDS: float = 30.0
+    # 解密订单缓存（默认关闭）：按 (加密订单ID, 数据哈希) 缓存重构结果，按字节数LRU淘汰，
+    # 条目有效期较短；开启加密时缓存内容以进程内随机密钥进行AES-GCM加密
+    DECRYPT_CACHE_ENABLED: bool = False
+    DECRYPT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    DECRYPT_CACHE_TTL_SECONDS: float = 60.0
+    DECRYPT_CACHE_ENCRYPT: bool = True
+    # 信封加密：主密钥（base64编码的32字节，未配置时由 SECRET_KEY 派生）包装KEK，KEK包装每批次的数据密钥；
+    # 开启分片信封加密后新分片以批次数据密钥加密保存。解包后的数据密钥在进程内缓存，超过有效期后重新解包
+    KEY_MASTER_KEY: str = ''
+    SHARD_ENVELOPE_ENABLED: bool = False
+    KEY_CACHE_TTL_SECONDS: float = 300.0
+    KEY_CACHE_MAX_KEYS: int = 4096
+    # 分片巡检（默认关闭）：后台按分片ID游标分批重新计算分片数据的SHA-256，与校验和不一致的分片标记为 corrupted；
+    # 哈希在线程池中计算，读取速率不超过 SHARD_SCRUB_BYTES_PER_SECOND；
+    # 一轮结束后间隔 SHARD_SCRUB_PASS_INTERVAL_SECONDS 开始下一轮
+    SHARD_SCRUB_ENABLED: bool = False
+    SHARD_SCRUB_BYTES_PER_SECOND: int = 8 * 1024 * 1024
+    SHARD_SCRUB_BATCH_SIZE: int = 500
+    SHARD_SCRUB_WORKERS: int = 2
+    SHARD_SCRUB_PASS_INTERVAL_SECONDS: float = 3600.0
+    # CSV上传流式导入：每次从上传文件读取的字节数，每批解析并处理（校验、评分、保存、加密）的行数
+    UPLOAD_STREAM_CHUNK_BYTES: int = 1024 * 1024
+    UPLOAD_BATCH_ROWS: int = 1000
+    # 上传任务：上传文件先保存到 UPLOAD_DIR 下并创建任务，由后台工作协程领取处理；
+    # 任务在数据库中按条件更新领取，多个应用实例共享同一数据库与上传目录即可横向扩展，
+    # UPLOAD_JOB_WORKERS 为每个实例的工作协程数（为0时该实例只接收上传不处理任务）；
+    # 心跳超过 UPLOAD_JOB_STALE_SECONDS 未更新的运行中任务视为工作进程已退出，由其他工作协程从已处理的行继续
+    UPLOAD_JOB_WORKERS: int = 1
+    UPLOAD_JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    UPLOAD_JOB_STALE_SECONDS: float = 300.0
+    UPLOAD_JOB_MAX_ATTEMPTS: int = 3
+    # 批量写入（订单、加密订单、分片）时每条 INSERT 语句的行数
+    DB_BULK_INSERT_ROWS: int = 1000
 
     class Config:
         env_file = '.env'
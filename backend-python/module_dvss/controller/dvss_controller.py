@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.deps import get_current_user, get_db
 from exceptions.custom_exception import AuthorizationError, NotFoundError, ValidationError
 from module_dvss.service.dvss_service import DVSSService
+from module_dvss.service.upload_job_service import UploadJobService
 from utils.log_util import LogUtil
 from utils.response_util import ResponseUtil
 
@@ -32,16 +33,11 @@ async def upload_orders(
         if not any(file.filename.endswith(ext) for ext in allowed_extensions):
             raise ValidationError('只支持CSV和Excel文件格式')
 
-        # 读取文件内容
-        file_content = await file.read()
+        # 按块保存上传文件并创建任务，由后台工作协程处理
+        upload_job_service = UploadJobService(db)
+        result = await upload_job_service.create_job(read=file.read, filename=file.filename, user_id=current_user.id)
 
-        # 处理订单上传
-        dvss_service = DVSSService(db)
-        result = await dvss_service.process_order_upload(
-            file_data=file_content, filename=file.filename, current_user_id=current_user.id
-        )
-
-        return ResponseUtil.success(data=result, message='订单上传成功')
+        return ResponseUtil.success(data=result, message='上传任务已创建')
 
     except ValidationError as e:
         return ResponseUtil.error(message=str(e), code=400)
@@ -52,6 +48,24 @@ async def upload_orders(
         return ResponseUtil.error(message=f'订单上传失败: {str(e)}')
 
 
+@router.get('/jobs/{job_id}')
+async def get_upload_job(job_id: int, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)):
+    """获取上传任务进度（已处理行数、各阶段耗时、吞吐量与失败行）"""
+    try:
+        upload_job_service = UploadJobService(db)
+        result = await upload_job_service.get_job(job_id, current_user.id)
+
+        return ResponseUtil.success(data=result, message='获取上传任务成功')
+
+    except NotFoundError as e:
+        return ResponseUtil.error(message=str(e), code=404)
+    except AuthorizationError as e:
+        return ResponseUtil.error(message=str(e), code=403)
+    except Exception as e:
+        logger.error(f'获取上传任务失败: {str(e)}')
+        return ResponseUtil.error(message=f'获取上传任务失败: {str(e)}')
+
+
 @router.post('/query')
 async def query_orders(request: dict, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)):
     """查询订单"""
@@ -3,8 +3,13 @@ Metrics控制器
 提供Prometheus监控指标
 """
 
+from typing import Any, List, Tuple
+
 from fastapi import APIRouter
 
+from module_dvss.service.shard_scrub_service import ShardScrubService
+from utils.payload_cache_util import PayloadCacheUtil
+
 router = APIRouter()
 
 
@@ -36,4 +41,48 @@ dvss_orders_total 50
 dvss_encrypted_orders_total 25
 """
 
-    return metrics_data.strip()
+    return metrics_data.strip() + '\n\n' + _decrypt_cache_metrics() + '\n\n' + _shard_scrub_metrics()
+
+
+def _decrypt_cache_metrics() -> str:
+    """解密订单缓存指标"""
+    stats = PayloadCacheUtil.default().stats()
+    metrics = [
+        ('dvss_decrypt_cache_hits_total', 'counter', 'Decrypted order cache hits', stats['hits']),
+        ('dvss_decrypt_cache_misses_total', 'counter', 'Decrypted order cache misses', stats['misses']),
+        ('dvss_decrypt_cache_evictions_total', 'counter', 'Entries evicted by the size bound', stats['evictions']),
+        ('dvss_decrypt_cache_expirations_total', 'counter', 'Entries dropped after the TTL', stats['expirations']),
+        ('dvss_decrypt_cache_invalidations_total', 'counter', 'Entries invalidated', stats['invalidations']),
+        ('dvss_decrypt_cache_hit_ratio', 'gauge', 'Decrypted order cache hit ratio', stats['hit_ratio']),
+        ('dvss_decrypt_cache_entries', 'gauge', 'Cached decrypted orders', stats['entries']),
+        ('dvss_decrypt_cache_bytes', 'gauge', 'Bytes held by the decrypted order cache', stats['bytes']),
+    ]
+    return _format_metrics(metrics)
+
+
+def _shard_scrub_metrics() -> str:
+    """分片巡检指标（本进程）"""
+    stats = ShardScrubService.stats()
+    metrics = [
+        ('dvss_shard_scrub_shards_total', 'counter', 'Shards hashed by the scrubber', stats['shards_total']),
+        ('dvss_shard_scrub_bytes_total', 'counter', 'Shard bytes hashed by the scrubber', stats['bytes_total']),
+        ('dvss_shard_scrub_corrupt_total', 'counter', 'Corrupt shards found by the scrubber', stats['corrupt_total']),
+        ('dvss_shard_scrub_passes_total', 'counter', 'Completed scrub passes', stats['passes_total']),
+        ('dvss_shard_scrub_hash_seconds_total', 'counter', 'Time spent hashing shards', stats['hash_seconds_total']),
+        (
+            'dvss_shard_scrub_throughput_bytes_per_second',
+            'gauge',
+            'Scrub read rate over the last chunk, including throttling',
+            stats['throughput_bytes_per_second'],
+        ),
+        ('dvss_shard_scrub_cursor', 'gauge', 'Last shard id scrubbed in the current pass', stats['cursor']),
+    ]
+    return _format_metrics(metrics)
+
+
+def _format_metrics(metrics: List[Tuple[str, str, str, Any]]) -> str:
+    """将 (名称, 类型, 说明, 值) 列表格式化为 Prometheus 文本格式"""
+    return '\n\n'.join(
+        f'# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n{name} {value}'
+        for name, metric_type, help_text, value in metrics
+    )
@@ -9,16 +9,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.get_db import get_db
 from core.deps import get_current_user
+from exceptions.custom_exception import AuthorizationError
 from module_dvss.entity.user import User
 from module_dvss.schemas.common_schema import ApiResponse, PageInfo, PageResponse
 from module_dvss.schemas.order_schema import (
     EncryptedOrderResponse,
+    OrderBatchDecrypt,
     OrderCreate,
     OrderDecrypt,
     OrderResponse,
     OrderStatistics,
     OrderUpdate,
 )
+from module_dvss.service.dvss_service import DVSSService
 from module_dvss.service.order_service import OrderService
 from utils.response_util import ResponseUtil
 
@@ -62,6 +65,21 @@ async def get_orders(
         return ResponseUtil.error(message=f'获取订单列表失败: {str(e)}')
 
 
+@router.post('/decrypt-batch', response_model=ApiResponse[dict])
+async def decrypt_orders_batch(
+    request: OrderBatchDecrypt, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+):
+    """批量解密订单（一次查询获取全部分片，批量重构）"""
+    try:
+        dvss_service = DVSSService(db)
+        result = await dvss_service.decrypt_orders_batch(request=request.model_dump(), current_user_id=current_user.id)
+        return ResponseUtil.success(data=result, message='批量解密完成')
+    except AuthorizationError as e:
+        return ResponseUtil.error(message=str(e), code=403)
+    except Exception as e:
+        return ResponseUtil.error(message=f'批量解密失败: {str(e)}')
+
+
 @router.get('/{order_id}', response_model=ApiResponse[OrderResponse])
 async def get_order_detail(
     order_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
@@ -4,14 +4,20 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.deps import get_current_user, get_db
+from core.deps import get_admin_user, get_current_user, get_db
 from exceptions.custom_exception import AuthorizationError, NotFoundError, ValidationError
 from module_dvss.schemas.common_schema import ApiResponse
 from module_dvss.schemas.shard_schema import (
+    MerkleBatchVerifyResponse,
+    MerkleShardVerifyResponse,
+    ReshareJobCreate,
+    ReshareJobResponse,
+    ShardBatchVerifyRequest,
+    ShardBatchVerifyResponse,
     ShardInfoCreate,
     ShardInfoResponse,
     ShardInfoUpdate,
@@ -21,6 +27,10 @@ from module_dvss.schemas.shard_schema import (
     # ShardReconstructRequest,
     # ShardReconstructResponse,
 )
+from module_dvss.service.key_service import KeyService
+from module_dvss.service.reshare_service import ReshareService, run_reshare_job
+from module_dvss.service.shard_batch_service import ShardBatchService
+from module_dvss.service.shard_scrub_service import ShardScrubService
 from module_dvss.service.shard_service import ShardService
 from utils.response_util import ResponseUtil
 
@@ -128,7 +138,7 @@ async def download_shard(shard_id: str, db: AsyncSession = Depends(get_db), curr
         shard_data = await shard_service.download_shard(shard_id, current_user.id)
 
         def iter_file():
-            yield shard_data
+            yield shard_data['shard_data']
 
         return StreamingResponse(
             iter_file(),
@@ -194,6 +204,140 @@ async def validate_shard(shard_id: str, db: AsyncSession = Depends(get_db), curr
         return ResponseUtil.error(message=f'验证分片失败: {str(e)}')
 
 
+@router.post('/verify-batch', response_model=ApiResponse[ShardBatchVerifyResponse])
+async def verify_shards_batch(
+    request: ShardBatchVerifyRequest, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)
+):
+    """批量校验分片（Feldman承诺 + 随机线性组合）"""
+    try:
+        shard_service = ShardService(db)
+        result = await shard_service.verify_shards_batch(request.encrypted_order_ids, current_user.id)
+
+        message = '分片批量校验通过' if result['is_valid'] else f'发现 {len(result["invalid_shards"])} 个无效分片'
+        return ResponseUtil.success(data=result, message=message)
+    except AuthorizationError as e:
+        return ResponseUtil.error(message=str(e), code=403)
+    except Exception as e:
+        return ResponseUtil.error(message=f'批量校验分片失败: {str(e)}')
+
+
+@router.post('/batches/{batch_id}/verify', response_model=ApiResponse[MerkleBatchVerifyResponse])
+async def verify_shard_batch_merkle(
+    batch_id: str, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)
+):
+    """整批校验一次上传或加密产生的分片：流式重新计算全部分片哈希与Merkle根"""
+    try:
+        batch_service = ShardBatchService(db)
+        result = await batch_service.verify_batch(batch_id, current_user.id)
+
+        return ResponseUtil.success(data=result, message='分片批次校验完成')
+    except NotFoundError as e:
+        return ResponseUtil.error(message=str(e), code=404)
+    except AuthorizationError as e:
+        return ResponseUtil.error(message=str(e), code=403)
+    except Exception as e:
+        return ResponseUtil.error(message=f'分片批次校验失败: {str(e)}')
+
+
+@router.post('/batches/{batch_id}/shards/{shard_id}/verify', response_model=ApiResponse[MerkleShardVerifyResponse])
+async def verify_batch_shard_merkle(
+    batch_id: str, shard_id: str, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)
+):
+    """用Merkle证明校验批次中的单个分片"""
+    try:
+        batch_service = ShardBatchService(db)
+        result = await batch_service.verify_shard(batch_id, shard_id, current_user.id)
+
+        return ResponseUtil.success(data=result, message='分片证明校验完成')
+    except NotFoundError as e:
+        return ResponseUtil.error(message=str(e), code=404)
+    except AuthorizationError as e:
+        return ResponseUtil.error(message=str(e), code=403)
+    except Exception as e:
+        return ResponseUtil.error(message=f'分片证明校验失败: {str(e)}')
+
+
+@router.post('/reshare-jobs', response_model=ApiResponse[ReshareJobResponse])
+async def create_reshare_job(
+    request: ReshareJobCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_admin_user),
+):
+    """创建分片重分享任务并在后台执行"""
+    try:
+        reshare_service = ReshareService(db)
+        result = await reshare_service.create_job(
+            current_user.id, k_new=request.k_new, n_new=request.n_new, batch_size=request.batch_size
+        )
+        background_tasks.add_task(run_reshare_job, result['id'])
+
+        return ResponseUtil.success(data=result, message='重分享任务已创建')
+    except ValidationError as e:
+        return ResponseUtil.error(message=str(e), code=400)
+    except Exception as e:
+        return ResponseUtil.error(message=f'创建重分享任务失败: {str(e)}')
+
+
+@router.get('/reshare-jobs/{job_id}', response_model=ApiResponse[ReshareJobResponse])
+async def get_reshare_job(job_id: int, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)):
+    """获取分片重分享任务进度"""
+    try:
+        reshare_service = ReshareService(db)
+        result = await reshare_service.get_job(job_id)
+
+        return ResponseUtil.success(data=result, message='获取重分享任务成功')
+    except NotFoundError as e:
+        return ResponseUtil.error(message=str(e), code=404)
+    except Exception as e:
+        return ResponseUtil.error(message=f'获取重分享任务失败: {str(e)}')
+
+
+@router.post('/reshare-jobs/{job_id}/resume', response_model=ApiResponse[ReshareJobResponse])
+async def resume_reshare_job(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_admin_user),
+):
+    """从游标处继续执行中断或失败的重分享任务"""
+    try:
+        reshare_service = ReshareService(db)
+        result = await reshare_service.get_job(job_id)
+        if result['status'] != 'completed':
+            background_tasks.add_task(run_reshare_job, job_id)
+
+        return ResponseUtil.success(data=result, message='重分享任务已继续执行')
+    except NotFoundError as e:
+        return ResponseUtil.error(message=str(e), code=404)
+    except Exception as e:
+        return ResponseUtil.error(message=f'继续重分享任务失败: {str(e)}')
+
+
+@router.post('/keys/rotate', response_model=ApiResponse[dict])
+async def rotate_shard_kek(db: AsyncSession = Depends(get_db), current_user=Depends(get_admin_user)):
+    """轮换分片信封加密的KEK（只重新包装数据密钥，不重写分片数据）"""
+    try:
+        key_service = KeyService(db)
+        result = await key_service.rotate_kek()
+
+        return ResponseUtil.success(data=result, message='KEK轮换成功')
+    except Exception as e:
+        return ResponseUtil.error(message=f'KEK轮换失败: {str(e)}')
+
+
+@router.get('/scrub/status', response_model=ApiResponse[dict])
+async def get_shard_scrub_status(db: AsyncSession = Depends(get_db), current_user=Depends(get_admin_user)):
+    """获取后台分片巡检的进度与吞吐"""
+    try:
+        scrub_service = ShardScrubService(db)
+        result = await scrub_service.get_status()
+
+        return ResponseUtil.success(data=result, message='获取分片巡检状态成功')
+    except Exception as e:
+        return ResponseUtil.error(message=f'获取分片巡检状态失败: {str(e)}')
+
+
 @router.post('/{shard_id}/reprocess', response_model=ApiResponse[bool])
 async def reprocess_shard(shard_id: str, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)):
     """重新处理分片"""
@@ -168,6 +168,15 @@ class FieldDAO:
         result = await self.db.execute(select(OrderField).where(OrderField.is_active).order_by(OrderField.field_name))
         return list(result.scalars().all())
 
+    async def get_active_field_rules(self) -> list:
+        """获取激活字段的校验相关配置 (字段名称, 字段类型, 是否必填)，按字段名称排序"""
+        result = await self.db.execute(
+            select(OrderField.field_name, OrderField.field_type, OrderField.is_required)
+            .where(OrderField.is_active)
+            .order_by(OrderField.field_name)
+        )
+        return list(result.all())
+
     async def get_field_permissions_by_role(self, role_id: int) -> List[RoleFieldPermission]:
         """获取角色的字段权限"""
         result = await self.db.execute(
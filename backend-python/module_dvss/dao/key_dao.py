@@ -0,0 +1,87 @@
+"""
+密钥数据访问对象 (DAO) - 异步版本
+"""
+
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions.custom_exception import DatabaseError
+from module_dvss.entity.encryption_key import EncryptionKey
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('key_dao')
+
+
+class KeyDAO:
+    """包装密钥数据访问对象"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_key(self, key: EncryptionKey) -> EncryptionKey:
+        """保存包装后的密钥（只刷新不提交，由调用方控制事务）"""
+        try:
+            self.db.add(key)
+            await self.db.flush()
+            return key
+        except Exception as e:
+            logger.error(f'保存密钥失败: {e}')
+            raise DatabaseError(f'保存密钥失败: {str(e)}')
+
+    async def get_by_key_ids(self, key_ids: Iterable[str]) -> List[EncryptionKey]:
+        """根据密钥ID批量获取"""
+        try:
+            stmt = select(EncryptionKey).where(EncryptionKey.key_id.in_(list(key_ids)))
+            result = await self.db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f'获取密钥失败: {e}')
+            raise DatabaseError(f'获取密钥失败: {str(e)}')
+
+    async def get_active_kek(self) -> Optional[EncryptionKey]:
+        """获取当前使用的KEK（最新创建的激活KEK）"""
+        try:
+            stmt = (
+                select(EncryptionKey)
+                .where(EncryptionKey.key_type == 'kek', EncryptionKey.status == 'active')
+                .order_by(EncryptionKey.id.desc())
+                .limit(1)
+            )
+            result = await self.db.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f'获取当前KEK失败: {e}')
+            raise DatabaseError(f'获取当前KEK失败: {str(e)}')
+
+    async def get_keks(self) -> List[EncryptionKey]:
+        """获取全部KEK"""
+        try:
+            stmt = select(EncryptionKey).where(EncryptionKey.key_type == 'kek').order_by(EncryptionKey.id)
+            result = await self.db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f'获取KEK失败: {e}')
+            raise DatabaseError(f'获取KEK失败: {str(e)}')
+
+    async def get_data_keys_wrapped_by(
+        self, parent_key_ids: Iterable[str], after_id: int, limit: int
+    ) -> List[EncryptionKey]:
+        """按ID游标分批获取由指定KEK包装的数据密钥"""
+        try:
+            stmt = (
+                select(EncryptionKey)
+                .where(
+                    EncryptionKey.key_type == 'dek',
+                    EncryptionKey.parent_key_id.in_(list(parent_key_ids)),
+                    EncryptionKey.id > after_id,
+                )
+                .order_by(EncryptionKey.id)
+                .limit(limit)
+            )
+            result = await self.db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f'获取数据密钥失败: {e}')
+            raise DatabaseError(f'获取数据密钥失败: {str(e)}')
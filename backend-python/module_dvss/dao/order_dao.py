@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_dvss.entity.encrypted_order import EncryptedOrder
 from module_dvss.entity.original_order import OriginalOrder
+from utils.bulk_insert_util import BulkInsertUtil
 from utils.log_util import LogUtil
 
 logger = LogUtil.get_logger('order_dao')
@@ -552,10 +553,64 @@ class OrderDAO:
             logger.error(f'Error creating order: {str(e)}')
             raise
 
+    async def create_orders(self, rows: List[Dict[str, Any]], batch_rows: Optional[int] = None) -> List[int]:
+        """按批批量插入原始订单（每条语句 batch_rows 行，只执行不提交），按输入顺序返回订单主键"""
+        try:
+            return await BulkInsertUtil.insert_rows(
+                self.db, OriginalOrder.__table__, rows, OriginalOrder.order_id, batch_rows
+            )
+        except Exception as e:
+            logger.error(f'Error creating orders: {str(e)}')
+            raise
+
+    async def create_encrypted_orders(self, rows: List[Dict[str, Any]], batch_rows: Optional[int] = None) -> List[int]:
+        """按批批量插入加密订单（每条语句 batch_rows 行，只执行不提交），按输入顺序返回加密订单主键"""
+        try:
+            return await BulkInsertUtil.insert_rows(
+                self.db,
+                EncryptedOrder.__table__,
+                rows,
+                EncryptedOrder.original_order_id,
+                batch_rows,
+            )
+        except Exception as e:
+            logger.error(f'Error creating encrypted orders: {str(e)}')
+            raise
+
     async def get_encrypted_by_id(self, encrypted_order_id: int) -> Optional[EncryptedOrder]:
         """获取加密订单（实例方法版本）"""
         return await self.get_encrypted_order_by_id(self.db, encrypted_order_id)
 
+    async def get_encrypted_by_ids(self, encrypted_order_ids: List[int]) -> List[EncryptedOrder]:
+        """根据ID列表获取加密订单"""
+        try:
+            stmt = select(EncryptedOrder).where(EncryptedOrder.id.in_(encrypted_order_ids))
+            result = await self.db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f'Error getting encrypted orders by ids: {str(e)}')
+            raise
+
+    async def get_encrypted_after(self, last_id: int, limit: int) -> List[EncryptedOrder]:
+        """按ID游标分批获取加密订单"""
+        try:
+            stmt = select(EncryptedOrder).where(EncryptedOrder.id > last_id).order_by(EncryptedOrder.id).limit(limit)
+            result = await self.db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f'Error getting encrypted orders after {last_id}: {str(e)}')
+            raise
+
+    async def count_encrypted_after(self, last_id: int) -> int:
+        """统计游标之后的加密订单数量"""
+        try:
+            stmt = select(func.count(EncryptedOrder.id)).where(EncryptedOrder.id > last_id)
+            result = await self.db.execute(stmt)
+            return result.scalar() or 0
+        except Exception as e:
+            logger.error(f'Error counting encrypted orders after {last_id}: {str(e)}')
+            raise
+
     async def create_encrypted_order_instance(self, encrypted_order: EncryptedOrder) -> EncryptedOrder:
         """创建加密订单（实例方法版本）"""
         return await self.create_encrypted_order(self.db, encrypted_order)
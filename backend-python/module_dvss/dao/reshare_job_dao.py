@@ -0,0 +1,43 @@
+"""
+分片重分享任务数据访问层 (DAO) - 异步版本
+"""
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions.custom_exception import DatabaseError
+from module_dvss.entity.reshare_job import ReshareJob
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('reshare_job_dao')
+
+
+class ReshareJobDAO:
+    """分片重分享任务数据访问对象"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_job(self, job: ReshareJob) -> ReshareJob:
+        """创建重分享任务"""
+        try:
+            self.db.add(job)
+            await self.db.commit()
+            await self.db.refresh(job)
+            return job
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'创建重分享任务失败: {e}')
+            raise DatabaseError(f'创建重分享任务失败: {str(e)}')
+
+    async def get_job_by_id(self, job_id: int) -> Optional[ReshareJob]:
+        """根据ID获取重分享任务"""
+        try:
+            stmt = select(ReshareJob).where(ReshareJob.id == job_id)
+            result = await self.db.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f'获取重分享任务失败: {e}')
+            raise DatabaseError(f'获取重分享任务失败: {str(e)}')
@@ -2,13 +2,15 @@
 分片数据访问对象 (DAO) - 异步版本
 """
 
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import desc, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from exceptions.custom_exception import DatabaseError
-from module_dvss.entity.shard_info import ShardInfo
+from module_dvss.entity.shard_batch import ShardBatch
+from module_dvss.entity.shard_info import ShardInfo, StorageNode
+from utils.bulk_insert_util import BulkInsertUtil
 from utils.log_util import LogUtil
 
 logger = LogUtil.get_logger('shard_dao')
@@ -33,6 +35,14 @@ class ShardDAO:
             logger.error(f'创建分片失败: {e}')
             raise DatabaseError(f'创建分片失败: {str(e)}')
 
+    async def create_shards(self, rows: List[dict], batch_rows: Optional[int] = None) -> List[int]:
+        """按批批量插入分片（每条语句 batch_rows 行，只执行不提交，由调用方控制事务），按输入顺序返回分片主键"""
+        try:
+            return await BulkInsertUtil.insert_rows(self.db, ShardInfo.__table__, rows, ShardInfo.shard_id, batch_rows)
+        except Exception as e:
+            logger.error(f'批量创建分片失败: {e}')
+            raise DatabaseError(f'批量创建分片失败: {str(e)}')
+
     async def get_shard_by_id(self, shard_id: int) -> Optional[ShardInfo]:
         """根据ID获取分片信息"""
         try:
@@ -126,16 +136,178 @@ class ShardDAO:
         """根据订单ID获取分片（别名方法）"""
         return await self.get_shards_by_order(order_id)
 
-    async def get_by_encrypted_order_id(self, encrypted_order_id: int) -> List[ShardInfo]:
-        """根据加密订单ID获取分片"""
+    async def get_by_encrypted_order_id(
+        self, encrypted_order_id: int, field_groups: Optional[Sequence[str]] = None
+    ) -> List[ShardInfo]:
+        """根据加密订单ID获取分片，可只获取指定字段组的分片"""
         try:
             stmt = select(ShardInfo).where(ShardInfo.encrypted_order_id == encrypted_order_id)
+            if field_groups is not None:
+                stmt = stmt.where(ShardInfo.field_group.in_(list(field_groups)))
             result = await self.db.execute(stmt)
             return list(result.scalars().all())
         except Exception as e:
             logger.error(f'根据加密订单获取分片失败: {e}')
             raise DatabaseError(f'根据加密订单获取分片失败: {str(e)}')
 
+    async def get_by_encrypted_order_ids(
+        self, encrypted_order_ids: List[int], field_groups: Optional[Sequence[str]] = None
+    ) -> List[ShardInfo]:
+        """
+        根据加密订单ID列表批量获取分片（单次IN查询）
+
+        指定 field_groups 时字段组分片只获取这些字段组，不属于任何字段组的分片（其他加密模式）照常获取
+        """
+        try:
+            stmt = select(ShardInfo).where(ShardInfo.encrypted_order_id.in_(encrypted_order_ids))
+            if field_groups is not None:
+                stmt = stmt.where(or_(ShardInfo.field_group.in_(list(field_groups)), ShardInfo.field_group.is_(None)))
+            stmt = stmt.order_by(ShardInfo.encrypted_order_id, ShardInfo.shard_index)
+            result = await self.db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f'批量获取加密订单分片失败: {e}')
+            raise DatabaseError(f'批量获取加密订单分片失败: {str(e)}')
+
+    async def get_shard_locations(
+        self, encrypted_order_ids: Sequence[int], field_groups: Optional[Sequence[str]] = None
+    ) -> list:
+        """
+        批量获取加密订单可用分片的位置信息（不读取分片数据）
+
+        指定 field_groups 时字段组分片只获取这些字段组，不属于任何字段组的分片（其他加密模式）照常获取
+
+        Returns:
+            (id, encrypted_order_id, shard_index, storage_node, field_group) 行列表
+        """
+        try:
+            stmt = select(
+                ShardInfo.id,
+                ShardInfo.encrypted_order_id,
+                ShardInfo.shard_index,
+                ShardInfo.storage_node,
+                ShardInfo.field_group,
+            ).where(ShardInfo.encrypted_order_id.in_(list(encrypted_order_ids)), ShardInfo.status == 'active')
+            if field_groups is not None:
+                stmt = stmt.where(or_(ShardInfo.field_group.in_(list(field_groups)), ShardInfo.field_group.is_(None)))
+            result = await self.db.execute(stmt.order_by(ShardInfo.encrypted_order_id, ShardInfo.shard_index))
+            return list(result.all())
+        except Exception as e:
+            logger.error(f'获取分片位置失败: {e}')
+            raise DatabaseError(f'获取分片位置失败: {str(e)}')
+
+    async def get_shard_data(self, shard_ids: Iterable[int]) -> list:
+        """
+        按分片主键批量读取分片数据
+
+        Returns:
+            (id, shard_id, key_id, shard_data) 行列表，key_id 不为空的分片数据需用数据密钥解密
+        """
+        try:
+            stmt = select(ShardInfo.id, ShardInfo.shard_id, ShardInfo.key_id, ShardInfo.shard_data).where(
+                ShardInfo.id.in_(list(shard_ids))
+            )
+            result = await self.db.execute(stmt)
+            return list(result.all())
+        except Exception as e:
+            logger.error(f'读取分片数据失败: {e}')
+            raise DatabaseError(f'读取分片数据失败: {str(e)}')
+
+    async def get_storage_nodes(self, node_names: Optional[Iterable[str]] = None) -> List[StorageNode]:
+        """获取存储节点，可按节点名称筛选"""
+        try:
+            stmt = select(StorageNode).order_by(StorageNode.id)
+            if node_names is not None:
+                stmt = stmt.where(StorageNode.node_name.in_(list(node_names)))
+            result = await self.db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f'获取存储节点失败: {e}')
+            raise DatabaseError(f'获取存储节点失败: {str(e)}')
+
+    async def replace_order_shards(self, old_shards: List[ShardInfo], new_shards: List[ShardInfo]):
+        """替换加密订单的分片（只刷新不提交，由调用方控制事务）"""
+        try:
+            for shard in old_shards:
+                await self.db.delete(shard)
+            # 先删除旧分片，新分片沿用相同的 shard_id
+            await self.db.flush()
+            self.db.add_all(new_shards)
+            await self.db.flush()
+        except Exception as e:
+            logger.error(f'替换订单分片失败: {e}')
+            raise DatabaseError(f'替换订单分片失败: {str(e)}')
+
+    async def create_batch(self, batch: ShardBatch, members: List[dict]) -> ShardBatch:
+        """
+        保存分片批次并写入各分片的批次信息（只刷新不提交，由调用方控制事务）
+
+        Args:
+            batch: 分片批次
+            members: 按分片主键批量更新的 {id, batch_id, batch_index, merkle_proof}
+        """
+        try:
+            self.db.add(batch)
+            if members:
+                await self.db.execute(update(ShardInfo), members)
+            await self.db.flush()
+            return batch
+        except Exception as e:
+            logger.error(f'保存分片批次失败: {e}')
+            raise DatabaseError(f'保存分片批次失败: {str(e)}')
+
+    async def get_batch(self, batch_id: str) -> Optional[ShardBatch]:
+        """根据批次ID获取分片批次"""
+        try:
+            result = await self.db.execute(select(ShardBatch).where(ShardBatch.batch_id == batch_id))
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f'获取分片批次失败: {e}')
+            raise DatabaseError(f'获取分片批次失败: {str(e)}')
+
+    async def get_batch_shard(self, batch_id: str, shard_id: str) -> Optional[ShardInfo]:
+        """获取批次中的单个分片"""
+        try:
+            result = await self.db.execute(
+                select(ShardInfo).where(ShardInfo.batch_id == batch_id, ShardInfo.shard_id == shard_id)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f'获取批次分片失败: {e}')
+            raise DatabaseError(f'获取批次分片失败: {str(e)}')
+
+    async def get_batch_shard_chunk(self, batch_id: str, after_index: int, limit: int) -> list:
+        """
+        按叶子序号游标分段读取批次分片
+
+        Returns:
+            (shard_id, batch_index, checksum, shard_data) 行列表，按叶子序号升序
+        """
+        try:
+            stmt = (
+                select(ShardInfo.shard_id, ShardInfo.batch_index, ShardInfo.checksum, ShardInfo.shard_data)
+                .where(ShardInfo.batch_id == batch_id, ShardInfo.batch_index > after_index)
+                .order_by(ShardInfo.batch_index)
+                .limit(limit)
+            )
+            result = await self.db.execute(stmt)
+            return list(result.all())
+        except Exception as e:
+            logger.error(f'读取批次分片失败: {e}')
+            raise DatabaseError(f'读取批次分片失败: {str(e)}')
+
+    async def update_batch_status(self, batch_ids: Iterable[str], status: str):
+        """更新分片批次状态（只刷新不提交）"""
+        try:
+            batch_ids = list(batch_ids)
+            if batch_ids:
+                await self.db.execute(
+                    update(ShardBatch).where(ShardBatch.batch_id.in_(batch_ids)).values(status=status)
+                )
+        except Exception as e:
+            logger.error(f'更新分片批次状态失败: {e}')
+            raise DatabaseError(f'更新分片批次状态失败: {str(e)}')
+
     async def get_statistics(self) -> dict:
         """获取分片统计信息"""
         try:
@@ -0,0 +1,107 @@
+"""
+分片巡检数据访问层 (DAO) - 异步版本
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions.custom_exception import DatabaseError
+from module_dvss.entity.shard_info import ShardInfo
+from module_dvss.entity.shard_scrub_state import ShardScrubState
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('shard_scrub_dao')
+
+
+class ShardScrubDAO:
+    """分片巡检数据访问对象"""
+
+    # 不参与巡检的分片状态
+    SKIPPED_STATUSES = ('corrupted', 'deleted')
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_or_create_state(self, name: str) -> ShardScrubState:
+        """获取巡检状态，不存在时创建"""
+        try:
+            # 状态由条件更新语句修改，需覆盖会话中已加载的旧值
+            stmt = select(ShardScrubState).where(ShardScrubState.name == name).execution_options(populate_existing=True)
+            result = await self.db.execute(stmt)
+            state = result.scalar_one_or_none()
+            if state is None:
+                state = ShardScrubState(
+                    name=name,
+                    cursor=0,
+                    pass_count=0,
+                    pass_shards=0,
+                    pass_bytes=0,
+                    pass_corrupt=0,
+                    total_corrupt=0,
+                )
+                self.db.add(state)
+                await self.db.commit()
+                await self.db.refresh(state)
+            return state
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'获取巡检状态失败: {e}')
+            raise DatabaseError(f'获取巡检状态失败: {str(e)}')
+
+    async def get_shard_chunk(self, after_id: int, limit: int) -> list:
+        """
+        按分片主键游标读取一段待巡检的分片
+
+        Returns:
+            (id, shard_id, checksum, shard_data) 行列表，按主键升序
+        """
+        try:
+            stmt = (
+                select(ShardInfo.id, ShardInfo.shard_id, ShardInfo.checksum, ShardInfo.shard_data)
+                .where(ShardInfo.id > after_id, ShardInfo.status.not_in(self.SKIPPED_STATUSES))
+                .order_by(ShardInfo.id)
+                .limit(limit)
+            )
+            result = await self.db.execute(stmt)
+            return list(result.all())
+        except Exception as e:
+            logger.error(f'读取巡检分片失败: {e}')
+            raise DatabaseError(f'读取巡检分片失败: {str(e)}')
+
+    async def advance(self, name: str, expected_cursor: int, values: Dict[str, Any]) -> bool:
+        """
+        游标仍为 expected_cursor 时更新巡检状态（只刷新不提交）
+
+        多个进程同时巡检时只有一个能推进同一段游标，返回是否更新成功
+        """
+        try:
+            result = await self.db.execute(
+                update(ShardScrubState)
+                .where(ShardScrubState.name == name, ShardScrubState.cursor == expected_cursor)
+                .values(**values)
+            )
+            return result.rowcount == 1
+        except Exception as e:
+            logger.error(f'更新巡检状态失败: {e}')
+            raise DatabaseError(f'更新巡检状态失败: {str(e)}')
+
+    async def mark_corrupted(self, shard_ids: Iterable[int]):
+        """将分片标记为损坏（只刷新不提交）"""
+        try:
+            shard_ids = list(shard_ids)
+            if shard_ids:
+                await self.db.execute(update(ShardInfo).where(ShardInfo.id.in_(shard_ids)).values(status='corrupted'))
+        except Exception as e:
+            logger.error(f'标记损坏分片失败: {e}')
+            raise DatabaseError(f'标记损坏分片失败: {str(e)}')
+
+    async def get_max_shard_id(self) -> Optional[int]:
+        """分片主键最大值（用于计算巡检进度）"""
+        try:
+            result = await self.db.execute(select(ShardInfo.id).order_by(ShardInfo.id.desc()).limit(1))
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f'获取分片主键最大值失败: {e}')
+            raise DatabaseError(f'获取分片主键最大值失败: {str(e)}')
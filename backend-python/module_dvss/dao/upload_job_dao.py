@@ -0,0 +1,107 @@
+"""
+订单上传任务数据访问层 (DAO) - 异步版本
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions.custom_exception import DatabaseError
+from module_dvss.entity.upload_job import UploadJob
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('upload_job_dao')
+
+
+class UploadJobDAO:
+    """订单上传任务数据访问对象"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_job(self, job: UploadJob) -> UploadJob:
+        """创建上传任务"""
+        try:
+            self.db.add(job)
+            await self.db.commit()
+            await self.db.refresh(job)
+            return job
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'创建上传任务失败: {e}')
+            raise DatabaseError(f'创建上传任务失败: {str(e)}')
+
+    async def get_job_by_id(self, job_id: int) -> Optional[UploadJob]:
+        """根据ID获取上传任务"""
+        try:
+            # 任务由工作协程按条件更新，需覆盖会话中已加载的旧值
+            stmt = select(UploadJob).where(UploadJob.id == job_id).execution_options(populate_existing=True)
+            result = await self.db.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f'获取上传任务失败: {e}')
+            raise DatabaseError(f'获取上传任务失败: {str(e)}')
+
+    async def claim_next(self, worker: str, stale_before: datetime) -> Optional[int]:
+        """
+        领取一个待处理的任务（包括心跳早于 stale_before 的运行中任务）并提交
+
+        候选任务按条件更新（状态与领取者未变）领取，多个工作协程同时领取时同一任务只会被一个领取成功
+        """
+        try:
+            stmt = (
+                select(UploadJob.id, UploadJob.status, UploadJob.worker)
+                .where(
+                    or_(
+                        UploadJob.status == 'pending',
+                        (UploadJob.status == 'running') & (UploadJob.heartbeat_at < stale_before),
+                    )
+                )
+                .order_by(UploadJob.id)
+                .limit(10)
+            )
+            candidates = (await self.db.execute(stmt)).all()
+            for job_id, status, owner in candidates:
+                result = await self.db.execute(
+                    update(UploadJob)
+                    .where(
+                        UploadJob.id == job_id,
+                        UploadJob.status == status,
+                        UploadJob.worker.is_(None) if owner is None else UploadJob.worker == owner,
+                    )
+                    .values(
+                        status='running',
+                        worker=worker,
+                        attempts=UploadJob.attempts + 1,
+                        heartbeat_at=datetime.now(timezone.utc),
+                    )
+                )
+                await self.db.commit()
+                if result.rowcount == 1:
+                    return job_id
+            return None
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'领取上传任务失败: {e}')
+            raise DatabaseError(f'领取上传任务失败: {str(e)}')
+
+    async def update_job(self, job_id: int, worker: str, values: Dict[str, Any], commit: bool = True) -> bool:
+        """
+        任务仍由 worker 持有时更新任务并提交
+
+        任务因心跳超时被其他工作协程领取后返回 False，原工作协程应停止处理。
+        commit 为 False 时只执行不提交，由调用方与同一事务中的其他写入一起提交
+        """
+        try:
+            result = await self.db.execute(
+                update(UploadJob).where(UploadJob.id == job_id, UploadJob.worker == worker).values(**values)
+            )
+            if commit:
+                await self.db.commit()
+            return result.rowcount == 1
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'更新上传任务失败: {e}')
+            raise DatabaseError(f'更新上传任务失败: {str(e)}')
@@ -4,12 +4,17 @@
 
 # 导入所有实体模型
 from .encrypted_order import EncryptedOrder
+from .encryption_key import EncryptionKey
 from .operation_log import OperationLog
 from .order_field import OrderField, RoleFieldPermission
 from .original_order import OriginalOrder
+from .reshare_job import ReshareJob
 from .role import Role
 from .sensitivity_config import SensitivityConfig
+from .shard_batch import ShardBatch
 from .shard_info import ShardInfo, StorageNode
+from .shard_scrub_state import ShardScrubState
+from .upload_job import UploadJob
 from .user import Base, User
 
 # 导出所有模型
@@ -21,8 +26,13 @@ __all__ = [
     'OrderField',
     'OriginalOrder',
     'EncryptedOrder',
+    'EncryptionKey',
     'ShardInfo',
     'StorageNode',
+    'ShardBatch',
+    'ShardScrubState',
+    'ReshareJob',
+    'UploadJob',
     'OperationLog',
     'SensitivityConfig',
 ]
@@ -2,7 +2,7 @@
 加密订单实体模型
 """
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -24,6 +24,7 @@ class EncryptedOrder(Base):
     k_value = Column(Integer, nullable=False, comment='分片阈值')
     n_value = Column(Integer, nullable=False, comment='分片总数')
     data_hash = Column(String(128), nullable=False, comment='数据哈希值')
+    commitments = Column(LargeBinary, nullable=True, comment='数据密钥共享多项式的Feldman承诺')
     status = Column(String(20), default='encrypted', nullable=False, index=True, comment='状态')
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment='创建时间')
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment='更新时间')
@@ -0,0 +1,38 @@
+"""
+加密密钥实体模型
+"""
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+from sqlalchemy.sql import func
+
+from .user import Base
+
+
+class EncryptionKey(Base):
+    """包装后的密钥（密钥加密密钥由主密钥包装，数据密钥由密钥加密密钥包装）"""
+
+    __tablename__ = 'encryption_keys'
+
+    id = Column(Integer, primary_key=True, index=True, comment='主键ID')
+    key_id = Column(String(64), unique=True, nullable=False, index=True, comment='密钥ID')
+    key_type = Column(String(10), nullable=False, index=True, comment='密钥类型：kek/dek')
+    parent_key_id = Column(String(64), nullable=True, index=True, comment='包装该密钥的KEK ID（KEK为空）')
+    wrapped_key = Column(LargeBinary, nullable=False, comment='包装后的密钥')
+    status = Column(String(20), nullable=False, default='active', index=True, comment='状态：active/retired')
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment='创建时间')
+    rotated_at = Column(DateTime(timezone=True), nullable=True, comment='最近一次重新包装时间')
+
+    def __repr__(self):
+        return f"<EncryptionKey(key_id='{self.key_id}', key_type='{self.key_type}', status='{self.status}')>"
+
+    def to_dict(self):
+        """转换为字典（不含密钥材料）"""
+        return {
+            'id': self.id,
+            'key_id': self.key_id,
+            'key_type': self.key_type,
+            'parent_key_id': self.parent_key_id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'rotated_at': self.rotated_at,
+        }
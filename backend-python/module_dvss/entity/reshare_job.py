@@ -0,0 +1,51 @@
+"""
+分片重分享任务实体模型
+"""
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.sql import func
+
+from .user import Base
+
+
+class ReshareJob(Base):
+    """分片重分享任务实体（按加密订单ID游标分批执行，可断点续跑）"""
+
+    __tablename__ = 'reshare_jobs'
+
+    id = Column(Integer, primary_key=True, index=True, comment='主键ID')
+    k_new = Column(Integer, nullable=False, comment='新阈值')
+    n_new = Column(Integer, nullable=False, comment='新分片总数')
+    batch_size = Column(Integer, nullable=False, default=200, comment='每批处理的订单数')
+    status = Column(String(20), nullable=False, default='pending', index=True, comment='状态')
+    cursor = Column(Integer, nullable=False, default=0, comment='已处理到的加密订单ID')
+    total_orders = Column(Integer, nullable=False, default=0, comment='待处理订单总数')
+    processed_orders = Column(Integer, nullable=False, default=0, comment='已重分享订单数')
+    failed_orders = Column(Integer, nullable=False, default=0, comment='失败订单数')
+    last_error = Column(Text, nullable=True, comment='最近一次错误信息')
+    created_by = Column(Integer, nullable=True, comment='创建人ID')
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment='创建时间')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment='更新时间')
+    finished_at = Column(DateTime(timezone=True), nullable=True, comment='完成时间')
+
+    def __repr__(self):
+        return f"<ReshareJob(id={self.id}, k_new={self.k_new}, n_new={self.n_new}, status='{self.status}')>"
+
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'k_new': self.k_new,
+            'n_new': self.n_new,
+            'batch_size': self.batch_size,
+            'status': self.status,
+            'cursor': self.cursor,
+            'total_orders': self.total_orders,
+            'processed_orders': self.processed_orders,
+            'failed_orders': self.failed_orders,
+            'last_error': self.last_error,
+            'created_by': self.created_by,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'finished_at': self.finished_at,
+        }
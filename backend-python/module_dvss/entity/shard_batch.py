@@ -0,0 +1,41 @@
+"""
+分片批次实体模型
+"""
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from .user import Base
+
+
+class ShardBatch(Base):
+    """分片批次实体（一次上传、加密或重分享产生的全部分片，记录其Merkle根）"""
+
+    __tablename__ = 'shard_batches'
+
+    id = Column(Integer, primary_key=True, index=True, comment='主键ID')
+    batch_id = Column(String(64), unique=True, nullable=False, index=True, comment='批次ID')
+    source = Column(String(20), nullable=False, comment='来源：upload/encrypt/reshare')
+    shard_count = Column(Integer, nullable=False, comment='分片数')
+    merkle_root = Column(String(64), nullable=False, comment='Merkle根（十六进制）')
+    status = Column(String(20), nullable=False, default='active', index=True, comment='状态：active/superseded')
+    created_by = Column(Integer, nullable=True, comment='创建人ID')
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment='创建时间')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment='更新时间')
+
+    def __repr__(self):
+        return f"<ShardBatch(id={self.id}, batch_id='{self.batch_id}', shard_count={self.shard_count})>"
+
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'batch_id': self.batch_id,
+            'source': self.source,
+            'shard_count': self.shard_count,
+            'merkle_root': self.merkle_root,
+            'status': self.status,
+            'created_by': self.created_by,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+        }
@@ -2,7 +2,7 @@
 分片信息实体模型
 """
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, LargeBinary, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -20,7 +20,7 @@ class ShardInfo(Base):
     )
     shard_id = Column(String(128), unique=True, nullable=False, index=True, comment='分片ID')
     shard_index = Column(Integer, nullable=False, comment='分片索引')
-    shard_data = Column(Text, nullable=False, comment='分片数据')
+    shard_data = Column(LargeBinary, nullable=False, comment='分片数据（二进制编码）')
     storage_node = Column(String(100), nullable=True, comment='存储节点')
     storage_location = Column(String(200), nullable=True, comment='存储位置')
     checksum = Column(String(128), nullable=False, comment='校验和')
@@ -30,6 +30,13 @@ class ShardInfo(Base):
     threshold = Column(Integer, nullable=True, comment='重构阈值')
     total_shards = Column(Integer, nullable=True, comment='总分片数')
     algorithm = Column(String(50), nullable=True, comment='分片算法')
+    field_group = Column(String(50), nullable=True, index=True, comment='字段组（按字段组分片的订单）')
+    key_id = Column(String(64), nullable=True, comment='信封加密分片数据的数据密钥ID（为空表示未加密）')
+
+    # 所属批次的Merkle树
+    batch_id = Column(String(64), nullable=True, index=True, comment='分片批次ID')
+    batch_index = Column(Integer, nullable=True, comment='在批次Merkle树中的叶子序号')
+    merkle_proof = Column(LargeBinary, nullable=True, comment='到批次Merkle根的证明')
 
     # 关联用户信息
     user_id = Column(Integer, nullable=True, comment='用户ID')
@@ -62,6 +69,10 @@ class ShardInfo(Base):
             'threshold': self.threshold,
             'total_shards': self.total_shards,
             'algorithm': self.algorithm,
+            'field_group': self.field_group,
+            'key_id': self.key_id,
+            'batch_id': self.batch_id,
+            'batch_index': self.batch_index,
             'user_id': self.user_id,
             'original_order_id': self.original_order_id,
             'created_at': self.created_at,
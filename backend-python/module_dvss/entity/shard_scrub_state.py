@@ -0,0 +1,45 @@
+"""
+分片巡检状态实体模型
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from .user import Base
+
+
+class ShardScrubState(Base):
+    """分片巡检状态实体（持久化的分片ID游标与本轮进度，重启后从游标处继续）"""
+
+    __tablename__ = 'shard_scrub_state'
+
+    id = Column(Integer, primary_key=True, index=True, comment='主键ID')
+    name = Column(String(50), unique=True, nullable=False, comment='巡检名称')
+    cursor = Column(Integer, nullable=False, default=0, comment='本轮已巡检到的分片主键')
+    pass_count = Column(Integer, nullable=False, default=0, comment='已完成的轮数')
+    pass_shards = Column(Integer, nullable=False, default=0, comment='本轮已巡检分片数')
+    pass_bytes = Column(BigInteger, nullable=False, default=0, comment='本轮已巡检字节数')
+    pass_corrupt = Column(Integer, nullable=False, default=0, comment='本轮发现的损坏分片数')
+    total_corrupt = Column(Integer, nullable=False, default=0, comment='累计发现的损坏分片数')
+    pass_started_at = Column(DateTime(timezone=True), nullable=True, comment='本轮开始时间')
+    last_pass_finished_at = Column(DateTime(timezone=True), nullable=True, comment='上一轮完成时间')
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment='创建时间')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment='更新时间')
+
+    def __repr__(self):
+        return f"<ShardScrubState(name='{self.name}', cursor={self.cursor}, pass_count={self.pass_count})>"
+
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'name': self.name,
+            'cursor': self.cursor,
+            'pass_count': self.pass_count,
+            'pass_shards': self.pass_shards,
+            'pass_bytes': self.pass_bytes,
+            'pass_corrupt': self.pass_corrupt,
+            'total_corrupt': self.total_corrupt,
+            'pass_started_at': self.pass_started_at,
+            'last_pass_finished_at': self.last_pass_finished_at,
+            'updated_at': self.updated_at,
+        }
@@ -0,0 +1,71 @@
+"""
+订单上传任务实体模型
+"""
+
+import json
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy.sql import func
+
+from .user import Base
+
+
+class UploadJob(Base):
+    """订单上传任务实体（上传文件保存后由后台工作协程领取，按批处理并记录进度，中断后从已处理的行继续）"""
+
+    __tablename__ = 'upload_jobs'
+
+    id = Column(Integer, primary_key=True, index=True, comment='主键ID')
+    file_name = Column(String(255), nullable=False, comment='上传文件名')
+    file_path = Column(String(500), nullable=False, comment='上传文件保存路径')
+    file_size = Column(BigInteger, nullable=False, default=0, comment='文件字节数')
+    status = Column(String(20), nullable=False, default='pending', index=True, comment='状态')
+    worker = Column(String(100), nullable=True, comment='领取任务的工作协程')
+    attempts = Column(Integer, nullable=False, default=0, comment='已领取次数')
+    processed_rows = Column(Integer, nullable=False, default=0, comment='已处理的文件行数')
+    order_count = Column(Integer, nullable=False, default=0, comment='已导入订单数')
+    encrypted_count = Column(Integer, nullable=False, default=0, comment='已加密订单数')
+    failed_count = Column(Integer, nullable=False, default=0, comment='失败行数')
+    batch_count = Column(Integer, nullable=False, default=0, comment='已处理批数')
+    elapsed_seconds = Column(Float, nullable=False, default=0.0, comment='累计处理耗时（秒）')
+    stage_seconds = Column(Text, nullable=True, comment='各阶段累计耗时(JSON)')
+    errors = Column(Text, nullable=True, comment='失败行(JSON)')
+    result = Column(Text, nullable=True, comment='处理结果(JSON)')
+    last_error = Column(Text, nullable=True, comment='最近一次错误信息')
+    created_by = Column(Integer, nullable=True, index=True, comment='创建人ID')
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment='创建时间')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment='更新时间')
+    started_at = Column(DateTime(timezone=True), nullable=True, comment='开始处理时间')
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True, comment='最近一次心跳时间')
+    finished_at = Column(DateTime(timezone=True), nullable=True, comment='完成时间')
+
+    def __repr__(self):
+        return f"<UploadJob(id={self.id}, file_name='{self.file_name}', status='{self.status}')>"
+
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'file_name': self.file_name,
+            'file_size': self.file_size,
+            'status': self.status,
+            'worker': self.worker,
+            'attempts': self.attempts,
+            'processed_rows': self.processed_rows,
+            'order_count': self.order_count,
+            'encrypted_count': self.encrypted_count,
+            'failed_count': self.failed_count,
+            'batch_count': self.batch_count,
+            'elapsed_seconds': round(self.elapsed_seconds or 0.0, 3),
+            'rows_per_second': round(self.processed_rows / self.elapsed_seconds, 2) if self.elapsed_seconds else 0.0,
+            'stage_seconds': json.loads(self.stage_seconds) if self.stage_seconds else {},
+            'errors': json.loads(self.errors) if self.errors else [],
+            'result': json.loads(self.result) if self.result else None,
+            'last_error': self.last_error,
+            'created_by': self.created_by,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'started_at': self.started_at,
+            'heartbeat_at': self.heartbeat_at,
+            'finished_at': self.finished_at,
+        }
@@ -258,6 +258,14 @@ class OrderDecrypt(BaseModel):
     requested_fields: Optional[List[str]] = Field(None, description='请求解密的字段')
 
 
+class OrderBatchDecrypt(BaseModel):
+    """订单批量解密模式"""
+
+    encrypted_order_ids: List[int] = Field(..., min_length=1, max_length=500, description='加密订单ID列表')
+    reason: str = Field(..., min_length=5, max_length=500, description='解密原因')
+    requested_fields: Optional[List[str]] = Field(None, description='请求解密的字段')
+
+
 class DecryptionResult(BaseModel):
     """解密结果"""
 
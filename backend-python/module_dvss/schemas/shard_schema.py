@@ -65,6 +65,7 @@ class ShardInfoResponse(BaseModel):
     threshold: Optional[int] = Field(None, description='分片阈值')
     total_shards: Optional[int] = Field(None, description='分片总数')
     algorithm: Optional[str] = Field(None, description='分片算法')
+    field_group: Optional[str] = Field(None, description='字段组')
     status: str = Field(..., description='分片状态')
     created_at: datetime = Field(..., description='创建时间')
     updated_at: datetime = Field(..., description='更新时间')
@@ -199,6 +200,89 @@ class ShardVerificationResponse(BaseModel):
     error_details: Optional[str] = Field(None, description='错误详情')
 
 
+class ShardBatchVerifyRequest(BaseModel):
+    """分片批量校验请求"""
+
+    encrypted_order_ids: List[int] = Field(..., min_length=1, max_length=10000, description='加密订单ID列表')
+
+
+class ShardBatchVerifyResponse(BaseModel):
+    """分片批量校验响应"""
+
+    total_shards: int = Field(..., description='分片总数')
+    verified_shards: int = Field(..., description='对照承诺校验的分片数')
+    skipped_shards: int = Field(..., description='无承诺而跳过的分片数')
+    invalid_shards: List[str] = Field(default_factory=list, description='无效分片ID列表')
+    is_valid: bool = Field(..., description='是否全部有效')
+    elapsed_ms: float = Field(..., description='耗时（毫秒）')
+    validation_time: str = Field(..., description='校验时间')
+
+
+class MerkleBatchVerifyResponse(BaseModel):
+    """分片批次Merkle整批校验响应"""
+
+    batch_id: str = Field(..., description='批次ID')
+    status: str = Field(..., description='批次状态')
+    shard_count: int = Field(..., description='批次分片数')
+    checked_shards: int = Field(..., description='实际读取的分片数')
+    missing_shards: int = Field(..., description='缺失的分片数')
+    corrupted_count: int = Field(..., description='校验和不匹配的分片数')
+    corrupted_shards: List[str] = Field(default_factory=list, description='校验和不匹配的分片ID（最多列出100个）')
+    merkle_root: str = Field(..., description='批次保存的Merkle根')
+    computed_root: Optional[str] = Field(None, description='重新计算的Merkle根')
+    is_valid: bool = Field(..., description='是否全部有效')
+    elapsed_ms: float = Field(..., description='耗时（毫秒）')
+    validation_time: str = Field(..., description='校验时间')
+
+
+class MerkleProofStep(BaseModel):
+    """Merkle证明的一步"""
+
+    side: str = Field(..., description='兄弟节点方向 left/right')
+    hash: str = Field(..., description='兄弟节点哈希（十六进制）')
+
+
+class MerkleShardVerifyResponse(BaseModel):
+    """批次内单个分片的Merkle证明校验响应"""
+
+    batch_id: str = Field(..., description='批次ID')
+    shard_id: str = Field(..., description='分片ID')
+    batch_index: Optional[int] = Field(None, description='叶子序号')
+    checksum_matches: bool = Field(..., description='分片数据与保存的校验和是否一致')
+    current_checksum: str = Field(..., description='当前分片数据的SHA-256')
+    merkle_root: str = Field(..., description='批次保存的Merkle根')
+    proof: List[MerkleProofStep] = Field(default_factory=list, description='从叶子到根的证明')
+    is_valid: bool = Field(..., description='证明是否校验通过')
+    validation_time: str = Field(..., description='校验时间')
+
+
+class ReshareJobCreate(BaseModel):
+    """分片重分享任务创建请求"""
+
+    k_new: Optional[int] = Field(None, ge=1, le=255, description='新阈值，为空时取阈值配置的默认值')
+    n_new: Optional[int] = Field(None, ge=1, le=255, description='新分片总数，为空时取阈值配置的 total_shards')
+    batch_size: int = Field(default=200, ge=1, le=5000, description='每批处理的订单数')
+
+
+class ReshareJobResponse(BaseModel):
+    """分片重分享任务响应"""
+
+    id: int = Field(..., description='任务ID')
+    k_new: int = Field(..., description='新阈值')
+    n_new: int = Field(..., description='新分片总数')
+    batch_size: int = Field(..., description='每批处理的订单数')
+    status: str = Field(..., description='状态')
+    cursor: int = Field(..., description='已处理到的加密订单ID')
+    total_orders: int = Field(..., description='待处理订单总数')
+    processed_orders: int = Field(..., description='已重分享订单数')
+    failed_orders: int = Field(..., description='失败订单数')
+    last_error: Optional[str] = Field(None, description='最近一次错误信息')
+    created_by: Optional[int] = Field(None, description='创建人ID')
+    created_at: Optional[datetime] = Field(None, description='创建时间')
+    updated_at: Optional[datetime] = Field(None, description='更新时间')
+    finished_at: Optional[datetime] = Field(None, description='完成时间')
+
+
 class ShardBackupRequest(BaseModel):
     """分片备份请求"""
 
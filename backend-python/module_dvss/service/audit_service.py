@@ -18,6 +18,7 @@ from module_dvss.schemas.log_schema import (
     LogStatsResponse,
     OperationLogCreate,
     OperationLogResponse,
+    OperationType,
     SecurityLogCreate,
     SecurityLogResponse,
     SystemLogCreate,
@@ -513,6 +514,26 @@ class AuditService:
             **kwargs,
         )
 
+    async def log_order_decryption(
+        self,
+        user_id: int,
+        encrypted_order_ids: list,
+        fields: list = None,
+        reason: str = None,
+        ip_address: str = None,
+        **kwargs,
+    ) -> None:
+        """记录订单解密日志"""
+        await self.log_operation(
+            user_id=user_id,
+            operation=OperationType.DECRYPT_ORDER.value,
+            resource_type='orders',
+            details=f'解密订单，加密订单ID: {encrypted_order_ids}, 字段: {fields or "全部"}, 原因: {reason}',
+            ip_address=ip_address,
+            request_data={'encrypted_order_ids': encrypted_order_ids, 'fields': fields, 'reason': reason},
+            **kwargs,
+        )
+
     async def log_order_deletion(self, user_id: int, order_ids: list, ip_address: str = None, **kwargs) -> None:
         """记录订单删除日志"""
         await self.log_operation(
@@ -3,13 +3,20 @@ DVSS核心服务层
 Service Layer - 处理DVSS核心业务逻辑，包括订单处理、分片、加密等
 """
 
+import io
+import time
+
 from datetime import datetime
-from typing import Any, Dict, List
+from decimal import Decimal, InvalidOperation
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from sqlalchemy import Integer, Numeric
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
 from exceptions.custom_exception import AuthorizationError, ValidationError
 from module_dvss.dao.field_dao import FieldDAO
 from module_dvss.dao.log_dao import LogDAO
@@ -17,20 +24,36 @@ from module_dvss.dao.order_dao import OrderDAO
 from module_dvss.dao.shard_dao import ShardDAO
 from module_dvss.dao.user_dao import UserDAO
 from module_dvss.entity.encrypted_order import EncryptedOrder
-from module_dvss.entity.shard_info import ShardInfo
-from module_dvss.schemas.shard_schema import ShardInfoCreate
+from module_dvss.entity.original_order import OriginalOrder
 from module_dvss.service.audit_service import AuditService
 from module_dvss.service.encryption_service import EncryptionService
+from module_dvss.service.order_validation_service import OrderValidationPlan, OrderValidationService
 from module_dvss.service.sensitivity_service import SensitivityService
 from utils.crypto_util import CryptoUtil
+from utils.csv_stream_util import ChunkReader, CsvStreamUtil
 from utils.log_util import LogUtil
 
 logger = LogUtil.get_logger('dvss_service')
 
+# 上传文件中可以直接写入原始订单表的列（系统字段除外）
+_UPLOAD_COLUMNS = {
+    column.name: column.type
+    for column in OriginalOrder.__table__.columns
+    if column.name not in ('id', 'sensitivity_score', 'status', 'created_at', 'updated_at')
+}
+
+# 流式上传进度回调：每批提交前以当前处理结果调用，与该批数据在同一事务中提交
+UploadProgress = Callable[[Dict[str, Any]], Awaitable[None]]
+
 
 class DVSSService:
     """DVSS核心服务"""
 
+    # 流式上传结果中最多列出的失败行数
+    MAX_REPORTED_UPLOAD_ERRORS = 100
+    # 流式上传的处理阶段（统计各阶段耗时）
+    UPLOAD_STAGES = ('parse', 'validate', 'score', 'persist', 'encrypt')
+
     def __init__(self, db: AsyncSession):
         self.db = db
         self.order_dao = OrderDAO(db)
@@ -40,6 +63,7 @@ class DVSSService:
         self.log_dao = LogDAO(db)
         self.encryption_service = EncryptionService(db)
         self.sensitivity_service = SensitivityService(self.field_dao)
+        self.validation_service = OrderValidationService(db)
         self.audit_service = AuditService(self.log_dao)
         self.crypto_util = CryptoUtil()
 
@@ -64,58 +88,54 @@ class DVSSService:
             # 验证订单数据
             validated_orders = await self._validate_orders(orders_data, current_user_id)
 
-            # 敏感度分析
-            sensitivity_results = await self.sensitivity_service.analyze_orders(validated_orders)
-
-            # 加密处理 - 将订单数据转换为加密格式
-            encrypted_orders = []
-            for i, order_data in enumerate(validated_orders):
-                # 获取对应的敏感度分析结果
-                order_sensitivity = sensitivity_results[i] if i < len(sensitivity_results) else {'sensitivity_score': 0.5}
-                
-                # 基本的数据处理，实际加密可以在后续完善
-                encrypted_order = {
-                    'order_id': order_data.get('order_id'),
-                    'user_id': current_user_id,
-                    'encrypted_data': order_data,
-                    'sensitivity_score': order_sensitivity.get('sensitivity_score', 0.5),
-                }
-                encrypted_orders.append(encrypted_order)
-
-            # 数据分片
-            shard_results = await self._create_shards(encrypted_orders, current_user_id)
-
-            # 保存到数据库
-            saved_orders = await self._save_orders(encrypted_orders, current_user_id)
+            # 按批评分、批量保存并加密，每批一个事务
+            plan = await self.validation_service.get_plan()
+            frame = pd.DataFrame(validated_orders)
+            timings = dict.fromkeys(self.UPLOAD_STAGES, 0.0)
+            summary = {'order_count': 0, 'encrypted_count': 0, 'score_total': 0.0}
+            risk_counts = {'high': 0, 'medium': 0, 'low': 0}
+            batch_ids: List[str] = []
+            errors: List[Dict[str, Any]] = []
+            for start in range(0, len(frame), settings.UPLOAD_BATCH_ROWS):
+                try:
+                    result = await self._process_upload_batch(
+                        frame.iloc[start : start + settings.UPLOAD_BATCH_ROWS], plan, current_user_id, timings
+                    )
+                    await self.db.commit()
+                except Exception:
+                    await self.db.rollback()
+                    raise
+                for key in summary:
+                    summary[key] += result[key]
+                for level, count in result['risk_counts'].items():
+                    risk_counts[level] += count
+                batch_ids.extend(batch_id for batch_id in result['batch_ids'] if batch_id not in batch_ids)
+                errors.extend(result['errors'])
 
             # 记录审计日志
             await self.audit_service.log_order_upload(
                 user_id=current_user_id,
                 file_name=filename,
-                order_count=len(saved_orders),
-                details={'sensitivity_results': sensitivity_results, 'shard_count': len(shard_results)},
+                order_count=summary['order_count'],
+                response_data={'order_count': summary['order_count'], 'batch_ids': batch_ids},
             )
 
-            # 计算整体统计信息
-            total_sensitivity_score = sum(result.get('sensitivity_score', 0) for result in sensitivity_results)
-            avg_sensitivity_score = total_sensitivity_score / len(sensitivity_results) if sensitivity_results else 0
-            
-            sensitivity_stats = {
-                'avg_score': avg_sensitivity_score,
-                'high_risk_count': sum(1 for result in sensitivity_results if result.get('risk_level') == 'high'),
-                'medium_risk_count': sum(1 for result in sensitivity_results if result.get('risk_level') == 'medium'),
-                'low_risk_count': sum(1 for result in sensitivity_results if result.get('risk_level') == 'low'),
-            }
-
             result = {
-                'order_count': len(saved_orders),
-                'encrypted_count': len(encrypted_orders),
-                'shard_count': len(shard_results),
-                'sensitivity_stats': sensitivity_stats,
+                'order_count': summary['order_count'],
+                'encrypted_count': summary['encrypted_count'],
+                'batch_ids': batch_ids,
+                'sensitivity_stats': {
+                    'avg_score': summary['score_total'] / summary['order_count'] if summary['order_count'] else 0,
+                    'high_risk_count': risk_counts['high'],
+                    'medium_risk_count': risk_counts['medium'],
+                    'low_risk_count': risk_counts['low'],
+                },
+                'stage_seconds': {stage: round(seconds, 3) for stage, seconds in timings.items()},
+                'errors': errors[: self.MAX_REPORTED_UPLOAD_ERRORS],
                 'upload_time': datetime.now().isoformat(),
             }
 
-            logger.info(f'用户 {current_user_id} 订单上传完成: {result}')
+            logger.info(f'用户 {current_user_id} 订单上传完成: {summary["order_count"]} 条订单')
             return result
 
         except Exception as e:
@@ -125,6 +145,196 @@ class DVSSService:
             )
             raise
 
+    async def process_order_upload_stream(
+        self,
+        read: ChunkReader,
+        filename: str,
+        current_user_id: int,
+        progress: Optional[UploadProgress] = None,
+        skip_rows: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        流式处理CSV订单文件上传
+
+        按块读取上传文件，每 UPLOAD_BATCH_ROWS 行为一批依次校验、评分、保存并加密，每批单独提交，
+        内存占用只与批大小有关。校验失败的行被跳过并记录，某一批处理失败时回滚该批并继续处理后续批次。
+        进度回调与该批数据在同一事务中提交，中断后按已提交的进度继续时不会重复导入
+
+        Args:
+            read: 异步读取函数，例如 UploadFile.read
+            filename: 文件名
+            current_user_id: 当前用户ID
+            progress: 每批提交前以当前处理结果调用的回调，只写入不提交；抛出异常时该批回滚
+            skip_rows: 跳过文件开头的行数（任务中断后继续处理时使用）
+
+        Returns:
+            Dict: 处理结果，stage_seconds 为各阶段累计耗时（秒）
+        """
+        logger.info(f'用户 {current_user_id} 开始流式上传订单文件: {filename}')
+        plan = await self.validation_service.get_plan()
+        summary = {'row_count': 0, 'order_count': 0, 'encrypted_count': 0, 'failed_count': 0, 'batch_count': 0}
+        timings = dict.fromkeys(self.UPLOAD_STAGES, 0.0)
+        batch_ids: List[str] = []
+        errors: List[Dict[str, Any]] = []
+        score_total = 0.0
+        risk_counts = {'high': 0, 'medium': 0, 'low': 0}
+
+        def snapshot() -> Dict[str, Any]:
+            return {
+                **summary,
+                'batch_ids': batch_ids,
+                'sensitivity_stats': {
+                    'avg_score': score_total / summary['order_count'] if summary['order_count'] else 0,
+                    'high_risk_count': risk_counts['high'],
+                    'medium_risk_count': risk_counts['medium'],
+                    'low_risk_count': risk_counts['low'],
+                },
+                'stage_seconds': {stage: round(seconds, 3) for stage, seconds in timings.items()},
+                'errors': errors,
+            }
+
+        try:
+            batches = CsvStreamUtil.iter_batches(read, settings.UPLOAD_BATCH_ROWS, settings.UPLOAD_STREAM_CHUNK_BYTES)
+            while True:
+                started = time.perf_counter()
+                try:
+                    frame = await anext(batches)
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    raise ValidationError(f'文件解析失败（已导入 {summary["order_count"]} 条订单）: {str(e)}')
+                finally:
+                    timings['parse'] += time.perf_counter() - started
+
+                if skip_rows:
+                    frame = frame[frame.index >= skip_rows]
+                    if frame.empty:
+                        continue
+
+                summary['row_count'] += len(frame)
+                summary['batch_count'] += 1
+                try:
+                    result = await self._process_upload_batch(frame, plan, current_user_id, timings)
+                except Exception as e:
+                    await self.db.rollback()
+                    # 数据库异常信息包含SQL参数（订单数据），只保留第一行
+                    message = str(e).splitlines()[0] if str(e) else type(e).__name__
+                    logger.error(f'订单上传第 {summary["batch_count"]} 批处理失败: {message}')
+                    summary['failed_count'] += len(frame)
+                    errors.append({'rows': [int(frame.index[0]) + 1, int(frame.index[-1]) + 1], 'error': message})
+                    del errors[self.MAX_REPORTED_UPLOAD_ERRORS :]
+                else:
+                    summary['order_count'] += result['order_count']
+                    summary['encrypted_count'] += result['encrypted_count']
+                    summary['failed_count'] += len(result['errors'])
+                    score_total += result['score_total']
+                    for level, count in result['risk_counts'].items():
+                        risk_counts[level] += count
+                    batch_ids.extend(batch_id for batch_id in result['batch_ids'] if batch_id not in batch_ids)
+                    errors.extend(result['errors'])
+                    del errors[self.MAX_REPORTED_UPLOAD_ERRORS :]
+
+                if progress is not None:
+                    await progress({**snapshot(), 'last_row': int(frame.index[-1]) + 1})
+                await self.db.commit()
+
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'订单上传失败: {str(e)}')
+            await self.audit_service.log_error(
+                user_id=current_user_id, operation='order_upload', error_message=str(e), details={'file_name': filename}
+            )
+            raise
+
+        await self.audit_service.log_order_upload(
+            user_id=current_user_id,
+            file_name=filename,
+            order_count=summary['order_count'],
+            response_data={**summary, 'batch_ids': batch_ids},
+        )
+
+        logger.info(
+            f'用户 {current_user_id} 订单流式上传完成: {summary["order_count"]}/{summary["row_count"]} 行导入，'
+            f'{summary["failed_count"]} 行失败'
+        )
+        return {**snapshot(), 'upload_time': datetime.now().isoformat()}
+
+    async def _process_upload_batch(
+        self, frame: pd.DataFrame, plan: OrderValidationPlan, user_id: int, timings: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """处理一批上传的订单：校验 → 敏感度评分 → 保存 → 加密，各阶段耗时累加到 timings（不提交事务）"""
+        started = time.perf_counter()
+        valid, errors = plan.validate(frame)
+        rows = [self._build_upload_row(record, user_id) for record in valid.to_dict('records')]
+
+        result = {
+            'order_count': 0,
+            'encrypted_count': 0,
+            'score_total': 0.0,
+            'risk_counts': {},
+            'batch_ids': [],
+            'errors': errors,
+        }
+        started = self._lap(timings, 'validate', started)
+        if not rows:
+            return result
+
+        scores = await self.sensitivity_service.calculate_frame_sensitivity(valid)
+        for row, score in zip(rows, scores.tolist()):
+            row['sensitivity_score'] = round(Decimal(str(score)), 2)
+        result['score_total'] = float(scores.sum())
+        levels, counts = np.unique(self.sensitivity_service.get_risk_levels(scores), return_counts=True)
+        result['risk_counts'] = dict(zip(levels.tolist(), counts.tolist()))
+        started = self._lap(timings, 'score', started)
+
+        # 订单、加密订单与分片在同一个事务中批量写入，由调用方提交
+        order_ids = await self.order_dao.create_orders(rows, settings.DB_BULK_INSERT_ROWS)
+        result['order_count'] = len(order_ids)
+        started = self._lap(timings, 'persist', started)
+
+        encrypted = await self.encryption_service.encrypt_orders(
+            order_ids, settings.SECRET_SHARING_THRESHOLD, settings.SECRET_SHARING_TOTAL, commit=False
+        )
+        for item in encrypted:
+            if 'error' in item:
+                errors.append({'order_id': item.get('order_id'), 'error': f'加密失败: {item["error"]}'})
+            else:
+                result['encrypted_count'] += 1
+                if item.get('batch_id') and item['batch_id'] not in result['batch_ids']:
+                    result['batch_ids'].append(item['batch_id'])
+        self._lap(timings, 'encrypt', started)
+        return result
+
+    @staticmethod
+    def _lap(timings: Dict[str, float], stage: str, started: float) -> float:
+        """累加阶段耗时，返回下一阶段的开始时间"""
+        now = time.perf_counter()
+        timings[stage] += now - started
+        return now
+
+    @staticmethod
+    def _build_upload_row(order_data: Dict[str, Any], user_id: int) -> Dict[str, Any]:
+        """将校验后的一行数据转换为原始订单表的一行（包含全部上传列），未知列忽略，数值列按列类型转换"""
+        values = {}
+        for name, column_type in _UPLOAD_COLUMNS.items():
+            value = order_data.get(name)
+            if value is None:
+                values[name] = None
+                continue
+            try:
+                if isinstance(column_type, Numeric):
+                    value = Decimal(str(value).strip())
+                    if not value.is_finite():
+                        raise InvalidOperation
+                elif isinstance(column_type, Integer):
+                    value = int(str(value).strip())
+            except (InvalidOperation, ValueError):
+                raise ValidationError(f'字段 {name} 的值无效: {value}')
+            values[name] = value
+        if values.get('user_id') is None:
+            values['user_id'] = str(user_id)
+        return values
+
     async def query_orders(self, request: dict, current_user_id: int) -> dict:
         """
         查询订单
@@ -170,6 +380,47 @@ class DVSSService:
             logger.error(f'订单查询失败: {str(e)}')
             raise
 
+    async def decrypt_orders_batch(self, request: dict, current_user_id: int) -> Dict[str, Any]:
+        """
+        批量解密订单
+
+        Args:
+            request: 解密请求（encrypted_order_ids、reason、requested_fields）
+            current_user_id: 当前用户ID
+
+        Returns:
+            Dict: 各订单的解密结果及成功、失败数量
+        """
+        try:
+            encrypted_order_ids = request.get('encrypted_order_ids', [])
+            requested_fields = request.get('requested_fields')
+
+            # 非管理员只能解密非敏感字段
+            user = await self.user_dao.get_user_by_id(current_user_id)
+            if user.role.name == 'admin':
+                fields = requested_fields
+            else:
+                allowed = EncryptionService.NON_SENSITIVE_FIELDS
+                fields = [field for field in requested_fields or allowed if field in allowed]
+                if not fields:
+                    raise AuthorizationError('无权限解密所请求的字段')
+
+            items = await self.encryption_service.decrypt_orders(encrypted_order_ids, fields)
+
+            await self.audit_service.log_order_decryption(
+                user_id=current_user_id,
+                encrypted_order_ids=encrypted_order_ids,
+                fields=fields,
+                reason=request.get('reason'),
+            )
+
+            succeeded = sum(1 for item in items if 'data' in item)
+            return {'items': items, 'succeeded': succeeded, 'failed': len(items) - succeeded}
+
+        except Exception as e:
+            logger.error(f'批量解密订单失败: {str(e)}')
+            raise
+
     async def delete_orders(self, request: dict, current_user_id: int) -> Dict[str, Any]:
         """
         删除订单
@@ -195,8 +446,9 @@ class DVSSService:
             # 删除相关分片
             await self._delete_order_shards(order_ids)
 
-            # 删除订单
+            # 删除订单，并使其解密缓存失效
             deleted_count = await self.order_dao.delete_orders(order_ids)
+            EncryptionService.invalidate_cached_orders(original_order_ids=order_ids)
 
             # 记录删除日志
             await self.audit_service.log_order_deletion(
@@ -254,10 +506,11 @@ class DVSSService:
     async def _parse_order_file(self, file_data: bytes, filename: str) -> List[Dict[str, Any]]:
         """解析订单文件"""
         try:
+            # 全部列按字符串读取，类型由校验计划统一校验
             if filename.endswith('.csv'):
-                df = pd.read_csv(file_data)
+                df = pd.read_csv(io.BytesIO(file_data), dtype=str, keep_default_na=False)
             elif filename.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file_data)
+                df = pd.read_excel(io.BytesIO(file_data), dtype=str)
             else:
                 raise ValidationError('不支持的文件格式')
 
@@ -267,73 +520,14 @@ class DVSSService:
             raise ValidationError(f'文件解析失败: {str(e)}')
 
     async def _validate_orders(self, orders_data: List[Dict[str, Any]], user_id: int) -> List[Dict[str, Any]]:
-        """验证订单数据"""
-        validated_orders = []
-
-        for order_data in orders_data:
-            # 基本字段验证
-            if not order_data.get('order_id'):
-                raise ValidationError('订单ID不能为空')
-
-            # 字段配置验证
-            field_configs = await self.field_dao.get_active_fields()
-            for field_config in field_configs:
-                field_name = field_config.field_name
-                if field_config.is_required and not order_data.get(field_name):
-                    raise ValidationError(f'必填字段 {field_name} 不能为空')
-
-            validated_orders.append(order_data)
-
-        return validated_orders
-
-    async def _create_shards(self, encrypted_orders: List[Dict[str, Any]], user_id: int) -> List[ShardInfo]:
-        """创建数据分片"""
-        shards = []
-
-        # 根据配置创建分片
-        shard_size = 1000  # 每个分片的订单数量
-        for i in range(0, len(encrypted_orders), shard_size):
-            shard_orders = encrypted_orders[i : i + shard_size]
-            
-            # 将订单数据序列化为JSON字符串
-            import json
-            shard_data_str = json.dumps(shard_orders, ensure_ascii=False)
-
-            shard_request = ShardInfoCreate(
-                shard_index=i // shard_size,
-                shard_data=shard_data_str,
-                storage_location=f'local_storage_node_{i // shard_size}',
-                threshold=3,
-                total_shards=(len(encrypted_orders) + shard_size - 1) // shard_size,
-                algorithm='json_split',
-                metadata={'order_count': len(shard_orders), 'created_by': user_id},
-                original_order_id=None,
-                encrypted_order_id=None,
+        """验证订单数据，存在不合法的行时一次列出全部不合法的行"""
+        plan = await self.validation_service.get_plan()
+        valid, errors = plan.validate(pd.DataFrame(orders_data))
+        if errors:
+            raise ValidationError(
+                f'{len(errors)} 行订单数据校验失败', details={'rows': errors[: self.MAX_REPORTED_UPLOAD_ERRORS]}
             )
-
-            shard_dict = shard_request.model_dump()
-            shard_dict['user_id'] = user_id
-            shard = await self.shard_dao.create_shard_from_dict(shard_dict)
-            shards.append(shard)
-
-        return shards
-
-    async def _save_orders(self, encrypted_orders: List[Dict[str, Any]], user_id: int) -> List[EncryptedOrder]:
-        """保存加密订单"""
-        saved_orders = []
-
-        for order_data in encrypted_orders:
-            order_request = {
-                'order_id': order_data['order_id'],
-                'user_id': str(user_id),
-                'encrypted_data': order_data.get('encrypted_data', {}),
-                'sensitivity_score': order_data.get('sensitivity_score', 0.5),
-            }
-
-            saved_order = await self.order_dao.create_order(order_request)
-            saved_orders.append(saved_order)
-
-        return saved_orders
+        return valid.to_dict('records')
 
     async def _check_query_permission(self, request: dict, user_id: int):
         """检查查询权限"""
@@ -359,31 +553,25 @@ class DVSSService:
             raise AuthorizationError('无权限删除数据')
 
     async def _decrypt_order_fields(self, orders: List[EncryptedOrder], user_id: int) -> List[Dict[str, Any]]:
-        """解密订单字段（根据权限）"""
+        """解密订单字段（根据权限），整页订单一次批量解密"""
         user = await self.user_dao.get_user_by_id(user_id)
+
+        # 管理员可以看到所有字段；其他用户只能看到非敏感字段，按字段组分片的订单只重构这些字段所在的字段组
+        fields = None if user.role.name == 'admin' else list(EncryptionService.NON_SENSITIVE_FIELDS)
+        results = await self.encryption_service.decrypt_orders([order.id for order in orders], fields)
+
         decrypted_orders = []
+        for order, result in zip(orders, results):
+            if 'error' in result:
+                raise ValueError(f'订单 {order.order_id} 解密失败: {result["error"]}')
 
-        for order in orders:
             order_dict = {
                 'id': order.id,
                 'order_id': order.order_id,
                 'created_at': order.created_at.isoformat(),
                 'updated_at': order.updated_at.isoformat(),
             }
-
-            # 根据用户权限解密字段
-            if user.role.name == 'admin':
-                # 管理员可以看到所有字段
-                order_dict.update(await self.encryption_service.decrypt_order(order.id))
-            else:
-                # 其他用户只能看到非敏感字段
-                non_sensitive_fields = ['order_id', 'user_id', 'total_amount', 'created_at', 'updated_at']
-                order_dict.update(await self.encryption_service.decrypt_non_sensitive_fields(
-                    order.id, 
-                    non_sensitive_fields, 
-                    order_id=getattr(order, 'order_id', None)
-                ))
-
+            order_dict.update(result['data'])
             decrypted_orders.append(order_dict)
 
         return decrypted_orders
@@ -6,153 +6,408 @@
 import base64
 import hashlib
 import json
-import random
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
 from module_dvss.dao.order_dao import OrderDAO
 from module_dvss.dao.shard_dao import ShardDAO
 from module_dvss.entity.encrypted_order import EncryptedOrder
-from module_dvss.entity.shard_info import ShardInfo
+from module_dvss.service.key_service import KeyService
+from module_dvss.service.shard_batch_service import ShardBatchService
+from module_dvss.service.shard_reader_service import ShardReaderService
+from utils.async_sharing_util import AsyncSharingUtil
+from utils.crypto_util import CryptoUtil
+from utils.feldman_util import FeldmanVSSUtil
+from utils.gf256_util import GF256SecretSharing
+from utils.ida_util import IDAUtil
+from utils.packed_sharing_util import PackedSharingUtil
+from utils.payload_cache_util import PayloadCacheUtil
+from utils.random_pool_util import RandomPoolUtil
+from utils.share_codec_util import BinaryShare, ShareCodecUtil
 
 
-class SimpleSecretSharing:
-    """简单的秘密共享实现 (Shamir's Secret Sharing)"""
-
-    @staticmethod
-    def _generate_prime() -> int:
-        """生成一个大质数"""
-        return 2**31 - 1  # 使用梅森质数
-
-    @staticmethod
-    def _mod_inverse(a: int, m: int) -> int:
-        """计算模逆"""
-
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-
-        gcd, x, _ = extended_gcd(a % m, m)
-        if gcd != 1:
-            raise ValueError('模逆不存在')
-        return (x % m + m) % m
+class EncryptionService:
+    # 加密算法：整个订单直接在GF(256)上进行秘密共享
+    ALGORITHM_SHAMIR = 'shamir_gf256'
+    # 加密算法：AES-256-GCM加密订单（密文只存一份），仅对数据密钥进行（可验证）秘密共享
+    ALGORITHM_HYBRID = 'aes256gcm_shamir_key'
+    # 加密算法：AES-256-GCM加密订单，密文经IDA分散到各分片（每片约1/k），数据密钥进行秘密共享
+    ALGORITHM_DISPERSAL = 'aes256gcm_ida'
+    # 加密算法：订单按字段打包共享，多个字段值嵌入同一多项式，恢复阈值为 k + 打包数量 - 1
+    ALGORITHM_PACKED = 'shamir_gf256_packed'
+    # 加密算法：订单按字段组拆分，每组独立进行GF(256)秘密共享，可只重构所需的字段组
+    ALGORITHM_GROUPED = 'shamir_gf256_grouped'
+
+    # 分片算法（ShardInfo.algorithm）
+    SHARD_ALGORITHM_SHAMIR = 'shamir_gf256'
+    SHARD_ALGORITHM_IDA = 'ida_gf256'
+    SHARD_ALGORITHM_FELDMAN = 'feldman_zq'
+    SHARD_ALGORITHM_PACKED = 'packed_gf256'
+
+    # 加密算法对应的分片算法
+    _SHARD_ALGORITHMS = {
+        ALGORITHM_SHAMIR: SHARD_ALGORITHM_SHAMIR,
+        ALGORITHM_HYBRID: SHARD_ALGORITHM_FELDMAN,
+        ALGORITHM_DISPERSAL: SHARD_ALGORITHM_IDA,
+        ALGORITHM_PACKED: SHARD_ALGORITHM_PACKED,
+        ALGORITHM_GROUPED: SHARD_ALGORITHM_SHAMIR,
+    }
+
+    _MODES = {
+        'shamir': ALGORITHM_SHAMIR,
+        'hybrid': ALGORITHM_HYBRID,
+        'dispersal': ALGORITHM_DISPERSAL,
+        'packed': ALGORITHM_PACKED,
+        'grouped': ALGORITHM_GROUPED,
+    }
+
+    DATA_KEY_SIZE = 32
+
+    # 字段组：按字段组分片的订单中，同组字段共用一组分片；未列出的字段归入 FIELD_GROUP_OTHER
+    FIELD_GROUPS = {
+        'summary': ('order_id', 'user_id', 'total_amount'),
+        'contact': ('name', 'phone', 'email', 'address'),
+        'payment': ('payment_info',),
+        'items': ('item_list',),
+    }
+    FIELD_GROUP_OTHER = 'other'
+
+    # 非管理员可见的订单字段
+    NON_SENSITIVE_FIELDS = ('order_id', 'user_id', 'total_amount')
+
+    # 字段组载荷中随机盐的字节数，使组哈希无法通过枚举字段值反推
+    _GROUP_SALT_SIZE = 16
 
-    @staticmethod
-    def _evaluate_polynomial(coefficients: List[int], x: int, prime: int) -> int:
-        """计算多项式在x处的值"""
-        result = 0
-        for i, coeff in enumerate(coefficients):
-            result = (result + coeff * pow(x, i, prime)) % prime
-        return result
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.order_dao = OrderDAO(db)
+        self.shard_dao = ShardDAO(db)
+        # 分片读取器在首次解密时创建：读取器需要会话绑定的数据库引擎，仅做分片计算时可不传会话
+        self._shard_reader: Optional[ShardReaderService] = None
+        self.key_service = KeyService(db)
+        self.batch_service = ShardBatchService(db)
+        self.decrypt_cache = PayloadCacheUtil.default()
+
+    def _get_shard_reader(self) -> ShardReaderService:
+        """获取法定数量优先的分片读取器"""
+        if self._shard_reader is None:
+            self._shard_reader = ShardReaderService(self.db)
+        return self._shard_reader
+
+    def create_shares(self, data: Dict[str, Any], k: int, n: int) -> List[bytes]:
+        """创建秘密分片"""
+        # 将数据转换为JSON字符串
+        secret = json.dumps(data, ensure_ascii=False)
 
-    @classmethod
-    def split_secret(cls, secret: str, k: int, n: int) -> List[str]:
-        """分割秘密"""
-        prime = cls._generate_prime()
+        # 按字节在GF(256)上进行Shamir秘密共享，支持任意长度的订单数据
+        shares = GF256SecretSharing.split_secret(secret, k, n)
 
-        # 将秘密转换为整数
-        secret_bytes = secret.encode('utf-8')
-        secret_int = int.from_bytes(secret_bytes, byteorder='big')
+        return shares
 
-        if secret_int >= prime:
-            raise ValueError('秘密太大，无法处理')
+    def reconstruct_secret(self, shares: List[bytes]) -> Dict[str, Any]:
+        """重构秘密"""
+        # 恢复秘密
+        secret = GF256SecretSharing.recover_secret(shares)
 
-        # 生成随机系数
-        coefficients = [secret_int] + [random.randint(0, prime - 1) for _ in range(k - 1)]
+        # 解析JSON
+        return json.loads(secret)
 
-        # 生成分片
-        shares = []
-        for i in range(1, n + 1):
-            y = cls._evaluate_polynomial(coefficients, i, prime)
-            share_data = {'x': i, 'y': y, 'prime': prime, 'k': k}
-            shares.append(base64.b64encode(json.dumps(share_data).encode()).decode())
+    def reconstruct_secrets(self, share_lists: List[List[bytes]]) -> List[Dict[str, Any]]:
+        """批量重构秘密，相同分片坐标集合的订单共用一组拉格朗日基"""
+        return [json.loads(secret) for secret in GF256SecretSharing.recover_secrets(share_lists)]
 
-        return shares
+    @staticmethod
+    def field_pack_size(k: int, n: int) -> int:
+        """按字段打包共享的打包数量：取 ENCRYPTION_FIELD_PACK_SIZE，且保证恢复阈值不超过 n"""
+        return max(1, min(settings.ENCRYPTION_FIELD_PACK_SIZE, n - k + 1))
 
     @classmethod
-    def recover_secret(cls, shares: List[str]) -> str:
-        """恢复秘密"""
-        if not shares:
-            raise ValueError('分片列表为空')
+    def create_field_shares(cls, data: Dict[str, Any], k: int, n: int, pack_size: Optional[int] = None) -> List[bytes]:
+        """
+        按字段打包创建秘密分片
+
+        每个字段（字段名与值）单独序列化后作为一个秘密，所有字段共用 n 个分片，
+        而不是每个字段各自产生 n 个分片
+
+        Args:
+            data: 订单数据
+            k: 阈值，少于 k 个分片不泄露任何字段
+            n: 总分片数
+            pack_size: 每个多项式打包的字段字节数，为空时取 field_pack_size(k, n)
+
+        Returns:
+            n 个二进制分片，恢复需要 k + pack_size - 1 个
+        """
+        if pack_size is None:
+            pack_size = cls.field_pack_size(k, n)
+        values = [json.dumps([name, value], ensure_ascii=False).encode('utf-8') for name, value in data.items()]
+        return PackedSharingUtil.split_values(values, k, n, pack_size)
 
-        # 解析分片
-        parsed_shares = []
-        for share in shares:
-            share_data = json.loads(base64.b64decode(share).decode())
-            parsed_shares.append((share_data['x'], share_data['y']))
-
-        # 获取参数
-        first_share_data = json.loads(base64.b64decode(shares[0]).decode())
-        prime = first_share_data['prime']
-        k = first_share_data['k']
+    @classmethod
+    def reconstruct_field_shares(cls, shares: Sequence[bytes]) -> Dict[str, Any]:
+        """由按字段打包的分片重构订单数据"""
+        return dict(json.loads(value) for value in PackedSharingUtil.recover_values(shares))
 
-        if len(parsed_shares) < k:
-            raise ValueError(f'分片数量不足，需要至少{k}个分片')
+    @classmethod
+    def field_group_of(cls, field: str) -> str:
+        """字段所属的字段组"""
+        for group, fields in cls.FIELD_GROUPS.items():
+            if field in fields:
+                return group
+        return cls.FIELD_GROUP_OTHER
 
-        # 使用拉格朗日插值恢复秘密
-        secret = 0
-        for i in range(k):
-            xi, yi = parsed_shares[i]
-            li = 1
+    @classmethod
+    def split_field_groups(cls, data: Dict[str, Any]) -> Tuple[Dict[str, bytes], Dict[str, Any]]:
+        """
+        将订单按字段组拆分为独立的待共享载荷
+
+        Returns:
+            (字段组 -> 载荷, 字段索引)；载荷含随机盐，字段索引记录各组的字段名与载荷哈希，
+            集中保存在加密订单记录中，不含任何字段值
+        """
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for field, value in data.items():
+            grouped.setdefault(cls.field_group_of(field), {})[field] = value
+
+        payloads = {}
+        index: Dict[str, Any] = {'groups': {}, 'hashes': {}}
+        for group, fields in grouped.items():
+            salt = RandomPoolUtil.default().random_bytes(cls._GROUP_SALT_SIZE).hex()
+            payload = json.dumps({'salt': salt, 'fields': fields}, ensure_ascii=False).encode('utf-8')
+            payloads[group] = payload
+            index['groups'][group] = list(fields)
+            index['hashes'][group] = hashlib.sha256(payload).hexdigest()
+        return payloads, index
 
-            for j in range(k):
-                if i != j:
-                    xj, _ = parsed_shares[j]
-                    numerator = (0 - xj) % prime
-                    denominator = (xi - xj) % prime
-                    li = (li * numerator * cls._mod_inverse(denominator, prime)) % prime
+    @classmethod
+    def decrypt_field_groups(cls, index: Dict[str, Any], group_shares: Dict[str, Sequence[bytes]]) -> Dict[str, Any]:
+        """
+        由各字段组的分片重构字段（纯CPU运算，可提交到进程池执行）
 
-            secret = (secret + yi * li) % prime
+        Args:
+            index: 加密订单记录中保存的字段索引
+            group_shares: 字段组 -> 至少k个分片
 
-        # 将整数转换回字符串
-        secret_bytes = secret.to_bytes((secret.bit_length() + 7) // 8, byteorder='big')
-        return secret_bytes.decode('utf-8')
+        Returns:
+            所给字段组内的全部字段
+        """
+        groups = list(group_shares)
+        payloads = GF256SecretSharing.recover_payloads([group_shares[group] for group in groups])
+        return cls._merge_field_groups(index, dict(zip(groups, payloads)))
 
+    @staticmethod
+    def _merge_field_groups(index: Dict[str, Any], group_payloads: Dict[str, bytes]) -> Dict[str, Any]:
+        """按组哈希校验各字段组载荷后合并字段"""
+        fields: Dict[str, Any] = {}
+        for group, payload in group_payloads.items():
+            if hashlib.sha256(payload).hexdigest() != index['hashes'].get(group):
+                raise ValueError(f'字段组 {group} 完整性验证失败')
+            fields.update(json.loads(payload)['fields'])
+        return fields
 
-class EncryptionService:
-    def __init__(self, db: AsyncSession):
-        self.db = db
-        self.order_dao = OrderDAO(db)
-        self.shard_dao = ShardDAO(db)
+    @classmethod
+    def groups_for_fields(cls, index: Dict[str, Any], fields: Iterable[str]) -> List[str]:
+        """根据字段索引确定包含所需字段的字段组"""
+        field_groups = {field: group for group, names in index['groups'].items() for field in names}
+        return sorted({field_groups[field] for field in fields if field in field_groups})
 
-    def create_shares(self, data: Dict[str, Any], k: int, n: int) -> List[str]:
-        """创建秘密分片"""
-        # 将数据转换为JSON字符串
-        secret = json.dumps(data, ensure_ascii=False)
+    def calculate_data_hash(self, data: Dict[str, Any]) -> str:
+        """计算数据哈希值"""
+        data_str = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data_str.encode('utf-8')).hexdigest()
 
-        # 使用简单秘密共享算法分片
-        shares = SimpleSecretSharing.split_secret(secret, k, n)
+    def create_shares_batch(self, data_list: List[Dict[str, Any]], k: int, n: int) -> List[List[bytes]]:
+        """批量创建秘密分片，所有订单在一次批量运算中完成分割"""
+        secrets = [json.dumps(data, ensure_ascii=False) for data in data_list]
+        return GF256SecretSharing.split_secrets(secrets, k, n)
 
-        return shares
+    @classmethod
+    def select_algorithm(cls, payload_size: int, mode: Optional[str] = None) -> str:
+        """
+        选择加密算法
+
+        Args:
+            payload_size: 序列化后的订单字节数
+            mode: 'shamir' / 'hybrid' / 'dispersal' / 'packed'，为空时按 ENCRYPTION_HYBRID_THRESHOLD 自动选择，
+                超过阈值时使用 ENCRYPTION_LARGE_ORDER_MODE
+
+        Returns:
+            加密算法名称
+        """
+        if mode is None:
+            if payload_size <= settings.ENCRYPTION_HYBRID_THRESHOLD:
+                return cls.ALGORITHM_SHAMIR
+            mode = settings.ENCRYPTION_LARGE_ORDER_MODE
+        if mode not in cls._MODES:
+            raise ValueError(f'不支持的加密模式: {mode}')
+        return cls._MODES[mode]
 
-    def reconstruct_secret(self, shares: List[str]) -> Dict[str, Any]:
-        """重构秘密"""
-        # 恢复秘密
-        secret = SimpleSecretSharing.recover_secret(shares)
+    @classmethod
+    def encrypt_payloads(
+        cls, items: Sequence[Tuple[str, bytes]], k: int, n: int, mode: Optional[str] = None
+    ) -> List[Tuple[str, List[bytes], Optional[bytes], Optional[bytes]]]:
+        """
+        批量加密订单载荷
+
+        直接共享模式的订单载荷在一次 split_payloads 中完成分片；
+        混合/分散模式下每个订单的数据密钥由 Z_Q 上的随机秘密派生，秘密以 Feldman 可验证秘密共享分割，
+        多项式承诺随加密订单保存，任一分片均可对照承诺校验。
+        分散模式下密文再经IDA编码，每个分片依次存放密钥分片与密文分片两条记录。
+        打包模式下订单按字段打包共享，分片头部记录的阈值为实际恢复阈值。
+        字段组模式下各字段组载荷与直接共享模式的订单一起批量分片，返回 字段组 -> 分片列表，
+        密文位置返回需集中保存的字段索引（JSON）。
+        纯CPU运算且参数/返回值均可序列化，可直接提交到进程池执行
+
+        Args:
+            items: (订单编号, 序列化后的订单) 列表，订单编号作为AES-GCM附加认证数据
+            k: 阈值
+            n: 总分片数
+            mode: 加密模式
+
+        Returns:
+            (加密算法, 分片列表, 密文, 承诺) 列表；仅混合模式返回需集中存储的密文，直接共享模式无承诺
+        """
+        results: List[Optional[Tuple[str, List[bytes], Optional[bytes], Optional[bytes]]]] = [None] * len(items)
+        # 直接共享与字段组模式的载荷汇总到一次 split_payloads 中，按 (订单序号, 起始位置, 字段组与字段索引) 取回分片
+        shamir_slots: List[Tuple[int, int, Optional[Tuple[List[str], bytes]]]] = []
+        shamir_payloads = []
+        for index, (order_no, payload) in enumerate(items):
+            algorithm = cls.select_algorithm(len(payload), mode)
+            if algorithm == cls.ALGORITHM_SHAMIR:
+                shamir_slots.append((index, len(shamir_payloads), None))
+                shamir_payloads.append(payload)
+                continue
+            if algorithm == cls.ALGORITHM_PACKED:
+                results[index] = (algorithm, cls.create_field_shares(json.loads(payload), k, n), None, None)
+                continue
+            if algorithm == cls.ALGORITHM_GROUPED:
+                group_payloads, field_index = cls.split_field_groups(json.loads(payload))
+                field_index = json.dumps(field_index, ensure_ascii=False).encode('utf-8')
+                shamir_slots.append((index, len(shamir_payloads), (list(group_payloads), field_index)))
+                shamir_payloads.extend(group_payloads.values())
+                continue
+
+            secret = FeldmanVSSUtil.random_secret()
+            data_key = FeldmanVSSUtil.derive_key(secret, cls.DATA_KEY_SIZE)
+            ciphertext = CryptoUtil.encrypt_aes_gcm(payload, data_key, order_no.encode('utf-8'))
+
+            values, commitments = FeldmanVSSUtil.split(secret, k, n)
+            shares = FeldmanVSSUtil.encode_shares(values, k, n)
+            if algorithm == cls.ALGORITHM_DISPERSAL:
+                fragments = IDAUtil.disperse_payload(ciphertext, k, n)
+                shares = [key_share + fragment for key_share, fragment in zip(shares, fragments)]
+                ciphertext = None
+            results[index] = (algorithm, shares, ciphertext, FeldmanVSSUtil.encode_commitments(commitments))
+
+        all_shares = GF256SecretSharing.split_payloads(shamir_payloads, k, n)
+        for index, start, grouping in shamir_slots:
+            if grouping is None:
+                results[index] = (cls.ALGORITHM_SHAMIR, all_shares[start], None, None)
+                continue
+            groups, field_index = grouping
+            group_shares = {group: all_shares[start + offset] for offset, group in enumerate(groups)}
+            results[index] = (cls.ALGORITHM_GROUPED, group_shares, field_index, None)
+        return results
 
-        # 解析JSON
-        return json.loads(secret)
+    @classmethod
+    def _recover_data_key(cls, key_shares: Sequence[BinaryShare]) -> bytes:
+        """恢复数据密钥：Feldman 分片恢复秘密后派生，早期的GF(256)分片直接恢复密钥"""
+        if key_shares and key_shares[0].scheme == FeldmanVSSUtil.SCHEME:
+            return FeldmanVSSUtil.derive_key(FeldmanVSSUtil.recover_parsed(key_shares), cls.DATA_KEY_SIZE)
+        return GF256SecretSharing.recover_parsed(key_shares)
 
-    def calculate_data_hash(self, data: Dict[str, Any]) -> str:
-        """计算数据哈希值"""
-        data_str = json.dumps(data, sort_keys=True, ensure_ascii=False)
-        return hashlib.sha256(data_str.encode('utf-8')).hexdigest()
+    @classmethod
+    def decrypt_payload(cls, algorithm: str, order_no: str, encrypted_data: str, shares) -> bytes:
+        """
+        根据加密算法由分片恢复订单载荷（纯CPU运算，可提交到进程池执行）
+
+        Args:
+            algorithm: 加密算法
+            order_no: 订单编号（AES-GCM附加认证数据）
+            encrypted_data: 加密订单记录中保存的数据
+            shares: 至少k个分片；字段组模式为 字段组 -> 至少k个分片
+
+        Returns:
+            序列化后的订单
+        """
+        if algorithm == cls.ALGORITHM_SHAMIR:
+            return GF256SecretSharing.recover_payload(shares)
+        if algorithm == cls.ALGORITHM_PACKED:
+            return json.dumps(cls.reconstruct_field_shares(shares), ensure_ascii=False).encode('utf-8')
+        if algorithm == cls.ALGORITHM_GROUPED:
+            fields = cls.decrypt_field_groups(json.loads(encrypted_data), shares)
+            return json.dumps(fields, ensure_ascii=False).encode('utf-8')
+
+        records = [ShareCodecUtil.decode_all(share) for share in shares]
+        data_key = cls._recover_data_key([record[0] for record in records])
+        if algorithm == cls.ALGORITHM_DISPERSAL:
+            ciphertext = IDAUtil.reconstruct_parsed([record[1] for record in records])
+        else:
+            ciphertext = base64.b64decode(encrypted_data)
+        return CryptoUtil.decrypt_aes_gcm(ciphertext, data_key, order_no.encode('utf-8'))
 
-    async def encrypt_order(self, order_id: int, k: int, n: int) -> Dict[str, Any]:
-        """加密订单"""
-        # 获取原始订单
-        order = await self.order_dao.get_by_id(order_id)
-        if not order:
-            raise ValueError('订单不存在')
+    @classmethod
+    def decrypt_payloads(
+        cls, items: Sequence[Tuple[str, str, str, Any]]
+    ) -> List[Tuple[Optional[bytes], Optional[str]]]:
+        """
+        批量恢复订单载荷（纯CPU运算，可提交到进程池执行）
+
+        直接共享模式的订单与字段组模式各字段组的分片汇总后只调用一次 recover_payloads，
+        x 坐标集合相同的秘密共用一组拉格朗日基；批量重构失败（如个别分片损坏）时逐个重构，
+        单个订单的错误不影响其他订单
+
+        Args:
+            items: (加密算法, 订单编号, 加密订单记录中保存的数据, 分片) 列表，分片同 decrypt_payload
+
+        Returns:
+            与 items 一一对应的 (序列化后的订单, 错误信息)
+        """
+        owners: List[Tuple[int, Optional[str]]] = []
+        share_lists: List[Sequence[bytes]] = []
+        for position, (algorithm, _, _, shares) in enumerate(items):
+            if algorithm == cls.ALGORITHM_SHAMIR:
+                owners.append((position, None))
+                share_lists.append(shares)
+            elif algorithm == cls.ALGORITHM_GROUPED:
+                for group, group_shares in shares.items():
+                    owners.append((position, group))
+                    share_lists.append(group_shares)
+
+        results: List[Optional[Tuple[Optional[bytes], Optional[str]]]] = [None] * len(items)
+        group_payloads: Dict[int, Dict[str, bytes]] = {}
+        try:
+            recovered = GF256SecretSharing.recover_payloads(share_lists) if share_lists else []
+        except ValueError:
+            recovered = None
+        if recovered is not None:
+            for (position, group), payload in zip(owners, recovered):
+                if group is None:
+                    results[position] = (payload, None)
+                else:
+                    group_payloads.setdefault(position, {})[group] = payload
+
+        for position, (algorithm, order_no, encrypted_data, shares) in enumerate(items):
+            if results[position] is not None:
+                continue
+            try:
+                if position in group_payloads:
+                    fields = cls._merge_field_groups(json.loads(encrypted_data), group_payloads[position])
+                    payload = json.dumps(fields, ensure_ascii=False).encode('utf-8')
+                else:
+                    payload = cls.decrypt_payload(algorithm, order_no, encrypted_data, shares)
+                results[position] = (payload, None)
+            except Exception as e:
+                results[position] = (None, str(e))
+        return results
 
-        # 构建订单数据
-        order_data = {
+    @staticmethod
+    def _build_order_data(order) -> Dict[str, Any]:
+        """构建待加密的订单数据"""
+        return {
             'order_id': order.order_id,
             'user_id': order.user_id,
             'name': order.name,
@@ -164,50 +419,101 @@ class EncryptionService:
             'total_amount': str(order.total_amount) if order.total_amount else None,
         }
 
-        # 创建分片
-        shares = self.create_shares(order_data, k, n)
-
+    def _build_encrypted_rows(
+        self,
+        original_order_id: int,
+        order_data: Dict[str, Any],
+        algorithm: str,
+        shares: List[bytes] | Dict[str, List[bytes]],
+        ciphertext: Optional[bytes],
+        commitments: Optional[bytes],
+        k: int,
+        n: int,
+        storage_nodes: Sequence[str] = (),
+        data_key: Optional[Tuple[str, bytes]] = None,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        生成加密订单及其分片的待插入行
+
+        分片按序号轮流分配到激活的存储节点；给定批次数据密钥 (密钥ID, 密钥) 时分片数据加密保存，
+        校验和按保存的数据计算。分片行的 encrypted_order_id 在加密订单插入后填入
+
+        Returns:
+            (加密订单行, 分片行列表, 加密结果)
+        """
         # 计算数据哈希
         data_hash = self.calculate_data_hash(order_data)
 
-        # 保存加密订单记录
-        encrypted_order = EncryptedOrder(
-            original_order_id=order.id,
-            order_id=order.order_id,
-            encrypted_data=json.dumps(order_data),
-            encryption_algorithm='secretsharing',
-            k_value=k,
-            n_value=n,
-            data_hash=data_hash,
-            status='encrypted',
-        )
-
-        encrypted_order = await self.order_dao.create_encrypted_order_instance(encrypted_order)
+        # 打包模式的恢复阈值高于请求的 k，记录实际恢复所需的分片数
+        if algorithm == self.ALGORITHM_PACKED:
+            k = ShareCodecUtil.decode(shares[0], verify=False).k
+
+        # 混合模式只保存一份密文；分散模式密文全部位于分片中；字段组模式保存字段索引；
+        # 直接共享模式保持原有的数据记录方式
+        if algorithm == self.ALGORITHM_GROUPED:
+            encrypted_data = ciphertext.decode('utf-8')
+        elif ciphertext is not None:
+            encrypted_data = base64.b64encode(ciphertext).decode('ascii')
+        elif algorithm == self.ALGORITHM_DISPERSAL:
+            encrypted_data = ''
+        else:
+            encrypted_data = json.dumps(order_data)
+
+        # 加密订单记录
+        order_row = {
+            'original_order_id': original_order_id,
+            'order_id': order_data['order_id'],
+            'encrypted_data': encrypted_data,
+            'encryption_algorithm': algorithm,
+            'k_value': k,
+            'n_value': n,
+            'data_hash': data_hash,
+            'commitments': commitments,
+            'status': 'encrypted',
+        }
 
-        # 保存分片信息
+        # 分片信息（字段组模式下每个字段组各有一组分片）
+        shard_algorithm = self._SHARD_ALGORITHMS[algorithm]
+        group_shares = shares if isinstance(shares, dict) else {None: shares}
+        shard_rows = []
         shard_hashes = []
-        for i, share in enumerate(shares):
-            shard_hash = hashlib.sha256(share.encode('utf-8')).hexdigest()
-            shard_hashes.append(shard_hash)
-
-            shard_info = ShardInfo(
-                encrypted_order_id=encrypted_order.id,
-                shard_id=f'{order.order_id}_shard_{i}',
-                shard_index=i,
-                shard_data=share,
-                checksum=shard_hash,
-                status='active',
-            )
-
-            await self.shard_dao.create_shard(shard_info)
-
-        return {
-            'encrypted_order_id': encrypted_order.id,
+        for group, shares_of_group in group_shares.items():
+            prefix = f'{order_data["order_id"]}_{group}' if group else order_data['order_id']
+            for i, share in enumerate(shares_of_group):
+                shard_id = f'{prefix}_shard_{i}'
+                if data_key is not None:
+                    share = KeyService.seal(share, data_key[1], shard_id)
+                shard_hash = hashlib.sha256(share).hexdigest()
+                shard_hashes.append(shard_hash)
+                shard_rows.append({
+                    'shard_id': shard_id,
+                    'shard_index': i,
+                    'shard_data': share,
+                    'key_id': data_key[0] if data_key is not None else None,
+                    'storage_node': storage_nodes[i % len(storage_nodes)] if storage_nodes else None,
+                    'checksum': shard_hash,
+                    'status': 'active',
+                    'threshold': k,
+                    'total_shards': n,
+                    'algorithm': shard_algorithm,
+                    'field_group': group,
+                })
+
+        result = {
+            'encryption_algorithm': algorithm,
             'k_value': k,
             'n_value': n,
             'data_hash': data_hash,
             'shard_hashes': shard_hashes,
         }
+        return order_row, shard_rows, result
+
+    async def encrypt_order(self, order_id: int, k: int, n: int, mode: Optional[str] = None) -> Dict[str, Any]:
+        """加密订单"""
+        results = await self.encrypt_orders([order_id], k, n, mode)
+        if 'error' in results[0]:
+            raise ValueError(results[0]['error'])
+        return results[0]
 
     async def decrypt_order(self, encrypted_order_id: int) -> Dict[str, Any]:
         """解密订单"""
@@ -216,33 +522,276 @@ class EncryptionService:
         if not encrypted_order:
             raise ValueError('加密订单不存在')
 
-        # 获取分片
-        shards = await self.shard_dao.get_by_encrypted_order_id(encrypted_order_id)
-        if len(shards) < encrypted_order.k_value:
-            raise ValueError('可用分片数量不足')
-
-        # 取前k个分片进行重构
-        share_data = [shard.shard_data for shard in shards[: encrypted_order.k_value]]
-
-        # 重构数据
-        reconstructed_data = self.reconstruct_secret(share_data)
+        cached = self._get_cached(encrypted_order)
+        if cached is not None:
+            return cached
+
+        # 只读取重构所需的k个分片（字段组模式下每组各k个），优先选择健康、响应快的存储节点
+        share_data, size = await self._read_share_data(encrypted_order)
+
+        # 重构数据（混合模式下只需重构32字节的数据密钥，分散模式下k个分片合计约为密文大小）；
+        # 较大的订单在进程池中重构，不阻塞事件循环
+        payload = await AsyncSharingUtil.run(
+            self.decrypt_payload,
+            encrypted_order.encryption_algorithm,
+            encrypted_order.order_id,
+            encrypted_order.encrypted_data,
+            share_data,
+            size=size + len(encrypted_order.encrypted_data or ''),
+        )
+        reconstructed_data = json.loads(payload)
 
         # 验证数据完整性
         reconstructed_hash = self.calculate_data_hash(reconstructed_data)
         if reconstructed_hash != encrypted_order.data_hash:
             raise ValueError('数据完整性验证失败')
 
+        self._put_cached(encrypted_order, payload)
         return reconstructed_data
 
-    async def encrypt_orders(self, order_ids: List[int], k: int = 3, n: int = 5) -> List[Dict[str, Any]]:
-        """批量加密订单"""
+    def _get_cached(self, encrypted_order: EncryptedOrder) -> Optional[Dict[str, Any]]:
+        """读取解密缓存，键中包含数据哈希，订单重新加密后旧条目不会命中"""
+        payload = self.decrypt_cache.get((encrypted_order.id, encrypted_order.data_hash))
+        return json.loads(payload) if payload is not None else None
+
+    def _put_cached(self, encrypted_order: EncryptedOrder, payload: bytes):
+        """缓存已通过完整性校验的整个订单"""
+        self.decrypt_cache.put(
+            (encrypted_order.id, encrypted_order.data_hash),
+            payload,
+            tags=(('encrypted', encrypted_order.id), ('original', encrypted_order.original_order_id)),
+        )
+
+    @staticmethod
+    def invalidate_cached_orders(
+        original_order_ids: Iterable[int] = (), encrypted_order_ids: Iterable[int] = ()
+    ) -> int:
+        """使订单的解密缓存失效（订单更新、删除时调用），返回失效的条目数"""
+        tags = [('original', order_id) for order_id in original_order_ids]
+        tags += [('encrypted', order_id) for order_id in encrypted_order_ids]
+        return PayloadCacheUtil.default().invalidate_tags(tags)
+
+    async def decrypt_orders(
+        self, encrypted_order_ids: Sequence[int], fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        批量解密订单
+
+        一次查询获取全部加密订单；分片经分片读取服务批量读取：一次查询全部分片位置，每个订单只读取k个分片，
+        同一节点上的分片合并为一个请求；所有订单在一次批量运算中重构
+
+        Args:
+            encrypted_order_ids: 加密订单ID列表
+            fields: 只返回指定字段；字段组模式的订单只读取并重构包含这些字段的字段组
+
+        Returns:
+            与 encrypted_order_ids 一一对应的结果，成功时包含 data，失败时包含 error
+        """
+        ids = list(dict.fromkeys(encrypted_order_ids))
+        orders = {order.id: order for order in await self.order_dao.get_encrypted_by_ids(ids)}
+
+        # 缓存命中的订单不再读取分片
+        decrypted: Dict[int, Dict[str, Any]] = {}
+        for order in orders.values():
+            cached = self._get_cached(order)
+            if cached is not None:
+                if fields is not None:
+                    cached = {field: cached[field] for field in fields if field in cached}
+                decrypted[order.id] = cached
+        uncached = [order for order in orders.values() if order.id not in decrypted]
+
+        # 经分片读取服务批量读取，每个订单（字段组模式为每个所需字段组）只读取k个分片
+        reads = []
+        for order in uncached:
+            groups: Sequence[Optional[str]] = (None,)
+            if order.encryption_algorithm == self.ALGORITHM_GROUPED:
+                index = json.loads(order.encrypted_data)
+                groups = self.groups_for_fields(index, fields) if fields is not None else sorted(index['groups'])
+            reads.append((order.id, order.k_value, groups))
+        order_shares, errors = await self._get_shard_reader().read_many(reads)
+
+        pending: List[EncryptedOrder] = []
+        items = []
+        total_size = 0
+        for order in uncached:
+            if order.id not in order_shares:
+                continue
+            share_data = order_shares[order.id]
+            if order.encryption_algorithm != self.ALGORITHM_GROUPED:
+                share_data = share_data[None]
+                size = sum(len(share) for share in share_data)
+            else:
+                size = sum(len(share) for shares in share_data.values() for share in shares)
+            pending.append(order)
+            items.append((order.encryption_algorithm, order.order_id, order.encrypted_data, share_data))
+            total_size += size + len(order.encrypted_data or '')
+
+        outcomes = await AsyncSharingUtil.run(self.decrypt_payloads, items, size=total_size) if items else []
+        for order, (payload, error) in zip(pending, outcomes):
+            if error is not None:
+                errors[order.id] = error
+                continue
+            data = json.loads(payload)
+            # 字段组模式的部分解密已按组哈希校验，其余情况校验整个订单的哈希
+            partial = fields is not None and order.encryption_algorithm == self.ALGORITHM_GROUPED
+            if not partial:
+                if self.calculate_data_hash(data) != order.data_hash:
+                    errors[order.id] = '数据完整性验证失败'
+                    continue
+                self._put_cached(order, payload)
+            if fields is not None:
+                data = {field: data[field] for field in fields if field in data}
+            decrypted[order.id] = data
+
+        results = []
+        for encrypted_order_id in ids:
+            order = orders.get(encrypted_order_id)
+            if order is None:
+                results.append({'encrypted_order_id': encrypted_order_id, 'error': '加密订单不存在'})
+            elif encrypted_order_id in decrypted:
+                results.append({
+                    'encrypted_order_id': encrypted_order_id,
+                    'order_id': order.order_id,
+                    'data': decrypted[encrypted_order_id],
+                })
+            else:
+                results.append({
+                    'encrypted_order_id': encrypted_order_id,
+                    'order_id': order.order_id,
+                    'error': errors[encrypted_order_id],
+                })
+        return results
+
+    async def _read_share_data(
+        self, encrypted_order: EncryptedOrder, groups: Optional[Sequence[str]] = None
+    ) -> Tuple[Any, int]:
+        """
+        通过分片读取服务读取重构所需的分片
+
+        Args:
+            encrypted_order: 加密订单
+            groups: 字段组模式下需要的字段组，默认为字段索引中的全部字段组
+
+        Returns:
+            (分片数据, 分片总字节数)；字段组模式的分片数据为 字段组 -> k个分片
+        """
+        if encrypted_order.encryption_algorithm != self.ALGORITHM_GROUPED:
+            shares = (await self._get_shard_reader().read(encrypted_order.id, encrypted_order.k_value))[None]
+            return shares, sum(len(share) for share in shares)
+
+        if groups is None:
+            groups = sorted(json.loads(encrypted_order.encrypted_data)['groups'])
+        share_data = await self._get_shard_reader().read(encrypted_order.id, encrypted_order.k_value, groups)
+        return share_data, sum(len(share) for shares in share_data.values() for share in shares)
+
+    async def decrypt_fields(self, encrypted_order_id: int, fields: Sequence[str]) -> Dict[str, Any]:
+        """
+        只解密指定字段
+
+        字段组模式的订单只读取并重构包含所需字段的字段组（组内载荷按组哈希校验）；
+        其他模式需重构整个订单后再筛选字段
+
+        Args:
+            encrypted_order_id: 加密订单ID
+            fields: 需要的字段名
+
+        Returns:
+            字段名 -> 字段值（订单中不存在的字段不返回）
+        """
+        encrypted_order = await self.order_dao.get_encrypted_by_id(encrypted_order_id)
+        if not encrypted_order:
+            raise ValueError('加密订单不存在')
+
+        if encrypted_order.encryption_algorithm != self.ALGORITHM_GROUPED:
+            order_data = await self.decrypt_order(encrypted_order_id)
+            return {field: order_data[field] for field in fields if field in order_data}
+
+        cached = self._get_cached(encrypted_order)
+        if cached is not None:
+            return {field: cached[field] for field in fields if field in cached}
+
+        index = json.loads(encrypted_order.encrypted_data)
+        groups = self.groups_for_fields(index, fields)
+        if not groups:
+            return {}
+
+        share_data, size = await self._read_share_data(encrypted_order, groups)
+
+        group_fields = await AsyncSharingUtil.run(self.decrypt_field_groups, index, share_data, size=size)
+        return {field: group_fields[field] for field in fields if field in group_fields}
+
+    async def encrypt_orders(
+        self, order_ids: List[int], k: int = 3, n: int = 5, mode: Optional[str] = None, commit: bool = True
+    ) -> List[Dict[str, Any]]:
+        """批量加密订单，commit 为 False 时只写入不提交，由调用方控制事务"""
+        # 一次查询获取全部订单
+        orders = await self.order_dao.get_orders_by_ids(order_ids)
+        order_map = {order.id: order for order in orders}
+        found_ids = [order_id for order_id in order_ids if order_id in order_map]
+
+        # 所有订单在一次批量运算中完成加密与分片，总量较大时在进程池中执行
+        order_data_list = [self._build_order_data(order_map[order_id]) for order_id in found_ids]
+        payload_items = [
+            (order_data['order_id'], json.dumps(order_data, ensure_ascii=False).encode('utf-8'))
+            for order_data in order_data_list
+        ]
+        encrypted_list = await AsyncSharingUtil.run(
+            self.encrypt_payloads, payload_items, k, n, mode, size=sum(len(payload) for _, payload in payload_items)
+        )
+        encrypted_map = dict(zip(found_ids, zip(order_data_list, encrypted_list)))
+        storage_nodes = [node.node_name for node in await self.shard_dao.get_storage_nodes() if node.is_active]
+        # 开启分片信封加密时整批订单共用一个新的数据密钥
+        data_key = await self.key_service.create_data_key() if settings.SHARD_ENVELOPE_ENABLED and found_ids else None
+
         results = []
+        order_rows = []
+        order_shard_rows = []
         for order_id in order_ids:
+            if order_id not in encrypted_map:
+                results.append({'order_id': order_id, 'error': '订单不存在'})
+                continue
             try:
-                result = await self.encrypt_order(order_id, k, n)
-                results.append(result)
+                order_data, (algorithm, shares, ciphertext, commitments) = encrypted_map[order_id]
+                order_row, shard_rows, result = self._build_encrypted_rows(
+                    order_id, order_data, algorithm, shares, ciphertext, commitments, k, n, storage_nodes, data_key
+                )
             except Exception as e:
                 results.append({'order_id': order_id, 'error': str(e)})
+                continue
+            order_rows.append(order_row)
+            order_shard_rows.append(shard_rows)
+            results.append(result)
+
+        # 加密订单与分片按批批量插入，随批次一起在一个事务中提交；插入失败时整批回滚
+        if order_rows:
+            try:
+                encrypted_ids = await self.order_dao.create_encrypted_orders(order_rows, settings.DB_BULK_INSERT_ROWS)
+                all_shard_rows = []
+                for encrypted_order_id, shard_rows in zip(encrypted_ids, order_shard_rows):
+                    for shard_row in shard_rows:
+                        shard_row['encrypted_order_id'] = encrypted_order_id
+                    all_shard_rows.extend(shard_rows)
+                shard_ids = await self.shard_dao.create_shards(all_shard_rows, settings.DB_BULK_INSERT_ROWS)
+            except Exception:
+                await self.db.rollback()
+                raise
+
+            saved_ids = iter(encrypted_ids)
+            for result in results:
+                if 'error' not in result:
+                    result['encrypted_order_id'] = next(saved_ids)
+
+            # 本次加密产生的全部分片构建一棵Merkle树，批次根用于整批或单个分片的完整性校验
+            batch_shards = [
+                (shard_pk, shard_row['shard_id'], shard_row['checksum'])
+                for shard_pk, shard_row in zip(shard_ids, all_shard_rows)
+            ]
+            batch = await self.batch_service.create_batch(batch_shards, 'encrypt')
+            if commit:
+                await self.db.commit()
+            for result in results:
+                if 'error' not in result:
+                    result['batch_id'] = batch['batch_id']
         return results
 
     async def get_encryption_statistics(self) -> Dict[str, Any]:
@@ -262,17 +811,10 @@ class EncryptionService:
     async def decrypt_non_sensitive_fields(self, encrypted_order_id: int, fields: List[str], order_id: str = None) -> Dict[str, Any]:
         """解密非敏感字段"""
         try:
-            # 解密整个订单
-            order_data = await self.decrypt_order(encrypted_order_id)
-
-            # 只返回指定的非敏感字段
-            non_sensitive_fields = ['order_id', 'user_id', 'total_amount']
-            result = {}
+            # 只解密指定的非敏感字段（字段组模式下只重构所需的字段组）
+            requested = [field for field in fields if field in self.NON_SENSITIVE_FIELDS]
+            result = await self.decrypt_fields(encrypted_order_id, requested)
 
-            for field in fields:
-                if field in non_sensitive_fields and field in order_data:
-                    result[field] = order_data[field]
-                    
             # 如果提供了order_id参数，添加到结果中
             if order_id:
                 result['order_id'] = order_id
@@ -0,0 +1,219 @@
+"""
+密钥服务
+信封加密密钥层级（主密钥 → KEK → 批次数据密钥）的持久化、轮换与解包缓存
+"""
+
+import uuid
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from module_dvss.dao.key_dao import KeyDAO
+from module_dvss.entity.encryption_key import EncryptionKey
+from utils.crypto_util import CryptoUtil, EncryptionKeyManager
+from utils.log_util import LogUtil
+from utils.payload_cache_util import PayloadCacheUtil
+
+logger = LogUtil.get_logger('key_service')
+
+
+class KeyService:
+    """
+    密钥服务
+
+    - 每个加密批次生成一个数据密钥，由当前KEK包装后与批次数据在同一事务中保存
+    - 解包后的KEK与数据密钥在进程内缓存（有效期 KEY_CACHE_TTL_SECONDS），解密热路径不必每次访问密钥库
+    - KEK轮换：生成新KEK，按游标分批用新KEK重新包装旧KEK下的数据密钥后停用旧KEK，
+      耗时与密钥数量成正比、与业务数据量无关；密钥材料不变，已加密的数据与缓存都无需处理
+    - 主密钥轮换：用新主密钥重新包装全部KEK，完成后更新 KEY_MASTER_KEY 配置
+    """
+
+    REWRAP_BATCH_SIZE = 500
+
+    _key_cache: Optional[PayloadCacheUtil] = None
+
+    def __init__(self, db: AsyncSession, key_manager: Optional[EncryptionKeyManager] = None):
+        self.db = db
+        self.key_dao = KeyDAO(db)
+        self.key_manager = key_manager or EncryptionKeyManager.from_settings()
+
+    @classmethod
+    def _cache(cls) -> PayloadCacheUtil:
+        """进程内的解包密钥缓存"""
+        if cls._key_cache is None:
+            cls._key_cache = PayloadCacheUtil(
+                max_bytes=settings.KEY_CACHE_MAX_KEYS * EncryptionKeyManager.KEY_SIZE,
+                ttl=settings.KEY_CACHE_TTL_SECONDS,
+            )
+        return cls._key_cache
+
+    def _kek_material(self, kek: EncryptionKey) -> bytes:
+        """解包KEK（优先使用缓存）"""
+        material = self._cache().get(kek.key_id)
+        if material is None:
+            material = self.key_manager.unwrap_kek(kek.wrapped_key, kek.key_id)
+            self._cache().put(kek.key_id, material)
+        return material
+
+    async def _create_kek(self) -> Tuple[str, bytes]:
+        """生成新的KEK并以主密钥包装后保存"""
+        key_id = f'kek_{uuid.uuid4().hex}'
+        material = EncryptionKeyManager.generate_key()
+        await self.key_dao.create_key(
+            EncryptionKey(
+                key_id=key_id,
+                key_type='kek',
+                wrapped_key=self.key_manager.wrap_kek(material, key_id),
+                status='active',
+            )
+        )
+        self._cache().put(key_id, material)
+        return key_id, material
+
+    async def create_data_key(self) -> Tuple[str, bytes]:
+        """
+        生成一个批次数据密钥（只刷新不提交，随批次数据一起提交）
+
+        Returns:
+            (密钥ID, 密钥)
+        """
+        kek = await self.key_dao.get_active_kek()
+        if kek is None:
+            kek_id, kek_material = await self._create_kek()
+        else:
+            kek_id, kek_material = kek.key_id, self._kek_material(kek)
+
+        key_id = f'dek_{uuid.uuid4().hex}'
+        material = EncryptionKeyManager.generate_key()
+        await self.key_dao.create_key(
+            EncryptionKey(
+                key_id=key_id,
+                key_type='dek',
+                parent_key_id=kek_id,
+                wrapped_key=EncryptionKeyManager.wrap(material, kek_material, key_id),
+                status='active',
+            )
+        )
+        self._cache().put(key_id, material)
+        return key_id, material
+
+    async def get_data_keys(self, key_ids: Iterable[str]) -> Dict[str, bytes]:
+        """
+        批量获取解包后的数据密钥，未缓存的密钥及其KEK各用一次查询读取
+
+        Raises:
+            ValueError: 密钥不存在
+        """
+        keys: Dict[str, bytes] = {}
+        missing = []
+        for key_id in set(key_ids):
+            material = self._cache().get(key_id)
+            if material is None:
+                missing.append(key_id)
+            else:
+                keys[key_id] = material
+        if not missing:
+            return keys
+
+        records = await self.key_dao.get_by_key_ids(missing)
+        keks = {kek.key_id: kek for kek in await self.key_dao.get_by_key_ids({r.parent_key_id for r in records})}
+        for record in records:
+            if record.parent_key_id not in keks:
+                raise ValueError(f'数据密钥 {record.key_id} 的KEK不存在')
+            material = EncryptionKeyManager.unwrap(
+                record.wrapped_key, self._kek_material(keks[record.parent_key_id]), record.key_id
+            )
+            self._cache().put(record.key_id, material)
+            keys[record.key_id] = material
+
+        absent = set(missing) - set(keys)
+        if absent:
+            raise ValueError(f'数据密钥不存在: {", ".join(sorted(absent))}')
+        return keys
+
+    @staticmethod
+    def seal(data: bytes, key: bytes, associated_data: str) -> bytes:
+        """用数据密钥加密（associated_data 绑定数据所属对象，防止密文被挪用）"""
+        return CryptoUtil.encrypt_aes_gcm(data, key, associated_data.encode('utf-8'))
+
+    async def open_shards(self, shards: Sequence[Any]) -> Dict[int, bytes]:
+        """
+        解密分片数据
+
+        Args:
+            shards: 带有 id、shard_id、key_id、shard_data 的分片（ORM对象或查询结果行）
+
+        Returns:
+            分片主键 -> 分片数据；未加密的分片原样返回，解密失败的分片不返回（视为不可用）
+        """
+        keys = await self.get_data_keys({shard.key_id for shard in shards if shard.key_id})
+        opened: Dict[int, bytes] = {}
+        for shard in shards:
+            if not shard.key_id:
+                opened[shard.id] = bytes(shard.shard_data)
+                continue
+            try:
+                opened[shard.id] = CryptoUtil.decrypt_aes_gcm(
+                    bytes(shard.shard_data), keys[shard.key_id], shard.shard_id.encode('utf-8')
+                )
+            except Exception:
+                logger.warning(f'分片 {shard.shard_id} 解密失败，视为不可用')
+        return opened
+
+    async def rotate_kek(self) -> Dict[str, Any]:
+        """
+        轮换KEK：用新KEK重新包装全部数据密钥后停用旧KEK
+
+        每批重新包装后提交，中断后再次执行即可继续（剩余的数据密钥仍由旧KEK包装）
+        """
+        old_keks = await self.key_dao.get_keks()
+        old_ids = [kek.key_id for kek in old_keks]
+        new_id, new_material = await self._create_kek()
+        old_materials = {kek.key_id: self._kek_material(kek) for kek in old_keks}
+
+        rewrapped = 0
+        after_id = 0
+        while old_materials:
+            batch = await self.key_dao.get_data_keys_wrapped_by(list(old_materials), after_id, self.REWRAP_BATCH_SIZE)
+            if not batch:
+                break
+            now = datetime.now(timezone.utc)
+            for record in batch:
+                record.wrapped_key = EncryptionKeyManager.rewrap(
+                    record.wrapped_key, old_materials[record.parent_key_id], new_material, record.key_id
+                )
+                record.parent_key_id = new_id
+                record.rotated_at = now
+            after_id = batch[-1].id
+            rewrapped += len(batch)
+            await self.db.commit()
+
+        for kek in old_keks:
+            kek.status = 'retired'
+        await self.db.commit()
+
+        logger.info(f'KEK已轮换为 {new_id}，重新包装数据密钥 {rewrapped} 个')
+        return {
+            'kek_id': new_id,
+            'retired_keks': old_ids,
+            'rewrapped_data_keys': rewrapped,
+        }
+
+    async def rotate_master_key(self, new_master_key: bytes) -> Dict[str, Any]:
+        """
+        轮换主密钥：用新主密钥重新包装全部KEK，完成后需将 KEY_MASTER_KEY 更新为新主密钥
+        """
+        new_manager = EncryptionKeyManager(new_master_key)
+        keks = await self.key_dao.get_keks()
+        now = datetime.now(timezone.utc)
+        for kek in keks:
+            kek.wrapped_key = new_manager.wrap_kek(self.key_manager.unwrap_kek(kek.wrapped_key, kek.key_id), kek.key_id)
+            kek.rotated_at = now
+        await self.db.commit()
+        self.key_manager = new_manager
+
+        logger.info(f'主密钥已轮换，重新包装KEK {len(keks)} 个')
+        return {'rewrapped_keks': len(keks)}
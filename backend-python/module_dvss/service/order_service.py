@@ -17,6 +17,7 @@ from module_dvss.schemas.order_schema import (
     OrderStatistics,
     OrderUpdate,
 )
+from module_dvss.service.encryption_service import EncryptionService
 from utils.log_util import LogUtil
 
 logger = LogUtil.get_logger('order_service')
@@ -203,6 +204,7 @@ class OrderService:
             # 保存更新
             await OrderDAO.update(query_db, order)
             await query_db.commit()
+            EncryptionService.invalidate_cached_orders(original_order_ids=[order_id])
 
             return CrudResponseModel(is_success=True, message='更新成功')
 
@@ -0,0 +1,195 @@
+"""
+订单校验服务
+将激活的订单字段配置编译为校验计划，按列对整批订单做向量化校验，并按字段配置版本缓存
+"""
+
+import hashlib
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import Integer, Numeric, String
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from module_dvss.dao.field_dao import FieldDAO
+from module_dvss.entity.original_order import OriginalOrder
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('order_validation_service')
+
+_INTEGER_PATTERN = r'[+-]?\d+'
+_DECIMAL_PATTERN = r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?'
+
+# 字段配置类型（不区分大小写）对应的格式校验
+_TYPE_PATTERNS = {
+    'integer': _INTEGER_PATTERN,
+    'int': _INTEGER_PATTERN,
+    'decimal': _DECIMAL_PATTERN,
+    'number': _DECIMAL_PATTERN,
+    'float': _DECIMAL_PATTERN,
+    'email': r'[^@\s]+@[^@\s]+\.[^@\s]+',
+    'phone': r'\+?[\d\s\-()]{5,20}',
+    'boolean': r'(?i:true|false|yes|no|0|1)',
+}
+_DATE_TYPES = ('date', 'datetime')
+
+# 上传数据中缺失时由系统填充的字段：有默认值的列，以及取上传用户的 user_id
+_SYSTEM_FILLED = {
+    column.name
+    for column in OriginalOrder.__table__.columns
+    if column.default is not None or column.server_default is not None or column.primary_key
+} | {'user_id'}
+
+
+class _ColumnRule:
+    """单列的校验规则"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.required = False
+        self.patterns: List[str] = []
+        self.max_length: Optional[int] = None
+        self.max_abs: Optional[float] = None
+        self.is_date = False
+
+    def invalid(self, values: pd.Series, present: pd.Series) -> pd.Series:
+        """非空值中格式、长度或范围不合法的行"""
+        ok = pd.Series(True, index=values.index)
+        for pattern in self.patterns:
+            ok &= values.str.fullmatch(pattern, na=False).astype(bool)
+        if self.max_length is not None:
+            ok &= values.str.len().le(self.max_length).fillna(True)
+        if self.max_abs is not None:
+            numbers = pd.to_numeric(values.where(ok & present), errors='coerce')
+            ok &= numbers.abs().lt(self.max_abs) | numbers.isna()
+        if self.is_date:
+            ok &= pd.to_datetime(values.where(present), errors='coerce', format='mixed').notna() | ~present
+        return present & ~ok
+
+
+class OrderValidationPlan:
+    """
+    编译后的订单校验计划
+
+    - 必填字段：空值（缺失、空字符串或只有空白）的行不合法，系统会填充的字段除外
+    - 格式：数值、整数、邮箱、电话、布尔、日期按字段配置类型校验；原始订单表的整数与定点数列按列类型校验，
+      定点数同时校验整数部分的位数，字符串列校验最大长度
+    - 所有检查按列向量化执行，一次返回全部不合法的行及其全部错误
+    """
+
+    def __init__(self, version: str, rules: Dict[str, _ColumnRule]):
+        self.version = version
+        self.rules = rules
+
+    @classmethod
+    def compile(cls, fields: Sequence[Any], version: str) -> 'OrderValidationPlan':
+        """由激活字段的 (字段名称, 字段类型, 是否必填) 与原始订单表的列类型编译校验计划"""
+        rules: Dict[str, _ColumnRule] = {}
+
+        def rule(name: str) -> _ColumnRule:
+            return rules.setdefault(name, _ColumnRule(name))
+
+        rule('order_id').required = True
+        for column in OriginalOrder.__table__.columns:
+            if column.name in _SYSTEM_FILLED:
+                continue
+            if isinstance(column.type, Integer):
+                rule(column.name).patterns.append(_INTEGER_PATTERN)
+            elif isinstance(column.type, Numeric):
+                rule(column.name).patterns.append(_DECIMAL_PATTERN)
+                if column.type.precision is not None:
+                    rule(column.name).max_abs = 10.0 ** (column.type.precision - (column.type.scale or 0))
+            elif isinstance(column.type, String) and column.type.length:
+                rule(column.name).max_length = column.type.length
+
+        for field_name, field_type, is_required in fields:
+            field_rule = rule(field_name)
+            if is_required and field_name not in _SYSTEM_FILLED:
+                field_rule.required = True
+            field_type = (field_type or '').lower()
+            pattern = _TYPE_PATTERNS.get(field_type)
+            if pattern and pattern not in field_rule.patterns:
+                field_rule.patterns.append(pattern)
+            field_rule.is_date = field_rule.is_date or field_type in _DATE_TYPES
+
+        return cls(version, rules)
+
+    @staticmethod
+    def normalize(frame: pd.DataFrame) -> pd.DataFrame:
+        """所有列转为去除首尾空白的字符串，空值统一为 None"""
+        normalized = {}
+        for name in frame.columns:
+            column = frame[name]
+            missing = column.isna()
+            values = column.astype(str).str.strip()
+            normalized[name] = values.where(~missing & values.ne(''), None)
+        return pd.DataFrame(normalized, index=frame.index, dtype=object)
+
+    def validate(self, frame: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        校验一批订单
+
+        Args:
+            frame: 每行一个订单，索引为从0开始的行号
+
+        Returns:
+            (合法的行（值已规范化）, 不合法的行 [{'row': 行号, 'order_id': 订单号, 'errors': [错误]}])
+        """
+        frame = self.normalize(frame)
+        failures: Dict[str, pd.Series] = {}
+        for name, rule in self.rules.items():
+            if name not in frame.columns:
+                if rule.required:
+                    failures[f'必填字段 {name} 不能为空'] = pd.Series(True, index=frame.index)
+                continue
+            values = frame[name]
+            present = values.notna()
+            if rule.required:
+                failures[f'必填字段 {name} 不能为空'] = ~present
+            if rule.patterns or rule.max_length is not None or rule.max_abs is not None or rule.is_date:
+                failures[f'字段 {name} 的值无效'] = rule.invalid(values, present)
+
+        if not failures:
+            return frame, []
+        failed = pd.DataFrame(failures, index=frame.index)
+        bad = failed.any(axis=1)
+        if not bad.any():
+            return frame, []
+
+        messages = np.array(failed.columns)
+        order_ids = frame['order_id'][bad].tolist() if 'order_id' in frame.columns else [None] * int(bad.sum())
+        errors = [
+            {'row': int(row) + 1, 'order_id': order_id, 'errors': messages[flags].tolist()}
+            for row, order_id, flags in zip(failed.index[bad], order_ids, failed.to_numpy()[bad.to_numpy()])
+        ]
+        return frame[~bad], errors
+
+
+class OrderValidationService:
+    """订单校验计划的获取与缓存（进程内按字段配置版本缓存最近一次编译的计划）"""
+
+    _plan: Optional[OrderValidationPlan] = None
+
+    def __init__(self, db: AsyncSession):
+        self.field_dao = FieldDAO(db)
+
+    async def get_plan(self) -> OrderValidationPlan:
+        """
+        获取当前字段配置的校验计划
+
+        每次只查询激活字段的校验相关列，以其摘要作为配置版本，版本未变化时复用已编译的计划
+        """
+        fields = await self.field_dao.get_active_field_rules()
+        digest = hashlib.sha256()
+        for field_name, field_type, is_required in fields:
+            digest.update(f'{field_name}\x1f{field_type}\x1f{bool(is_required)}\x1e'.encode('utf-8'))
+        version = digest.hexdigest()[:16]
+
+        plan = OrderValidationService._plan
+        if plan is None or plan.version != version:
+            plan = OrderValidationPlan.compile(fields, version)
+            OrderValidationService._plan = plan
+            logger.info(f'订单校验计划已编译: 字段配置版本 {version}, {len(plan.rules)} 列')
+        return plan
@@ -0,0 +1,278 @@
+"""
+分片重分享服务
+阈值策略（k、n）变化时，在不解密订单的前提下将已有分片转换为新的 (k', n') 分片，或原地刷新分片
+"""
+
+import hashlib
+import os
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import AsyncSessionLocal
+from config.env import SensitivityConfig as SensitivitySettings
+from config.settings import settings
+from exceptions.custom_exception import NotFoundError, ValidationError
+from module_dvss.dao.order_dao import OrderDAO
+from module_dvss.dao.reshare_job_dao import ReshareJobDAO
+from module_dvss.dao.shard_dao import ShardDAO
+from module_dvss.entity.encrypted_order import EncryptedOrder
+from module_dvss.entity.reshare_job import ReshareJob
+from module_dvss.entity.shard_info import ShardInfo
+from module_dvss.service.key_service import KeyService
+from module_dvss.service.shard_batch_service import ShardBatchService
+from utils.async_sharing_util import AsyncSharingUtil
+from utils.log_util import LogUtil
+from utils.reshare_util import ReshareUtil
+from utils.share_codec_util import ShareCodecUtil
+
+logger = LogUtil.get_logger('reshare_service')
+
+
+def load_threshold_policy() -> Dict[str, int]:
+    """读取 thresholds.yaml 中的阈值策略，文件不存在时使用应用设置"""
+    policy = {
+        'k_min': 2,
+        'k_max': 10,
+        'k': settings.SECRET_SHARING_THRESHOLD,
+        'n': settings.SECRET_SHARING_TOTAL,
+    }
+    path = SensitivitySettings.thresholds_config_path
+    if not os.path.exists(path):
+        return policy
+
+    with open(path, encoding='utf-8') as f:
+        config = (yaml.safe_load(f) or {}).get('dynamic_threshold', {})
+    k_range = config.get('k_range', {})
+    sharding = config.get('sharding', {})
+    policy['k_min'] = k_range.get('min', policy['k_min'])
+    policy['k_max'] = k_range.get('max', policy['k_max'])
+    policy['k'] = sharding.get('default_threshold', k_range.get('default', policy['k']))
+    policy['n'] = sharding.get('total_shards', policy['n'])
+    return policy
+
+
+class ReshareService:
+    """分片重分享服务"""
+
+    DEFAULT_BATCH_SIZE = 200
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.order_dao = OrderDAO(db)
+        self.shard_dao = ShardDAO(db)
+        self.job_dao = ReshareJobDAO(db)
+        self.key_service = KeyService(db)
+        self.batch_service = ShardBatchService(db)
+
+    async def create_job(
+        self, user_id: int, k_new: Optional[int] = None, n_new: Optional[int] = None, batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        创建重分享任务
+
+        Args:
+            user_id: 创建人ID
+            k_new: 新阈值，为空时取 thresholds.yaml 的默认阈值
+            n_new: 新分片总数，为空时取 thresholds.yaml 的 total_shards
+            batch_size: 每批处理的订单数（每批一个事务）
+
+        Returns:
+            任务信息
+        """
+        try:
+            policy = load_threshold_policy()
+            k_new = k_new or policy['k']
+            n_new = n_new or policy['n']
+            if not policy['k_min'] <= k_new <= policy['k_max']:
+                raise ValidationError(f'阈值需在 {policy["k_min"]}~{policy["k_max"]} 之间')
+            if k_new > n_new:
+                raise ValidationError('阈值不能大于总分片数')
+
+            job = ReshareJob(
+                k_new=k_new,
+                n_new=n_new,
+                batch_size=batch_size or self.DEFAULT_BATCH_SIZE,
+                status='pending',
+                cursor=0,
+                total_orders=await self.order_dao.count_encrypted_after(0),
+                created_by=user_id,
+            )
+            job = await self.job_dao.create_job(job)
+            return job.to_dict()
+        except Exception as e:
+            logger.error(f'创建重分享任务失败: {str(e)}')
+            raise
+
+    async def get_job(self, job_id: int) -> Dict[str, Any]:
+        """获取重分享任务"""
+        job = await self.job_dao.get_job_by_id(job_id)
+        if not job:
+            raise NotFoundError('重分享任务不存在')
+        return job.to_dict()
+
+    async def run_job(self, job_id: int) -> Dict[str, Any]:
+        """
+        执行（或从游标处继续执行）重分享任务
+
+        按加密订单ID分批处理，每批的分片替换、订单参数与任务游标在同一事务中提交，
+        中断后再次执行会从最后提交的游标继续
+        """
+        job = await self.job_dao.get_job_by_id(job_id)
+        if not job:
+            raise NotFoundError('重分享任务不存在')
+        if job.status == 'completed':
+            return job.to_dict()
+
+        job.status = 'running'
+        job.last_error = None
+        await self._commit_job(job)
+
+        try:
+            while True:
+                orders = await self.order_dao.get_encrypted_after(job.cursor, job.batch_size)
+                if not orders:
+                    break
+                await self._reshare_batch(job, orders)
+                await self._commit_job(job)
+                logger.info(f'重分享任务 {job.id} 进度: {job.processed_orders + job.failed_orders}/{job.total_orders}')
+
+            job.status = 'completed'
+            job.finished_at = datetime.now(timezone.utc)
+            await self._commit_job(job)
+            return job.to_dict()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'重分享任务 {job_id} 执行失败: {str(e)}')
+            job = await self.job_dao.get_job_by_id(job_id)
+            job.status = 'failed'
+            job.last_error = str(e)
+            await self._commit_job(job)
+            raise
+
+    async def _commit_job(self, job: ReshareJob):
+        """提交事务并刷新任务状态（提交后属性会过期，异步会话中不能延迟加载）"""
+        await self.db.commit()
+        await self.db.refresh(job)
+
+    async def _reshare_batch(self, job: ReshareJob, orders: List[EncryptedOrder]):
+        """重分享一批订单（不提交事务）"""
+        shards = await self.shard_dao.get_by_encrypted_order_ids([order.id for order in orders])
+        # 只有激活的分片参与重分享；替换时删除订单的全部分片（含已损坏等非激活分片），以免与新分片的 shard_id 冲突
+        shard_map: Dict[int, List[ShardInfo]] = {}
+        order_shards: Dict[int, List[ShardInfo]] = {}
+        for shard in shards:
+            order_shards.setdefault(shard.encrypted_order_id, []).append(shard)
+            if shard.status == 'active':
+                shard_map.setdefault(shard.encrypted_order_id, []).append(shard)
+        # 信封加密的分片先解密，无法解密的分片不参与重分享
+        opened = await self.key_service.open_shards([shard for shards in shard_map.values() for shard in shards])
+
+        # 字段组模式的订单每个字段组独立重分享
+        items: List[Tuple[List[bytes], Optional[bytes]]] = []
+        item_keys: List[Tuple[int, Optional[str]]] = []
+        for order in orders:
+            group_map: Dict[Optional[str], List[ShardInfo]] = {}
+            for shard in sorted(shard_map.get(order.id, []), key=lambda shard: shard.shard_index):
+                group_map.setdefault(shard.field_group, []).append(shard)
+            if not group_map:
+                group_map[None] = []
+            for group, group_shards in group_map.items():
+                items.append(([opened[shard.id] for shard in group_shards if shard.id in opened], order.commitments))
+                item_keys.append((order.id, group))
+
+        # 子共享与合并为纯CPU运算，批量提交到进程池
+        results = await AsyncSharingUtil.run(
+            ReshareUtil.reshare_many,
+            items,
+            job.k_new,
+            job.n_new,
+            size=sum(len(share) for order_shares, _ in items for share in order_shares),
+        )
+
+        # 新分片按序号轮流分配到激活的存储节点
+        storage_nodes = [node.node_name for node in await self.shard_dao.get_storage_nodes() if node.is_active]
+        # 开启信封加密或旧分片已加密时，新分片用本批次的新数据密钥加密
+        data_key = None
+        if settings.SHARD_ENVELOPE_ENABLED or any(shard.key_id for shard in shards):
+            data_key = await self.key_service.create_data_key()
+
+        # 本批次的新分片构成一个新的Merkle批次，被替换分片所在的旧批次标记为已取代
+        batch_shards: List[Tuple[int, str, str]] = []
+        superseded = set()
+
+        order_results: Dict[int, List[Tuple[Optional[str], Tuple]]] = {}
+        for (order_id, group), result in zip(item_keys, results):
+            order_results.setdefault(order_id, []).append((group, result))
+
+        for order in orders:
+            errors = [error for _, (_, _, error) in order_results[order.id] if error is not None]
+            if errors:
+                job.failed_orders += 1
+                job.last_error = f'订单 {order.order_id}: {errors[0]}'
+                continue
+
+            template = shard_map[order.id][0]
+            new_shards = []
+            for group, (new_shares, new_commitments, _) in order_results[order.id]:
+                # 恢复所需的分片数取自新分片头部：打包分片为 k' + l - 1，其余为 k'
+                threshold = ShareCodecUtil.decode(new_shares[0], verify=False).k
+                prefix = f'{order.order_id}_{group}' if group else order.order_id
+                for i, share in enumerate(new_shares):
+                    shard_id = f'{prefix}_shard_{i}'
+                    if data_key is not None:
+                        share = KeyService.seal(share, data_key[1], shard_id)
+                    new_shards.append(
+                        ShardInfo(
+                            encrypted_order_id=order.id,
+                            shard_id=shard_id,
+                            shard_index=i,
+                            shard_data=share,
+                            key_id=data_key[0] if data_key is not None else None,
+                            storage_node=storage_nodes[i % len(storage_nodes)] if storage_nodes else None,
+                            checksum=hashlib.sha256(share).hexdigest(),
+                            status='active',
+                            threshold=threshold,
+                            total_shards=job.n_new,
+                            algorithm=template.algorithm,
+                            field_group=group,
+                            user_id=template.user_id,
+                            original_order_id=template.original_order_id,
+                        )
+                    )
+            old_shards = order_shards[order.id]
+            old_batches = {shard.batch_id for shard in old_shards}
+            # 每个订单一个保存点：替换失败的订单计入失败数，不影响本批其它订单
+            try:
+                async with self.db.begin_nested():
+                    await self.shard_dao.replace_order_shards(old_shards, new_shards)
+            except Exception as e:
+                job.failed_orders += 1
+                job.last_error = f'订单 {order.order_id}: {str(e)}'
+                continue
+
+            superseded.update(old_batches)
+            batch_shards.extend((shard.id, shard.shard_id, shard.checksum) for shard in new_shards)
+
+            order.k_value = threshold
+            order.n_value = job.n_new
+            order.commitments = new_commitments
+            job.processed_orders += 1
+
+        if batch_shards:
+            await self.batch_service.create_batch(batch_shards, 'reshare', job.created_by)
+        await self.batch_service.supersede_batches(superseded)
+        job.cursor = orders[-1].id
+
+
+async def run_reshare_job(job_id: int):
+    """后台执行重分享任务（使用独立的数据库会话）"""
+    async with AsyncSessionLocal() as db:
+        try:
+            await ReshareService(db).run_job(job_id)
+        except Exception as e:
+            logger.error(f'后台重分享任务 {job_id} 失败: {str(e)}')
@@ -5,7 +5,10 @@
 import re
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from exceptions.custom_exception import DVSSException
 from module_dvss.dao.field_dao import FieldDAO
@@ -78,6 +81,18 @@ class SensitivityService:
             'token': 'system',
         }
 
+        # 字段值中的其他敏感模式及其分值
+        self.sensitive_value_patterns = [
+            (r'\b(?:visa|mastercard|amex|discover)\b', 0.9),
+            (r'\b(?:password|secret|private|confidential)\b', 0.95),
+            (r'\b(?:admin|administrator|root|system)\b', 0.8),
+            (r'\b\d{3}-\d{2}-\d{4}\b', 0.95),  # SSN格式
+            (r'\b[A-Z]{2}\d{6,9}\b', 0.8),  # 护照号格式
+        ]
+
+        # 按列评分时使用的按分值合并的正则（按检测模式缓存）
+        self._value_regexes: Optional[Tuple[Any, List[Tuple[float, re.Pattern]]]] = None
+
     async def calculate_order_sensitivity(self, order_data: Dict[str, Any]) -> float:
         """计算订单整体敏感度分值"""
         try:
@@ -244,25 +259,10 @@ class SensitivityService:
         # 使用正则表达式检测敏感信息模式
         for pattern_name, pattern in self.pii_patterns.items():
             if re.search(pattern, field_value, re.IGNORECASE):
-                if pattern_name in ['ssn', 'credit_card', 'bank_account']:
-                    max_score = max(max_score, 0.95)
-                elif pattern_name in ['phone', 'email']:
-                    max_score = max(max_score, 0.7)
-                elif pattern_name in ['address', 'date_of_birth']:
-                    max_score = max(max_score, 0.6)
-                else:
-                    max_score = max(max_score, 0.5)
+                max_score = max(max_score, self._pii_pattern_score(pattern_name))
 
         # 检测其他敏感模式
-        sensitive_patterns = [
-            (r'\b(?:visa|mastercard|amex|discover)\b', 0.9),
-            (r'\b(?:password|secret|private|confidential)\b', 0.95),
-            (r'\b(?:admin|administrator|root|system)\b', 0.8),
-            (r'\b\d{3}-\d{2}-\d{4}\b', 0.95),  # SSN格式
-            (r'\b[A-Z]{2}\d{6,9}\b', 0.8),  # 护照号格式
-        ]
-
-        for pattern, score in sensitive_patterns:
+        for pattern, score in self.sensitive_value_patterns:
             if re.search(pattern, field_value, re.IGNORECASE):
                 max_score = max(max_score, score)
 
@@ -272,6 +272,107 @@ class SensitivityService:
 
         return max_score
 
+    @staticmethod
+    def _pii_pattern_score(pattern_name: str) -> float:
+        """PII检测模式命中时的敏感度分值"""
+        if pattern_name in ['ssn', 'credit_card', 'bank_account']:
+            return 0.95
+        elif pattern_name in ['phone', 'email']:
+            return 0.7
+        elif pattern_name in ['address', 'date_of_birth']:
+            return 0.6
+        return 0.5
+
+    def _get_value_regexes(self) -> List[Tuple[float, re.Pattern]]:
+        """将字段值检测模式按分值合并，每个分值一个正则，按分值从高到低排列"""
+        patterns = [(pattern, self._pii_pattern_score(name)) for name, pattern in self.pii_patterns.items()]
+        patterns += self.sensitive_value_patterns
+        key = tuple(patterns)
+        if self._value_regexes is None or self._value_regexes[0] != key:
+            tiers: Dict[float, List[str]] = {}
+            for pattern, score in patterns:
+                # 模式内的捕获分组改为非捕获分组
+                tiers.setdefault(score, []).append(re.sub(r'(?<!\\)\((?!\?)', '(?:', pattern))
+            regexes = [
+                (score, re.compile('|'.join(f'(?:{pattern})' for pattern in tiers[score]), re.IGNORECASE))
+                for score in sorted(tiers, reverse=True)
+            ]
+            self._value_regexes = (key, regexes)
+        return self._value_regexes[1]
+
+    def _analyze_column_value_sensitivity(self, values: pd.Series) -> np.ndarray:
+        """
+        按列分析字段值敏感度（与逐值调用 _analyze_field_value_sensitivity 结果一致）
+
+        相同的值只检测一次；按分值从高到低用合并正则检测，已得到更高分值的值不再检测
+        """
+        codes, uniques = pd.factorize(values.astype(str))
+        uniques = pd.Series(uniques, dtype=object)
+        scores = np.zeros(len(uniques))
+        for score, regex in self._get_value_regexes():
+            pending = np.flatnonzero(scores < score)
+            if not len(pending):
+                break
+            matched = uniques.iloc[pending].str.contains(regex).to_numpy(dtype=bool)
+            scores[pending[matched]] = score
+
+        # 长文本可能包含敏感信息
+        scores = np.where(uniques.str.len().to_numpy() > 100, np.maximum(scores, 0.4), scores)
+        scores = np.where(uniques.str.strip().eq('').to_numpy(), 0.0, scores)
+        return scores[codes]
+
+    async def calculate_frame_sensitivity(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        按列计算一批订单的整体敏感度分值（与逐行调用 calculate_order_sensitivity 结果一致）
+
+        字段名称敏感度每列只计算一次，字段值按列检测
+
+        Args:
+            frame: 每行一个订单，缺失值为 None 或 NaN
+
+        Returns:
+            每行订单的敏感度分值
+        """
+        try:
+            columns = [name for name in frame.columns if not str(name).startswith('_')]
+            field_scores = np.full((len(frame), len(columns)), np.nan)
+
+            for i, name in enumerate(columns):
+                present = frame[name].notna().to_numpy()
+                if not present.any():
+                    continue
+                field_config = await self.get_field_config(str(name))
+                if field_config:
+                    column_scores = np.full(int(present.sum()), float(field_config.sensitivity_score))
+                else:
+                    name_score = await self._analyze_field_name_sensitivity(str(name))
+                    value_scores = self._analyze_column_value_sensitivity(frame[name][present])
+                    column_scores = np.minimum(1.0, np.maximum(name_score, value_scores))
+                field_scores[present, i] = column_scores
+
+            # 按列顺序逐列累加，与逐行计算的求和顺序相同
+            total_score = np.zeros(len(frame))
+            for i in range(len(columns)):
+                total_score += np.nan_to_num(field_scores[:, i])
+            field_count = np.count_nonzero(~np.isnan(field_scores), axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                average_score = total_score / field_count
+
+            # 数据量调整因子与关联性调整因子
+            volume_factor = np.minimum(1.1, 1.0 + (field_count - 5) * 0.01)
+            high_count = np.count_nonzero(np.nan_to_num(field_scores) > 0.7, axis=1)
+            correlation_factor = np.select([high_count >= 3, high_count >= 2], [1.1, 1.05], 1.0)
+
+            final_score = np.minimum(1.0, average_score * volume_factor * correlation_factor)
+            return np.where(field_count == 0, 0.0, np.round(final_score, 3))
+
+        except Exception as e:
+            raise DVSSException(f'计算订单敏感度失败: {str(e)}')
+
+    def get_risk_levels(self, scores: np.ndarray) -> np.ndarray:
+        """按敏感度分数批量获取风险等级（与 _get_risk_level 一致）"""
+        return np.select([scores >= 0.8, scores >= 0.5], ['high', 'medium'], 'low')
+
     async def analyze_order_sensitivity(self, order) -> Dict[str, Any]:
         """分析订单敏感度（详细分析）"""
         try:
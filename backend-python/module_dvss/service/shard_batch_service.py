@@ -0,0 +1,155 @@
+"""
+分片批次服务
+一次上传、加密或重分享产生的分片组成一个批次，批次保存Merkle根，每个分片保存到根的证明
+"""
+
+import hashlib
+import uuid
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions.custom_exception import AuthorizationError, NotFoundError
+from module_dvss.dao.shard_dao import ShardDAO
+from module_dvss.entity.shard_batch import ShardBatch
+from utils.log_util import LogUtil
+from utils.merkle_util import MerkleRootBuilder, MerkleUtil
+
+logger = LogUtil.get_logger('shard_batch_service')
+
+
+class ShardBatchService:
+    """
+    分片批次的Merkle完整性校验
+
+    - 叶子为 (分片ID, 分片数据SHA-256)，按批次内序号排列
+    - 整批校验按序号分段流式读取分片，逐个重新计算哈希并增量计算根，内存占用与批次大小无关
+    - 单个分片校验只读取该分片，用保存的 O(log n) 证明计算到根
+    """
+
+    VERIFY_CHUNK_SIZE = 500
+    # 整批校验结果中最多列出的损坏分片数
+    MAX_REPORTED_SHARDS = 100
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.shard_dao = ShardDAO(db)
+
+    async def create_batch(
+        self, shards: Sequence[Tuple[int, str, str]], source: str, user_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        为一批分片构建Merkle树（只刷新不提交）
+
+        Args:
+            shards: 按顺序排列的 (分片主键, 分片ID, 校验和)
+            source: 批次来源 upload/encrypt/reshare
+            user_id: 创建人ID
+
+        Returns:
+            批次ID、Merkle根与分片数
+        """
+        root, proofs = MerkleUtil.build([MerkleUtil.shard_leaf(shard_id, checksum) for _, shard_id, checksum in shards])
+        batch_id = f'batch_{uuid.uuid4().hex}'
+        batch = ShardBatch(
+            batch_id=batch_id,
+            source=source,
+            shard_count=len(shards),
+            merkle_root=root.hex(),
+            status='active',
+            created_by=user_id,
+        )
+        members = [
+            {'id': id_, 'batch_id': batch_id, 'batch_index': index, 'merkle_proof': proof}
+            for index, ((id_, _, _), proof) in enumerate(zip(shards, proofs))
+        ]
+        await self.shard_dao.create_batch(batch, members)
+        return {'batch_id': batch_id, 'merkle_root': root.hex(), 'shard_count': len(shards)}
+
+    async def supersede_batches(self, batch_ids):
+        """分片被替换后旧批次标记为已取代（只刷新不提交）"""
+        await self.shard_dao.update_batch_status({batch_id for batch_id in batch_ids if batch_id}, 'superseded')
+
+    async def _get_batch(self, batch_id: str, user_id: int) -> ShardBatch:
+        batch = await self.shard_dao.get_batch(batch_id)
+        if not batch:
+            raise NotFoundError('分片批次不存在')
+        if batch.created_by is not None and batch.created_by != user_id:
+            raise AuthorizationError('无权限访问此分片批次')
+        return batch
+
+    async def verify_batch(self, batch_id: str, user_id: int) -> Dict[str, Any]:
+        """整批校验：流式重新计算全部分片的哈希与Merkle根"""
+        started = datetime.now(timezone.utc)
+        batch = await self._get_batch(batch_id, user_id)
+
+        builder = MerkleRootBuilder()
+        corrupted = []
+        corrupted_count = 0
+        missing = 0
+        after_index = -1
+        while True:
+            rows = await self.shard_dao.get_batch_shard_chunk(batch_id, after_index, self.VERIFY_CHUNK_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                missing += row.batch_index - after_index - 1
+                after_index = row.batch_index
+                checksum = hashlib.sha256(row.shard_data).hexdigest()
+                if checksum != row.checksum:
+                    corrupted_count += 1
+                    if len(corrupted) < self.MAX_REPORTED_SHARDS:
+                        corrupted.append(row.shard_id)
+                builder.add(MerkleUtil.shard_leaf(row.shard_id, checksum))
+        missing += batch.shard_count - after_index - 1
+
+        computed_root = builder.root().hex() if builder.count else None
+        is_valid = computed_root == batch.merkle_root and not corrupted_count and not missing
+        if not is_valid:
+            logger.warning(f'分片批次 {batch_id} 校验失败: 损坏 {corrupted_count} 个，缺失 {missing} 个')
+
+        return {
+            'batch_id': batch_id,
+            'status': batch.status,
+            'shard_count': batch.shard_count,
+            'checked_shards': builder.count,
+            'missing_shards': missing,
+            'corrupted_count': corrupted_count,
+            'corrupted_shards': corrupted,
+            'merkle_root': batch.merkle_root,
+            'computed_root': computed_root,
+            'is_valid': is_valid,
+            'elapsed_ms': round((datetime.now(timezone.utc) - started).total_seconds() * 1000, 2),
+            'validation_time': datetime.now().isoformat(),
+        }
+
+    async def verify_shard(self, batch_id: str, shard_id: str, user_id: int) -> Dict[str, Any]:
+        """单个分片校验：重新计算分片哈希并用Merkle证明校验到批次根"""
+        batch = await self._get_batch(batch_id, user_id)
+        shard = await self.shard_dao.get_batch_shard(batch_id, shard_id)
+        if not shard:
+            raise NotFoundError('批次中不存在该分片')
+
+        checksum = hashlib.sha256(shard.shard_data).hexdigest()
+        proof = shard.merkle_proof or b''
+        is_valid = MerkleUtil.verify_proof(
+            MerkleUtil.shard_leaf(shard.shard_id, checksum), proof, bytes.fromhex(batch.merkle_root)
+        )
+        try:
+            steps = [{'side': side, 'hash': sibling.hex()} for side, sibling in MerkleUtil.decode_proof(proof)]
+        except ValueError:
+            steps = []
+
+        return {
+            'batch_id': batch_id,
+            'shard_id': shard.shard_id,
+            'batch_index': shard.batch_index,
+            'checksum_matches': checksum == shard.checksum,
+            'current_checksum': checksum,
+            'merkle_root': batch.merkle_root,
+            'proof': steps,
+            'is_valid': is_valid,
+            'validation_time': datetime.now().isoformat(),
+        }
@@ -0,0 +1,356 @@
+"""
+分片读取服务
+重构订单时只读取k个分片：按存储节点的健康状态与延迟统计选择节点，节点变慢或失败时向备用节点发出对冲请求
+"""
+
+import asyncio
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.settings import settings
+from module_dvss.dao.shard_dao import ShardDAO
+from module_dvss.service.key_service import KeyService
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('shard_reader_service')
+
+# 未分配存储节点的分片（保存在数据库中）归为同一个本地节点
+LOCAL_NODE = 'local'
+
+# 分片读取函数：(节点名称, 分片主键列表) -> 分片主键 -> 分片数据
+ShardFetcher = Callable[[str, List[int]], Awaitable[Dict[int, bytes]]]
+
+
+@dataclass
+class _NodeStats:
+    """单个节点的延迟与失败统计"""
+
+    latency: Optional[float] = None
+    deviation: float = 0.0
+    failures: int = 0
+    last_failure: float = 0.0
+
+
+class NodeHealthTracker:
+    """
+    存储节点健康统计（进程内）
+
+    - 延迟按指数加权移动平均平滑，同时记录平滑偏差，对冲延迟取 平滑延迟 + 4倍偏差
+    - 连续失败的节点在冷却时间内排在健康节点之后，成功一次即清零
+    """
+
+    ALPHA = 0.2
+
+    _default: Optional['NodeHealthTracker'] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _NodeStats] = {}
+
+    def record_latency(self, node: str, elapsed: float):
+        """记录一次成功请求的耗时（秒）"""
+        with self._lock:
+            stats = self._stats.setdefault(node, _NodeStats())
+            if stats.latency is None:
+                stats.latency = elapsed
+                stats.deviation = elapsed / 2
+            else:
+                stats.deviation += self.ALPHA * (abs(elapsed - stats.latency) - stats.deviation)
+                stats.latency += self.ALPHA * (elapsed - stats.latency)
+            stats.failures = 0
+
+    def record_slow(self, node: str, elapsed: float):
+        """记录一次被对冲后放弃的请求，耗时只是下限，不清零失败次数"""
+        with self._lock:
+            stats = self._stats.setdefault(node, _NodeStats())
+            if stats.latency is None:
+                stats.latency = elapsed
+                stats.deviation = elapsed / 2
+            elif elapsed > stats.latency:
+                stats.deviation += self.ALPHA * (elapsed - stats.latency - stats.deviation)
+                stats.latency += self.ALPHA * (elapsed - stats.latency)
+
+    def record_failure(self, node: str):
+        """记录一次失败的请求"""
+        with self._lock:
+            stats = self._stats.setdefault(node, _NodeStats())
+            stats.failures += 1
+            stats.last_failure = time.monotonic()
+
+    def rank(self, node: str, is_active: bool = True) -> tuple:
+        """节点排序键：停用节点、冷却中的节点排在后面，其余按平滑延迟升序（未知延迟视为0，优先探测）"""
+        with self._lock:
+            stats = self._stats.get(node)
+        if stats is None:
+            return (not is_active, False, 0.0)
+        cooling = (
+            stats.failures > 0 and time.monotonic() - stats.last_failure < settings.SHARD_READ_FAILURE_COOLDOWN_SECONDS
+        )
+        return (not is_active, cooling, stats.latency or 0.0)
+
+    def hedge_delay(self, node: str) -> float:
+        """向该节点发出请求后，等待多久（秒）仍未返回时发出对冲请求"""
+        minimum = settings.SHARD_READ_HEDGE_MIN_DELAY_MS / 1000
+        with self._lock:
+            stats = self._stats.get(node)
+        if stats is None or stats.latency is None:
+            return minimum
+        return max(minimum, stats.latency + 4 * stats.deviation)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """各节点统计信息（毫秒）"""
+        with self._lock:
+            return {
+                node: {
+                    'latency_ms': round(stats.latency * 1000, 3) if stats.latency is not None else None,
+                    'deviation_ms': round(stats.deviation * 1000, 3),
+                    'consecutive_failures': stats.failures,
+                }
+                for node, stats in self._stats.items()
+            }
+
+    @classmethod
+    def default(cls) -> 'NodeHealthTracker':
+        """获取进程内共享的节点统计"""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+
+class DatabaseShardFetcher:
+    """
+    从数据库读取分片数据，每次请求使用独立的会话，以便多个节点的请求及对冲请求并发执行；
+    信封加密的分片在返回前解密
+    """
+
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+
+    async def __call__(self, node: str, shard_ids: List[int]) -> Dict[int, bytes]:
+        async with self.session_factory() as session:
+            rows = await ShardDAO(session).get_shard_data(shard_ids)
+            return await KeyService(session).open_shards(rows)
+
+
+# 读取单元：(加密订单ID, 字段组)，不按字段组分片的订单字段组为 None
+_ShardKey = Tuple[int, Optional[str]]
+
+
+@dataclass
+class _ShardRequest:
+    """发往单个节点的一次读取请求"""
+
+    node: str
+    locations: List[Any]
+    started: float
+    deadline: float
+    hedged: bool = False
+    keys: Dict[_ShardKey, int] = field(default_factory=dict)
+
+
+class ShardReaderService:
+    """
+    法定数量优先的分片读取
+
+    1. 只查询分片位置（不含分片数据），按节点排序键与分片序号为每个订单的每个字段组排列候选分片
+    2. 每组取前k个候选分片，同一节点上的分片（可跨订单）合并为一个请求并发读取
+    3. 请求失败、返回不完整或超过节点的对冲延迟时，从剩余候选中补足缺口；
+       被对冲的慢请求继续等待，先凑满k个分片的结果生效，其余请求取消
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        fetcher: Optional[ShardFetcher] = None,
+        tracker: Optional[NodeHealthTracker] = None,
+    ):
+        self.shard_dao = ShardDAO(db)
+        self.fetcher = fetcher or DatabaseShardFetcher(
+            async_sessionmaker(bind=db.bind, class_=AsyncSession, expire_on_commit=False)
+        )
+        self.tracker = tracker or NodeHealthTracker.default()
+
+    async def read(
+        self, encrypted_order_id: int, k: int, groups: Sequence[Optional[str]] = (None,)
+    ) -> Dict[Optional[str], List[bytes]]:
+        """
+        读取重构所需的分片
+
+        Args:
+            encrypted_order_id: 加密订单ID
+            k: 每组需要的分片数
+            groups: 需要的字段组，不按字段组分片的订单为 (None,)
+
+        Returns:
+            字段组 -> 按分片序号排列的k个分片
+        """
+        shares, errors = await self.read_many([(encrypted_order_id, k, groups)])
+        if encrypted_order_id in errors:
+            raise ValueError(errors[encrypted_order_id])
+        return shares[encrypted_order_id]
+
+    async def read_many(
+        self, requests: Sequence[Tuple[int, int, Sequence[Optional[str]]]]
+    ) -> Tuple[Dict[int, Dict[Optional[str], List[bytes]]], Dict[int, str]]:
+        """
+        批量读取多个订单重构所需的分片，单个订单分片不足不影响其他订单
+
+        Args:
+            requests: (加密订单ID, 每组需要的分片数, 需要的字段组) 列表
+
+        Returns:
+            (加密订单ID -> 字段组 -> 按分片序号排列的k个分片, 加密订单ID -> 错误信息)
+        """
+        if not requests:
+            return {}, {}
+        need: Dict[_ShardKey, int] = {}
+        for encrypted_order_id, k, groups in requests:
+            for group in groups:
+                need[(encrypted_order_id, group)] = k
+        requested_groups = {group for _, _, groups in requests for group in groups}
+        field_groups = None if None in requested_groups else sorted(requested_groups)
+        locations = await self.shard_dao.get_shard_locations(
+            [encrypted_order_id for encrypted_order_id, _, _ in requests], field_groups
+        )
+
+        candidates: Dict[_ShardKey, List[Any]] = {key: [] for key in need}
+        for location in locations:
+            key = (location.encrypted_order_id, location.field_group)
+            if key in candidates:
+                candidates[key].append(location)
+        failed = {key: self._shortage_message(key[1]) for key, items in candidates.items() if len(items) < need[key]}
+        for key in failed:
+            del candidates[key]
+
+        active = await self._node_states({location.storage_node for location in locations})
+        for items in candidates.values():
+            items.sort(
+                key=lambda location: (
+                    self.tracker.rank(self._node_of(location), active.get(location.storage_node, True)),
+                    location.shard_index,
+                )
+            )
+        received = await self._fetch_quorum(candidates, need, failed)
+
+        shares: Dict[int, Dict[Optional[str], List[bytes]]] = {}
+        errors: Dict[int, str] = {}
+        for encrypted_order_id, _, groups in requests:
+            keys = [(encrypted_order_id, group) for group in groups]
+            messages = [failed[key] for key in keys if key in failed]
+            if messages:
+                errors[encrypted_order_id] = messages[0]
+            else:
+                shares[encrypted_order_id] = {group: received[key] for group, key in zip(groups, keys)}
+        return shares, errors
+
+    @staticmethod
+    def _node_of(location) -> str:
+        return location.storage_node or LOCAL_NODE
+
+    @staticmethod
+    def _shortage_message(group: Optional[str]) -> str:
+        return '可用分片数量不足' if group is None else f'字段组 {group} 可用分片数量不足'
+
+    async def _node_states(self, node_names) -> Dict[str, bool]:
+        """节点名称 -> 是否激活（未登记的节点视为激活）"""
+        names = {name for name in node_names if name}
+        if not names:
+            return {}
+        return {node.node_name: node.is_active for node in await self.shard_dao.get_storage_nodes(names)}
+
+    async def _fetch_quorum(
+        self, candidates: Dict[_ShardKey, List[Any]], need: Dict[_ShardKey, int], failed: Dict[_ShardKey, str]
+    ) -> Dict[_ShardKey, List[bytes]]:
+        """
+        按节点并发读取，凑满每组所需的分片
+
+        无法凑满的组（候选耗尽或超时）写入 failed，不中断其他组的读取
+        """
+        loop = asyncio.get_running_loop()
+        queues: Dict[_ShardKey, Deque[Any]] = {key: deque(items) for key, items in candidates.items()}
+        received: Dict[_ShardKey, Dict[int, bytes]] = {key: {} for key in candidates}
+        pending: Dict[asyncio.Future, _ShardRequest] = {}
+
+        def outstanding(key: _ShardKey) -> int:
+            """已收到及仍在正常等待中的分片数"""
+            waiting = sum(request.keys.get(key, 0) for request in pending.values() if not request.hedged)
+            return len(received[key]) + waiting
+
+        def incomplete() -> List[_ShardKey]:
+            return [key for key in received if key not in failed and len(received[key]) < need[key]]
+
+        def launch():
+            batches: Dict[str, List[Any]] = {}
+            for key, queue in queues.items():
+                if key in failed:
+                    continue
+                missing = need[key] - outstanding(key)
+                while missing > 0 and queue:
+                    location = queue.popleft()
+                    batches.setdefault(self._node_of(location), []).append(location)
+                    missing -= 1
+            now = loop.time()
+            for node, batch in batches.items():
+                request = _ShardRequest(node, batch, now, now + self.tracker.hedge_delay(node))
+                for location in batch:
+                    key = (location.encrypted_order_id, location.field_group)
+                    request.keys[key] = request.keys.get(key, 0) + 1
+                pending[asyncio.ensure_future(self.fetcher(node, [location.id for location in batch]))] = request
+
+        timeout_at = loop.time() + settings.SHARD_READ_TIMEOUT_SECONDS
+        launch()
+        try:
+            while incomplete():
+                if not pending:
+                    for key in incomplete():
+                        failed[key] = self._shortage_message(key[1])
+                    break
+
+                wake_at = min([request.deadline for request in pending.values() if not request.hedged] + [timeout_at])
+                done, _ = await asyncio.wait(
+                    list(pending), timeout=max(wake_at - loop.time(), 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                now = loop.time()
+                for task in done:
+                    request = pending.pop(task)
+                    try:
+                        data = task.result()
+                    except Exception as e:
+                        logger.warning(f'从节点 {request.node} 读取分片失败: {e}')
+                        self.tracker.record_failure(request.node)
+                        continue
+                    self.tracker.record_latency(request.node, now - request.started)
+                    for location in request.locations:
+                        if location.id in data:
+                            key = (location.encrypted_order_id, location.field_group)
+                            received[key][location.shard_index] = data[location.id]
+
+                if now >= timeout_at:
+                    for key in incomplete():
+                        failed[key] = '读取分片超时'
+                    break
+                for request in pending.values():
+                    if not request.hedged and now >= request.deadline:
+                        request.hedged = True
+                        logger.info(
+                            f'节点 {request.node} 响应超过 {request.deadline - request.started:.3f}s，发出对冲请求'
+                        )
+                launch()
+        finally:
+            now = loop.time()
+            for task, request in pending.items():
+                task.cancel()
+                if request.hedged:
+                    self.tracker.record_slow(request.node, now - request.started)
+
+        return {
+            key: [shards[index] for index in sorted(shards)[: need[key]]]
+            for key, shards in received.items()
+            if key not in failed
+        }
@@ -0,0 +1,203 @@
+"""
+分片巡检服务
+后台按分片ID游标分批重新计算分片数据的哈希，发现与校验和不一致的分片时标记为损坏
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import AsyncSessionLocal
+from config.settings import settings
+from module_dvss.dao.shard_scrub_dao import ShardScrubDAO
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('shard_scrub_service')
+
+
+class ShardScrubService:
+    """
+    分片巡检
+
+    - 巡检状态（游标与本轮进度）持久化在 shard_scrub_state 表中，每段的损坏标记与游标推进在同一事务中提交，
+      重启后从最后提交的游标继续；游标按条件更新，多个进程同时巡检时同一段只会被计入一次
+    - 校验和为分片保存数据（信封加密时为密文）的SHA-256，巡检无需解密
+    - hashlib 计算较大数据时释放GIL，一段分片拆分到线程池的多个线程并行计算
+    - 已标记为损坏或删除的分片不再巡检
+    """
+
+    STATE_NAME = 'default'
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _stats_lock = threading.Lock()
+    # 进程内的巡检统计，供 /metrics 导出
+    _stats: Dict[str, float] = {
+        'shards_total': 0,
+        'bytes_total': 0,
+        'corrupt_total': 0,
+        'passes_total': 0,
+        'hash_seconds_total': 0.0,
+        'throughput_bytes_per_second': 0.0,
+        'cursor': 0,
+    }
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.scrub_dao = ShardScrubDAO(db)
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=max(settings.SHARD_SCRUB_WORKERS, 1), thread_name_prefix='shard-scrub'
+            )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        """关闭哈希线程池"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    @staticmethod
+    def hash_many(datas: Sequence[bytes]) -> List[str]:
+        """计算一组数据的SHA-256（十六进制）"""
+        return [hashlib.sha256(data).hexdigest() for data in datas]
+
+    @classmethod
+    async def _hash_parallel(cls, datas: Sequence[bytes]) -> List[str]:
+        """将一段分片按线程数均分后并行计算哈希"""
+        workers = max(settings.SHARD_SCRUB_WORKERS, 1)
+        if workers == 1 or len(datas) < 2:
+            return cls.hash_many(datas)
+        loop = asyncio.get_running_loop()
+        step = -(-len(datas) // workers)
+        parts = await asyncio.gather(
+            *(
+                loop.run_in_executor(cls._get_executor(), cls.hash_many, datas[i : i + step])
+                for i in range(0, len(datas), step)
+            )
+        )
+        return [digest for part in parts for digest in part]
+
+    @classmethod
+    def _record(cls, **increments):
+        with cls._stats_lock:
+            for key, value in increments.items():
+                cls._stats[key] += value
+
+    @classmethod
+    def record_throughput(cls, size: int, seconds: float):
+        """记录最近一段的巡检速率（含限速休眠）"""
+        with cls._stats_lock:
+            cls._stats['throughput_bytes_per_second'] = size / seconds if seconds > 0 else 0.0
+
+    @classmethod
+    def stats(cls) -> Dict[str, float]:
+        """进程内巡检统计"""
+        with cls._stats_lock:
+            return dict(cls._stats)
+
+    async def scrub_chunk(self, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        巡检游标之后的一段分片并提交
+
+        Returns:
+            本段巡检的分片数、字节数、损坏分片数，以及本轮是否结束
+        """
+        state = await self.scrub_dao.get_or_create_state(self.STATE_NAME)
+        cursor, pass_count = state.cursor, state.pass_count
+        rows = await self.scrub_dao.get_shard_chunk(cursor, batch_size or settings.SHARD_SCRUB_BATCH_SIZE)
+
+        now = datetime.now(timezone.utc)
+        if not rows:
+            # 一轮结束：游标归零，本轮进度清零
+            values = {'cursor': 0, 'pass_count': pass_count + 1, 'pass_started_at': None, 'last_pass_finished_at': now}
+            values.update(pass_shards=0, pass_bytes=0, pass_corrupt=0)
+            if await self.scrub_dao.advance(self.STATE_NAME, cursor, values):
+                self._record(passes_total=1)
+                logger.info(f'分片巡检第 {pass_count + 1} 轮完成: {state.pass_shards} 个分片, {state.pass_bytes} 字节')
+            await self.db.commit()
+            return {'shards': 0, 'bytes': 0, 'corrupt': 0, 'pass_finished': True}
+
+        started = time.perf_counter()
+        digests = await self._hash_parallel([row.shard_data for row in rows])
+        elapsed = time.perf_counter() - started
+
+        size = sum(len(row.shard_data) for row in rows)
+        corrupt = [row for row, digest in zip(rows, digests) if digest != row.checksum]
+        values = {
+            'cursor': rows[-1].id,
+            'pass_shards': state.pass_shards + len(rows),
+            'pass_bytes': state.pass_bytes + size,
+            'pass_corrupt': state.pass_corrupt + len(corrupt),
+            'total_corrupt': state.total_corrupt + len(corrupt),
+        }
+        if cursor == 0:
+            values['pass_started_at'] = now
+
+        if await self.scrub_dao.advance(self.STATE_NAME, cursor, values):
+            await self.scrub_dao.mark_corrupted(row.id for row in corrupt)
+            await self.db.commit()
+            for row in corrupt:
+                logger.warning(f'分片巡检发现损坏分片 {row.shard_id}，已标记为 corrupted')
+            self._record(
+                shards_total=len(rows), bytes_total=size, corrupt_total=len(corrupt), hash_seconds_total=elapsed
+            )
+        else:
+            # 其他进程已推进游标，本段结果丢弃
+            await self.db.rollback()
+
+        with self._stats_lock:
+            self._stats['cursor'] = rows[-1].id
+        return {'shards': len(rows), 'bytes': size, 'corrupt': len(corrupt), 'pass_finished': False}
+
+    async def get_status(self) -> Dict[str, Any]:
+        """巡检进度与吞吐"""
+        state = await self.scrub_dao.get_or_create_state(self.STATE_NAME)
+        max_id = await self.scrub_dao.get_max_shard_id() or 0
+        return {
+            **state.to_dict(),
+            'max_shard_id': max_id,
+            'progress': round(min(state.cursor / max_id, 1.0), 4) if max_id else 1.0,
+            'enabled': settings.SHARD_SCRUB_ENABLED,
+            'bytes_per_second_budget': settings.SHARD_SCRUB_BYTES_PER_SECOND,
+            'process_stats': self.stats(),
+        }
+
+
+async def run_shard_scrubber():
+    """
+    后台巡检循环（使用独立的数据库会话）
+
+    每段巡检后按字节预算休眠，使平均读取速率不超过 SHARD_SCRUB_BYTES_PER_SECOND；一轮结束后等待下一轮
+    """
+    logger.info('分片巡检已启动')
+    while True:
+        try:
+            started = time.monotonic()
+            async with AsyncSessionLocal() as db:
+                result = await ShardScrubService(db).scrub_chunk()
+            if result['pass_finished']:
+                await asyncio.sleep(settings.SHARD_SCRUB_PASS_INTERVAL_SECONDS)
+                continue
+
+            elapsed = time.monotonic() - started
+            budget = max(settings.SHARD_SCRUB_BYTES_PER_SECOND, 1)
+            delay = max(result['bytes'] / budget - elapsed, 0)
+            ShardScrubService.record_throughput(result['bytes'], elapsed + delay)
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            logger.info('分片巡检已停止')
+            raise
+        except Exception as e:
+            logger.error(f'分片巡检失败: {str(e)}')
+            await asyncio.sleep(settings.SHARD_SCRUB_PASS_INTERVAL_SECONDS / 60)
@@ -8,6 +8,7 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from exceptions.custom_exception import AuthorizationError, NotFoundError, ValidationError
+from module_dvss.dao.order_dao import OrderDAO
 from module_dvss.dao.shard_dao import ShardDAO
 from module_dvss.schemas.shard_schema import (
     ShardInfoCreate,
@@ -16,7 +17,11 @@ from module_dvss.schemas.shard_schema import (
     ShardListResponse,
     ShardStatsResponse,
 )
+from module_dvss.service.key_service import KeyService
+from utils.async_sharing_util import AsyncSharingUtil
+from utils.feldman_util import FeldmanVSSUtil
 from utils.log_util import LogUtil
+from utils.share_codec_util import ShareCodecUtil
 
 logger = LogUtil.get_logger('shard_service')
 
@@ -27,6 +32,8 @@ class ShardService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.shard_dao = ShardDAO(db)
+        self.order_dao = OrderDAO(db)
+        self.key_service = KeyService(db)
 
     async def create_shard(self, request: ShardInfoCreate, current_user_id: int) -> ShardInfoResponse:
         """创建数据分片"""
@@ -35,7 +42,7 @@ class ShardService:
             shard_data = {
                 'user_id': current_user_id,
                 'shard_index': request.shard_index,
-                'shard_data': request.shard_data,
+                'shard_data': request.shard_data.encode('utf-8'),
                 'storage_location': request.storage_location,
                 'threshold': request.threshold,
                 'total_shards': request.total_shards,
@@ -323,12 +330,25 @@ class ShardService:
             if shard.user_id != user_id:
                 raise AuthorizationError('无权限访问此分片')
 
-            # 计算当前数据的校验和
+            # 计算当前数据的校验和（直接对二进制分片计算，无需编解码）
             import hashlib
 
-            current_checksum = hashlib.sha256(shard.shard_data.encode('utf-8')).hexdigest()
+            current_checksum = hashlib.sha256(shard.shard_data).hexdigest()
 
             is_valid = current_checksum == shard.checksum
+            # 信封加密的分片解密后再校验分片结构，无法解密视为无效
+            share = (await self.key_service.open_shards([shard])).get(shard.id) if is_valid else None
+            is_valid = share is not None
+            if is_valid and shard.algorithm in ('shamir_gf256', 'ida_gf256', 'feldman_zq', 'packed_gf256'):
+                # 分片头部的CRC32同时校验载荷结构
+                is_valid = ShareCodecUtil.verify(share)
+
+            # 数据密钥分片对照加密订单的Feldman承诺校验
+            if is_valid and shard.encrypted_order_id is not None:
+                encrypted_order = await self.order_dao.get_encrypted_by_id(shard.encrypted_order_id)
+                if encrypted_order is not None and encrypted_order.commitments:
+                    item = self._feldman_item(share, FeldmanVSSUtil.decode_commitments(encrypted_order.commitments))
+                    is_valid = item is not None and FeldmanVSSUtil.verify_share(*item)
 
             return {
                 'shard_id': shard.shard_id,
@@ -340,3 +360,70 @@ class ShardService:
         except Exception as e:
             logger.error(f'验证分片失败: {str(e)}')
             raise
+
+    @staticmethod
+    def _feldman_item(share: bytes, commitments: tuple) -> Optional[tuple]:
+        """解析分片中的数据密钥分片，返回 (x, y, 承诺)；格式无效时返回None"""
+        try:
+            key_share = ShareCodecUtil.decode_all(share)[0]
+            x, y = FeldmanVSSUtil.parse_share(key_share)
+        except (ValueError, IndexError):
+            return None
+        return x, y, commitments
+
+    async def verify_shards_batch(self, encrypted_order_ids: List[int], user_id: int) -> dict:
+        """
+        批量校验加密订单的分片
+
+        所有分片与订单各一次查询取出，数据密钥分片对照各订单的Feldman承诺做一次随机线性组合校验，
+        校验失败时二分定位无效分片；没有承诺的订单（直接共享模式或早期数据）计入跳过数
+        """
+        try:
+            started = datetime.now(timezone.utc)
+            encrypted_orders = await self.order_dao.get_encrypted_by_ids(encrypted_order_ids)
+            commitments_map = {
+                order.id: FeldmanVSSUtil.decode_commitments(order.commitments)
+                for order in encrypted_orders
+                if order.commitments
+            }
+            shards = await self.shard_dao.get_by_encrypted_order_ids(encrypted_order_ids)
+            opened = await self.key_service.open_shards(shards)
+
+            items = []
+            item_shards = []
+            invalid_shards = []
+            skipped = 0
+            for shard in shards:
+                if shard.user_id is not None and shard.user_id != user_id:
+                    raise AuthorizationError('无权限访问此分片')
+
+                commitments = commitments_map.get(shard.encrypted_order_id)
+                if commitments is None:
+                    skipped += 1
+                    continue
+
+                item = self._feldman_item(opened[shard.id], commitments) if shard.id in opened else None
+                if item is None:
+                    invalid_shards.append(shard.shard_id)
+                    continue
+                items.append(item)
+                item_shards.append(shard)
+
+            # 校验为纯CPU运算，分片较多时在进程池中执行
+            invalid_indices = await AsyncSharingUtil.run(
+                FeldmanVSSUtil.find_invalid, items, size=len(items) * FeldmanVSSUtil.ELEMENT_SIZE
+            )
+            invalid_shards.extend(item_shards[index].shard_id for index in invalid_indices)
+
+            return {
+                'total_shards': len(shards),
+                'verified_shards': len(items),
+                'skipped_shards': skipped,
+                'invalid_shards': invalid_shards,
+                'is_valid': not invalid_shards,
+                'elapsed_ms': round((datetime.now(timezone.utc) - started).total_seconds() * 1000, 2),
+                'validation_time': datetime.now().isoformat(),
+            }
+        except Exception as e:
+            logger.error(f'批量校验分片失败: {str(e)}')
+            raise
@@ -0,0 +1,241 @@
+"""
+订单上传任务服务
+上传请求只保存文件并创建任务，后台工作协程领取任务后按批处理，处理进度、各阶段耗时与失败行记录在任务中
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import AsyncSessionLocal
+from config.settings import settings
+from exceptions.custom_exception import AuthorizationError, NotFoundError, ValidationError
+from module_dvss.dao.upload_job_dao import UploadJobDAO
+from module_dvss.entity.upload_job import UploadJob
+from module_dvss.service.dvss_service import DVSSService
+from utils.csv_stream_util import ChunkReader
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger('upload_job_service')
+
+# 处理结果中已按字段记录在任务中的项
+_COUNTED_KEYS = (
+    'row_count',
+    'order_count',
+    'encrypted_count',
+    'failed_count',
+    'batch_count',
+    'stage_seconds',
+    'errors',
+)
+
+
+class _UploadJobLost(Exception):
+    """任务心跳超时后已被其他工作协程领取"""
+
+
+class UploadJobService:
+    """
+    订单上传任务
+
+    - 任务状态：pending → running → completed/failed
+    - 工作协程每处理完一批，进度与心跳随该批数据在同一事务中提交；工作进程退出后，心跳超时的任务由其他
+      工作协程领取，跳过已提交的行继续处理，超过 UPLOAD_JOB_MAX_ATTEMPTS 次领取后标记为失败
+    - CSV文件流式分批处理；Excel文件无法流式解析，整体读取后处理
+    """
+
+    JOB_DIR = 'jobs'
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.job_dao = UploadJobDAO(db)
+
+    async def create_job(self, read: ChunkReader, filename: str, user_id: int) -> Dict[str, Any]:
+        """
+        按块保存上传文件并创建任务
+
+        Args:
+            read: 异步读取函数，例如 UploadFile.read
+            filename: 文件名
+            user_id: 创建人ID
+
+        Returns:
+            任务信息
+        """
+        directory = Path(settings.UPLOAD_DIR) / self.JOB_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{uuid.uuid4().hex}{Path(filename).suffix.lower()}'
+
+        size = 0
+        try:
+            with open(path, 'wb') as file:
+                while True:
+                    chunk = await read(settings.UPLOAD_STREAM_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    await asyncio.to_thread(file.write, chunk)
+                    size += len(chunk)
+
+            job = UploadJob(
+                file_name=filename,
+                file_path=str(path),
+                file_size=size,
+                status='pending',
+                created_by=user_id,
+            )
+            job = await self.job_dao.create_job(job)
+        except Exception:
+            path.unlink(missing_ok=True)
+            raise
+
+        logger.info(f'用户 {user_id} 创建上传任务 {job.id}: {filename} ({size} 字节)')
+        return job.to_dict()
+
+    async def get_job(self, job_id: int, user_id: int) -> Dict[str, Any]:
+        """获取上传任务进度"""
+        job = await self.job_dao.get_job_by_id(job_id)
+        if not job:
+            raise NotFoundError('上传任务不存在')
+        if job.created_by is not None and job.created_by != user_id:
+            raise AuthorizationError('无权限访问此上传任务')
+        return job.to_dict()
+
+    async def run_job(self, job_id: int, worker: str):
+        """处理一个已由 worker 领取的任务"""
+        job = await self.job_dao.get_job_by_id(job_id)
+        if not job:
+            return
+        path = Path(job.file_path)
+        if job.attempts > settings.UPLOAD_JOB_MAX_ATTEMPTS:
+            await self._finish(job_id, worker, path, status='failed', last_error='任务重试次数超过上限')
+            return
+
+        # 之前领取时已提交的进度
+        base = {
+            'processed_rows': job.processed_rows,
+            'order_count': job.order_count,
+            'encrypted_count': job.encrypted_count,
+            'failed_count': job.failed_count,
+            'batch_count': job.batch_count,
+        }
+        base_stages = json.loads(job.stage_seconds) if job.stage_seconds else {}
+        base_errors = json.loads(job.errors) if job.errors else []
+        base_elapsed = job.elapsed_seconds or 0.0
+        base_batch_ids = json.loads(job.result).get('batch_ids', []) if job.result else []
+        # 更新任务会提交事务，提交后实体属性过期，这里先取出需要的值
+        filename, user_id, attempts, first_run = job.file_name, job.created_by, job.attempts, job.started_at is None
+        started = time.monotonic()
+
+        def merge(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+            stages = {
+                stage: round(base_stages.get(stage, 0.0) + seconds, 3)
+                for stage, seconds in snapshot['stage_seconds'].items()
+            }
+            errors = (base_errors + snapshot['errors'])[: DVSSService.MAX_REPORTED_UPLOAD_ERRORS]
+            values = {key: base[key] + snapshot[key] for key in base if key != 'processed_rows'}
+            values.update(
+                elapsed_seconds=base_elapsed + time.monotonic() - started,
+                stage_seconds=json.dumps(stages),
+                errors=json.dumps(errors, ensure_ascii=False, default=str),
+                result=json.dumps({'batch_ids': base_batch_ids + snapshot['batch_ids']}),
+                heartbeat_at=datetime.now(timezone.utc),
+            )
+            return values
+
+        async def progress(snapshot: Dict[str, Any]):
+            # 进度与该批数据在同一事务中提交：任务已被其他工作协程领取时该批回滚，由新的持有者处理
+            values = merge(snapshot)
+            values['processed_rows'] = snapshot['last_row']
+            if not await self.job_dao.update_job(job_id, worker, values, commit=False):
+                raise _UploadJobLost()
+
+        if first_run:
+            await self.job_dao.update_job(job_id, worker, {'started_at': datetime.now(timezone.utc)})
+        logger.info(
+            f'工作协程 {worker} 开始处理上传任务 {job_id}（第 {attempts} 次，已处理 {base["processed_rows"]} 行）'
+        )
+
+        try:
+            dvss_service = DVSSService(self.db)
+            if filename.endswith('.csv'):
+                with open(path, 'rb') as file:
+
+                    async def read(size: int) -> bytes:
+                        return await asyncio.to_thread(file.read, size)
+
+                    result = await dvss_service.process_order_upload_stream(
+                        read, filename, user_id, progress=progress, skip_rows=base['processed_rows']
+                    )
+                values = merge(result)
+                values['processed_rows'] = base['processed_rows'] + result['row_count']
+            else:
+                file_data = await asyncio.to_thread(path.read_bytes)
+                result = await dvss_service.process_order_upload(file_data, filename, user_id)
+                values = {
+                    'processed_rows': result['order_count'],
+                    'order_count': result['order_count'],
+                    'encrypted_count': result['encrypted_count'],
+                    'failed_count': len(result['errors']),
+                    'elapsed_seconds': base_elapsed + time.monotonic() - started,
+                    'stage_seconds': json.dumps(result['stage_seconds']),
+                    'errors': json.dumps(result['errors'], ensure_ascii=False, default=str),
+                }
+            # 计数已记录在任务中，结果只保留批次与敏感度统计
+            summary = {key: value for key, value in result.items() if key not in _COUNTED_KEYS}
+            if 'batch_ids' in summary:
+                summary['batch_ids'] = base_batch_ids + summary['batch_ids']
+            values['result'] = json.dumps(summary, ensure_ascii=False, default=str)
+            await self._finish(job_id, worker, path, status='completed', **values)
+            logger.info(f'上传任务 {job_id} 处理完成: {values["order_count"]} 条订单')
+
+        except _UploadJobLost:
+            logger.warning(f'上传任务 {job_id} 已被其他工作协程领取，{worker} 停止处理')
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f'上传任务 {job_id} 处理失败: {str(e)}')
+            values = {'status': 'failed', 'last_error': str(e)}
+            # 整体校验失败时记录全部不合法的行
+            if isinstance(e, ValidationError) and e.details.get('rows'):
+                values['errors'] = json.dumps(e.details['rows'], ensure_ascii=False, default=str)
+            await self._finish(job_id, worker, path, **values)
+
+    async def _finish(self, job_id: int, worker: str, path: Path, **values):
+        """任务结束：更新状态并删除保存的上传文件"""
+        values.update(finished_at=datetime.now(timezone.utc), heartbeat_at=datetime.now(timezone.utc))
+        if await self.job_dao.update_job(job_id, worker, values):
+            path.unlink(missing_ok=True)
+
+
+async def run_upload_job_worker(index: int = 0):
+    """
+    后台上传任务工作协程（使用独立的数据库会话）
+
+    没有待处理任务时每隔 UPLOAD_JOB_POLL_INTERVAL_SECONDS 查询一次
+    """
+    worker = f'{socket.gethostname()}:{os.getpid()}:{index}'
+    logger.info(f'上传任务工作协程 {worker} 已启动')
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                service = UploadJobService(db)
+                stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.UPLOAD_JOB_STALE_SECONDS)
+                job_id = await service.job_dao.claim_next(worker, stale_before)
+                if job_id is not None:
+                    await service.run_job(job_id, worker)
+                    continue
+            await asyncio.sleep(settings.UPLOAD_JOB_POLL_INTERVAL_SECONDS)
+        except asyncio.CancelledError:
+            logger.info(f'上传任务工作协程 {worker} 已停止')
+            raise
+        except Exception as e:
+            logger.error(f'上传任务工作协程 {worker} 失败: {str(e)}')
+            await asyncio.sleep(settings.UPLOAD_JOB_POLL_INTERVAL_SECONDS)
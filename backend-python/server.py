@@ -2,6 +2,8 @@
 DVSS-PPA FastAPI 应用入口
 """
 
+import asyncio
+
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -22,6 +24,9 @@ from module_dvss.controller.order_controller import router as order_router
 from module_dvss.controller.role_controller import router as role_router
 from module_dvss.controller.shard_controller import router as shard_router
 from module_dvss.controller.user_controller import router as user_router
+from module_dvss.service.shard_scrub_service import ShardScrubService, run_shard_scrubber
+from module_dvss.service.upload_job_service import run_upload_job_worker
+from utils.async_sharing_util import AsyncSharingUtil
 from utils.log_util import LogUtil
 
 # 初始化日志
@@ -57,10 +62,22 @@ async def lifespan(app: FastAPI):
     # 异步初始化数据库
     await init_database()
 
+    # 后台分片巡检
+    scrub_task = asyncio.create_task(run_shard_scrubber()) if settings.SHARD_SCRUB_ENABLED else None
+
+    # 后台上传任务工作协程
+    upload_tasks = [asyncio.create_task(run_upload_job_worker(index)) for index in range(settings.UPLOAD_JOB_WORKERS)]
+
     logger.info('✅ DVSS-PPA启动成功')
     yield
 
     # 关闭阶段
+    background_tasks = upload_tasks + ([scrub_task] if scrub_task is not None else [])
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    ShardScrubService.shutdown()
+    AsyncSharingUtil.shutdown()
     logger.info('👋 应用关闭完成')
 
 
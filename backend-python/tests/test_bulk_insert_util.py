@@ -0,0 +1,22 @@
+"""
+BulkInsertUtil 批量插入的回归测试
+"""
+
+import asyncio
+
+import pytest
+
+from module_dvss.entity.original_order import OriginalOrder
+from utils.bulk_insert_util import BulkInsertUtil
+
+
+def test_insert_rows_rejects_rows_with_different_columns():
+    """各行的列不同时报错，而不是用 None 补齐缺少的列覆盖列的默认值"""
+    rows = [
+        {'order_id': 'A', 'user_id': '1'},
+        {'order_id': 'B', 'user_id': '1', 'status': 'pending'},
+    ]
+    table = OriginalOrder.__table__
+
+    with pytest.raises(ValueError):
+        asyncio.run(BulkInsertUtil.insert_rows(None, table, rows, table.c.order_id))
@@ -0,0 +1,53 @@
+"""
+EncryptionService 批量加密的回归测试
+"""
+
+import json
+
+from config.settings import settings
+from module_dvss.service.encryption_service import EncryptionService
+
+
+def _payload(order_id: str, note: str) -> bytes:
+    order = {
+        'order_id': order_id,
+        'user_id': 'u1',
+        'name': '张三',
+        'phone': '13800000000',
+        'email': 'a@b.c',
+        'address': note,
+        'payment_info': 'visa',
+        'item_list': None,
+        'total_amount': '12.50',
+    }
+    return json.dumps(order, ensure_ascii=False).encode('utf-8')
+
+
+def test_encrypt_payloads_mixed_grouped_and_shamir(monkeypatch):
+    """同一批中字段组模式与直接共享模式的订单各自取回自己的分片"""
+    monkeypatch.setattr(settings, 'ENCRYPTION_HYBRID_THRESHOLD', 300)
+    monkeypatch.setattr(settings, 'ENCRYPTION_LARGE_ORDER_MODE', 'grouped')
+    items = [
+        ('A', _payload('A', 'x' * 400)),
+        ('B', _payload('B', 'short')),
+        ('C', _payload('C', 'y' * 500)),
+        ('D', _payload('D', 'tiny')),
+    ]
+
+    results = EncryptionService.encrypt_payloads(items, 3, 5)
+
+    assert [result[0] for result in results] == [
+        EncryptionService.ALGORITHM_GROUPED,
+        EncryptionService.ALGORITHM_SHAMIR,
+        EncryptionService.ALGORITHM_GROUPED,
+        EncryptionService.ALGORITHM_SHAMIR,
+    ]
+    for (order_no, payload), (algorithm, shares, ciphertext, _) in zip(items, results):
+        if isinstance(shares, dict):
+            shares = {group: group_shares[:3] for group, group_shares in shares.items()}
+            encrypted_data = ciphertext.decode('utf-8')
+        else:
+            shares = shares[:3]
+            encrypted_data = ''
+        recovered = EncryptionService.decrypt_payload(algorithm, order_no, encrypted_data, shares)
+        assert json.loads(recovered) == json.loads(payload)
@@ -0,0 +1,23 @@
+"""
+ReshareUtil 重分享的回归测试
+"""
+
+import random
+
+from utils.packed_sharing_util import PackedSharingUtil
+from utils.reshare_util import ReshareUtil
+from utils.share_codec_util import ShareCodecUtil
+
+
+def test_reshare_packed_shares():
+    """打包分片重分享后保持打包数量，新阈值为 k' + l - 1，任意该数量的新分片均可恢复"""
+    values = [b'order_id', '张三'.encode('utf-8'), b'', b'x' * 300]
+    shares = PackedSharingUtil.split_values(values, 3, 5, 2)
+
+    new_shares, commitments = ReshareUtil.reshare_shards(random.sample(shares, 4), None, 4, 7)
+
+    assert commitments is None
+    assert len(new_shares) == 7
+    assert ShareCodecUtil.decode(new_shares[0]).k == 5
+    for _ in range(5):
+        assert PackedSharingUtil.recover_values(random.sample(new_shares, 5)) == values
@@ -2,31 +2,56 @@
 工具类模块
 """
 
+from .async_sharing_util import AsyncSharingUtil
+from .bulk_insert_util import BulkInsertUtil
 from .common_util import CommonUtil
 from .crypto_util import CryptoUtil, EncryptionKeyManager, HashUtil, SecretSharingUtil
+from .csv_stream_util import CsvStreamUtil
 from .date_util import DateUtil
+from .feldman_util import FeldmanVSSUtil
 from .file_util import FileUtil
+from .gf256_util import GF256SecretSharing, GF256Util
+from .ida_util import IDAUtil
 from .log_util import AuditLogger, LogUtil, audit_logger
+from .merkle_util import MerkleRootBuilder, MerkleUtil
+from .packed_sharing_util import PackedSharingUtil
 from .page_util import PageUtil
+from .payload_cache_util import PayloadCacheUtil
 from .pwd_util import PwdUtil
+from .random_pool_util import RandomPoolUtil
 from .response_util import ApiResponse, PageResponse, ResponseUtil
+from .share_codec_util import BinaryShare, ShareCodecUtil
 from .validation_util import ValidationUtil
 
 __all__ = [
+    'AsyncSharingUtil',
+    'BulkInsertUtil',
     'CommonUtil',
     'CryptoUtil',
+    'CsvStreamUtil',
     'SecretSharingUtil',
     'HashUtil',
     'EncryptionKeyManager',
     'DateUtil',
+    'FeldmanVSSUtil',
     'FileUtil',
+    'GF256Util',
+    'GF256SecretSharing',
+    'IDAUtil',
     'LogUtil',
     'AuditLogger',
     'audit_logger',
+    'MerkleUtil',
+    'MerkleRootBuilder',
+    'PackedSharingUtil',
     'PageUtil',
+    'PayloadCacheUtil',
     'PwdUtil',
+    'RandomPoolUtil',
     'ResponseUtil',
     'ApiResponse',
     'PageResponse',
+    'ShareCodecUtil',
+    'BinaryShare',
     'ValidationUtil',
 ]
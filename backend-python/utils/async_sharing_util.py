@@ -0,0 +1,100 @@
+"""
+异步秘密共享工具类
+将较大的分片/重构运算提交到进程池执行，避免阻塞事件循环
+"""
+
+import asyncio
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, List, Optional, Sequence
+
+from config.settings import settings
+from utils.gf256_util import GF256SecretSharing
+from utils.log_util import LogUtil
+
+logger = LogUtil.get_logger(__name__)
+
+
+class AsyncSharingUtil:
+    """
+    分片运算的异步门面
+
+    - 载荷小于 SHARING_INLINE_THRESHOLD 时直接执行，省去进程间序列化开销
+    - 较大的任务提交到进程池，进程池在首次使用时创建
+    - 同时在进程池中执行的任务数由信号量限制，超出的任务在事件循环中排队等待
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def get_executor(cls) -> Optional[ProcessPoolExecutor]:
+        """获取进程池，未启用时返回None"""
+        if not settings.SHARING_EXECUTOR_ENABLED:
+            return None
+        if cls._executor is None:
+            workers = settings.SHARING_PROCESS_WORKERS or os.cpu_count() or 1
+            # 事件循环所在进程通常已有其他线程（数据库驱动等），使用spawn避免fork带来的死锁
+            cls._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            logger.info(f'分片运算进程池已启动，工作进程数: {workers}')
+        return cls._executor
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """获取限制进程池并发任务数的信号量"""
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(settings.SHARING_MAX_IN_FLIGHT)
+        return cls._semaphore
+
+    @classmethod
+    async def run(cls, func: Callable[..., Any], *args: Any, size: int) -> Any:
+        """
+        执行分片运算
+
+        Args:
+            func: 可被序列化的模块级函数或类方法
+            *args: 函数参数（需可序列化）
+            size: 任务涉及的字节数，用于判断是否内联执行
+
+        Returns:
+            函数返回值
+        """
+        if size < settings.SHARING_INLINE_THRESHOLD:
+            return func(*args)
+        executor = cls.get_executor()
+        if executor is None:
+            return func(*args)
+
+        async with cls._get_semaphore():
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(executor, partial(func, *args))
+            except BrokenProcessPool:
+                logger.warning('分片运算进程池异常退出，重建进程池并在当前进程内执行')
+                cls.shutdown(wait=False)
+                return func(*args)
+
+    @classmethod
+    async def split_payloads(cls, payloads: Sequence[bytes], k: int, n: int) -> List[List[bytes]]:
+        """异步批量分割字节串秘密"""
+        size = sum(len(payload) for payload in payloads)
+        return await cls.run(GF256SecretSharing.split_payloads, list(payloads), k, n, size=size)
+
+    @classmethod
+    async def recover_payloads(cls, share_lists: Sequence[Sequence[bytes]]) -> List[bytes]:
+        """异步批量恢复字节串秘密"""
+        share_lists = [[bytes(share) for share in shares] for shares in share_lists]
+        size = sum(len(shares[0]) for shares in share_lists if shares)
+        return await cls.run(GF256SecretSharing.recover_payloads, share_lists, size=size)
+
+    @classmethod
+    def shutdown(cls, wait: bool = True):
+        """关闭进程池"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=wait, cancel_futures=not wait)
+            cls._executor = None
+        cls._semaphore = None
@@ -0,0 +1,80 @@
+"""
+批量插入工具类
+以 SQLAlchemy Core 的 executemany 按批插入多行并批量取回自增主键
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BulkInsertUtil:
+    """批量插入工具类"""
+
+    # 默认每批插入的行数
+    DEFAULT_BATCH_ROWS = 1000
+
+    @staticmethod
+    async def insert_rows(
+        db: AsyncSession,
+        table: Table,
+        rows: Sequence[Dict[str, Any]],
+        key_column: Column,
+        batch_rows: Optional[int] = None,
+    ) -> List[int]:
+        """
+        批量插入并按输入顺序返回主键（只执行不提交，由调用方控制事务）
+
+        主键按 key_column 对应到输入的行，key_column 在一批内应唯一：数据库支持 executemany RETURNING 时
+        （SQLite 3.35+、PostgreSQL 等）随插入语句取回 (主键, 键)；不支持时（MySQL）插入后按键查询本批的主键，
+        已存在相同键的行时取主键最大（最新插入）的行。
+        RETURNING 不要求按参数顺序返回，数据库无需逐行插入即可保证对应关系
+
+        Args:
+            db: 数据库会话
+            table: 插入的表
+            rows: 各行的列值，各行的列必须相同
+            key_column: 用于对应主键与输入行的列
+            batch_rows: 每条语句的行数，默认 DEFAULT_BATCH_ROWS
+
+        Returns:
+            各行的主键
+
+        Raises:
+            ValueError: 各行的列不同
+        """
+        if not rows:
+            return []
+        batch_rows = max(1, batch_rows or BulkInsertUtil.DEFAULT_BATCH_ROWS)
+        BulkInsertUtil._check_rows(rows)
+        primary_key = table.primary_key.columns.values()[0]
+        returning = db.get_bind().dialect.insert_executemany_returning
+
+        ids: List[int] = []
+        for start in range(0, len(rows), batch_rows):
+            chunk = rows[start : start + batch_rows]
+            keys = [row[key_column.name] for row in chunk]
+            if returning:
+                result = await db.execute(insert(table).returning(primary_key, key_column), chunk)
+            else:
+                await db.execute(insert(table), chunk)
+                result = await db.execute(
+                    select(primary_key, key_column).where(key_column.in_(keys)).order_by(primary_key)
+                )
+            id_map = {key: row_id for row_id, key in result.all()}
+            ids.extend(id_map[key] for key in keys)
+        return ids
+
+    @staticmethod
+    def _check_rows(rows: Sequence[Dict[str, Any]]):
+        """
+        executemany 要求各行的列相同；不为缺少的列补值，以免用 None 覆盖列的默认值与服务端默认值
+
+        Raises:
+            ValueError: 各行的列不同
+        """
+        names = rows[0].keys()
+        for index, row in enumerate(rows):
+            if row.keys() != names:
+                raise ValueError(f'批量插入的各行列必须相同: 第{index}行 {sorted(row)} 与第0行 {sorted(names)} 不同')
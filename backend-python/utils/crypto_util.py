@@ -6,15 +6,20 @@ import base64
 import hashlib
 import json
 import os
-import secrets
 
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+from config.settings import settings
+from utils.random_pool_util import RandomPoolUtil
+
 
 class CryptoUtil:
     """密码学工具类"""
@@ -96,6 +101,27 @@ class CryptoUtil:
         decrypted_data = fernet.decrypt(encrypted_bytes)
         return decrypted_data.decode('utf-8')
 
+    @staticmethod
+    def encrypt_aes_gcm(data: bytes, key: bytes, associated_data: bytes = None) -> bytes:
+        """
+        使用AES-GCM加密
+
+        Args:
+            data: 明文
+            key: 16/24/32字节密钥
+            associated_data: 附加认证数据
+
+        Returns:
+            nonce(12字节) + 密文(含16字节认证标签)
+        """
+        nonce = os.urandom(12)
+        return nonce + AESGCM(key).encrypt(nonce, data, associated_data)
+
+    @staticmethod
+    def decrypt_aes_gcm(encrypted_data: bytes, key: bytes, associated_data: bytes = None) -> bytes:
+        """使用AES-GCM解密，输入格式为 nonce + 密文"""
+        return AESGCM(key).decrypt(encrypted_data[:12], encrypted_data[12:], associated_data)
+
     @staticmethod
     def generate_rsa_keypair(key_size: int = 2048) -> Tuple[str, str]:
         """生成RSA密钥对"""
@@ -167,9 +193,7 @@ class SecretSharingUtil:
         secret_int = int.from_bytes(secret_bytes, byteorder='big')
 
         # 生成随机系数
-        coefficients = [secret_int]
-        for i in range(k - 1):
-            coefficients.append(secrets.randbelow(self.prime))
+        coefficients = [secret_int] + RandomPoolUtil.default().randbelow_many(self.prime, k - 1)
 
         # 计算分片
         shares = []
@@ -234,40 +258,23 @@ class SecretSharingUtil:
 
     def _lagrange_interpolation(self, points: List[Tuple[int, int]], x: int) -> int:
         """拉格朗日插值"""
-        result = 0
-
-        for i, (xi, yi) in enumerate(points):
-            # 计算拉格朗日基函数
-            li = 1
-            for j, (xj, _) in enumerate(points):
-                if i != j:
-                    # 计算 (x - xj) / (xi - xj)
-                    numerator = (x - xj) % self.prime
-                    denominator = (xi - xj) % self.prime
-
-                    # 计算模逆
-                    denominator_inv = self._mod_inverse(denominator, self.prime)
-                    li = (li * numerator * denominator_inv) % self.prime
+        # 按 x 排序后查缓存，同一组分片以任意顺序提交时命中同一条基
+        points = sorted(points, key=lambda point: point[0])
+        xs = tuple(xi for xi, _ in points)
+        basis = _lagrange_basis(xs, x, self.prime)
 
+        result = 0
+        for (_, yi), li in zip(points, basis):
             result = (result + yi * li) % self.prime
 
         return result
 
     def _mod_inverse(self, a: int, m: int) -> int:
         """计算模逆"""
-
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-
-        gcd, x, _ = extended_gcd(a % m, m)
-        if gcd != 1:
+        try:
+            return pow(a, -1, m)
+        except ValueError:
             raise ValueError('模逆不存在')
-        return (x % m + m) % m
 
     def verify_share(self, share: str) -> bool:
         """验证分片格式是否正确"""
@@ -296,6 +303,28 @@ class SecretSharingUtil:
             return {'is_valid': False, 'error': '分片格式无效'}
 
 
+@lru_cache(maxsize=256)
+def _lagrange_basis(xs: Tuple[int, ...], x: int, prime: int) -> Tuple[int, ...]:
+    """
+    计算并缓存拉格朗日基 l_i(x)，键为 (升序的x坐标, 求值点, 素数域)
+
+    生产环境中绝大多数重构使用相同的 x 坐标集合，缓存后每次重构只需一次线性组合
+    """
+    basis = []
+    for i, xi in enumerate(xs):
+        numerator = 1
+        denominator = 1
+        for j, xj in enumerate(xs):
+            if i != j:
+                numerator = (numerator * (x - xj)) % prime
+                denominator = (denominator * (xi - xj)) % prime
+        try:
+            basis.append((numerator * pow(denominator, -1, prime)) % prime)
+        except ValueError:
+            raise ValueError('模逆不存在')
+    return tuple(basis)
+
+
 class HashUtil:
     """哈希工具类"""
 
@@ -325,45 +354,53 @@ class HashUtil:
 
 
 class EncryptionKeyManager:
-    """加密密钥管理器"""
+    """
+    信封加密密钥层级：主密钥 → 密钥加密密钥(KEK) → 数据密钥(DEK)
+
+    - 主密钥只来自配置，不落库；KEK 由主密钥包装、DEK 由 KEK 包装后保存在密钥库中
+    - 包装使用 AES-GCM，密钥ID作为附加认证数据，包装后的密钥不能挪作其他密钥ID使用
+    - 轮换 KEK 只需用新 KEK 重新包装其下的 DEK，轮换主密钥只需重新包装 KEK，业务数据不重新加密
+    """
+
+    KEY_SIZE = 32
+
+    def __init__(self, master_key: bytes):
+        if len(master_key) != self.KEY_SIZE:
+            raise ValueError(f'主密钥长度必须为{self.KEY_SIZE}字节')
+        self._master_key = master_key
+
+    @classmethod
+    def from_settings(cls) -> 'EncryptionKeyManager':
+        """由 KEY_MASTER_KEY（base64）创建，未配置时由 SECRET_KEY 派生"""
+        if settings.KEY_MASTER_KEY:
+            return cls(base64.b64decode(settings.KEY_MASTER_KEY))
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=cls.KEY_SIZE, salt=None, info=b'dvss-master-key')
+        return cls(hkdf.derive(settings.SECRET_KEY.encode('utf-8')))
+
+    @classmethod
+    def generate_key(cls) -> bytes:
+        """生成新的KEK或DEK"""
+        return os.urandom(cls.KEY_SIZE)
 
-    def __init__(self):
-        self.keys = {}
-
-    def generate_key(self, key_id: str, algorithm: str = 'fernet') -> str:
-        """生成并存储密钥"""
-        if algorithm.lower() == 'fernet':
-            key = Fernet.generate_key().decode('utf-8')
-        elif algorithm.lower() == 'aes':
-            key = CryptoUtil.generate_random_key(32)
-        else:
-            raise ValueError(f'不支持的算法: {algorithm}')
-
-        self.keys[key_id] = {
-            'key': key,
-            'algorithm': algorithm,
-            'created_at': CryptoUtil.calculate_hash(str(secrets.randbelow(2**32))),
-        }
-
-        return key
-
-    def get_key(self, key_id: str) -> str:
-        """获取密钥"""
-        if key_id not in self.keys:
-            raise ValueError(f'密钥不存在: {key_id}')
-        return self.keys[key_id]['key']
-
-    def rotate_key(self, key_id: str) -> str:
-        """轮换密钥"""
-        if key_id not in self.keys:
-            raise ValueError(f'密钥不存在: {key_id}')
-
-        algorithm = self.keys[key_id]['algorithm']
-        return self.generate_key(key_id, algorithm)
-
-    def delete_key(self, key_id: str) -> bool:
-        """删除密钥"""
-        if key_id in self.keys:
-            del self.keys[key_id]
-            return True
-        return False
+    @staticmethod
+    def wrap(key: bytes, wrapping_key: bytes, key_id: str) -> bytes:
+        """用上级密钥包装密钥"""
+        return CryptoUtil.encrypt_aes_gcm(key, wrapping_key, key_id.encode('utf-8'))
+
+    @staticmethod
+    def unwrap(wrapped: bytes, wrapping_key: bytes, key_id: str) -> bytes:
+        """用上级密钥解包密钥"""
+        return CryptoUtil.decrypt_aes_gcm(wrapped, wrapping_key, key_id.encode('utf-8'))
+
+    @classmethod
+    def rewrap(cls, wrapped: bytes, old_wrapping_key: bytes, new_wrapping_key: bytes, key_id: str) -> bytes:
+        """将密钥改由新的上级密钥包装（密钥本身不变）"""
+        return cls.wrap(cls.unwrap(wrapped, old_wrapping_key, key_id), new_wrapping_key, key_id)
+
+    def wrap_kek(self, kek: bytes, key_id: str) -> bytes:
+        """用主密钥包装KEK"""
+        return self.wrap(kek, self._master_key, key_id)
+
+    def unwrap_kek(self, wrapped: bytes, key_id: str) -> bytes:
+        """用主密钥解包KEK"""
+        return self.unwrap(wrapped, self._master_key, key_id)
@@ -0,0 +1,133 @@
+"""
+CSV流式解析工具类
+按块读取上传文件，在记录边界处切分后分批解析为 DataFrame，内存占用与文件大小无关
+"""
+
+import codecs
+import io
+
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+import pandas as pd
+
+# 读取函数：(最大字节数) -> 数据块，返回空字节串表示结束（与 UploadFile.read 一致）
+ChunkReader = Callable[[int], Awaitable[bytes]]
+
+
+class _RecordSplitter:
+    """
+    在完整记录的边界处切分CSV文本
+
+    引号内的换行属于字段内容：只有之前出现的双引号个数为偶数的换行才是记录边界（转义的双引号成对出现，不影响奇偶）
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._scanned = 0
+        self._in_quotes = False
+
+    def feed(self, text: str) -> str:
+        """追加文本，返回缓冲区中已完整的记录（含结尾换行），不完整的部分留待下次"""
+        buffer = self._buffer + text
+        position, in_quotes, cut = self._scanned, self._in_quotes, -1
+        while True:
+            newline = buffer.find('\n', position)
+            if newline < 0:
+                break
+            if buffer.count('"', position, newline) % 2:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                cut = newline
+            position = newline + 1
+
+        self._buffer = buffer[cut + 1 :]
+        self._scanned = position - (cut + 1)
+        self._in_quotes = in_quotes
+        return buffer[: cut + 1]
+
+    def flush(self) -> str:
+        """返回剩余的文本（文件末尾可能没有换行）"""
+        rest, self._buffer, self._scanned, self._in_quotes = self._buffer, '', 0, False
+        return rest
+
+
+class CsvStreamUtil:
+    """CSV流式解析"""
+
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+    @staticmethod
+    def _first_record_end(text: str) -> int:
+        """第一条完整记录（表头）结束的位置"""
+        position = 0
+        while True:
+            newline = text.find('\n', position)
+            if newline < 0:
+                return len(text)
+            if text.count('"', 0, newline) % 2 == 0:
+                return newline + 1
+            position = newline + 1
+
+    @staticmethod
+    def _parse(header: str, text: str) -> pd.DataFrame:
+        """解析一段完整记录，全部列按字符串读取，空值为空字符串"""
+        return pd.read_csv(io.StringIO(header + text), dtype=str, keep_default_na=False, skip_blank_lines=True)
+
+    @classmethod
+    async def iter_batches(
+        cls,
+        read: ChunkReader,
+        batch_rows: int,
+        chunk_size: Optional[int] = None,
+        encoding: str = 'utf-8-sig',
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        按块读取CSV并逐批产出 DataFrame
+
+        Args:
+            read: 异步读取函数，例如 UploadFile.read
+            batch_rows: 每批的行数（最后一批可能更少）
+            chunk_size: 每次读取的字节数
+            encoding: 文件编码，默认UTF-8（可带BOM）
+
+        Yields:
+            列为表头、值为字符串的 DataFrame，索引为从0开始的文件行号（不含表头）
+        """
+        if batch_rows < 1:
+            raise ValueError('每批行数必须大于0')
+        decoder = codecs.getincrementaldecoder(encoding)()
+        splitter = _RecordSplitter()
+        header: Optional[str] = None
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+        row_offset = 0
+
+        while True:
+            chunk = await read(chunk_size or cls.DEFAULT_CHUNK_SIZE)
+            text = splitter.feed(decoder.decode(chunk)) if chunk else None
+            if text is None:
+                text = splitter.feed(decoder.decode(b'', final=True)) + splitter.flush()
+                if text and not text.endswith('\n'):
+                    text += '\n'
+
+            if header is None and text:
+                end = cls._first_record_end(text)
+                header, text = text[:end], text[end:]
+            if header is not None and text.strip():
+                frame = cls._parse(header, text)
+                if len(frame):
+                    pending.append(frame)
+                    pending_rows += len(frame)
+
+            # 凑满一批即产出；读取结束时产出剩余行
+            while pending_rows >= batch_rows or (not chunk and pending_rows):
+                merged = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+                batch, rest = merged.iloc[:batch_rows], merged.iloc[batch_rows:]
+                batch.index = pd.RangeIndex(row_offset, row_offset + len(batch))
+                row_offset += len(batch)
+                pending = [rest.reset_index(drop=True)] if len(rest) else []
+                pending_rows = len(rest)
+                yield batch
+
+            if not chunk:
+                break
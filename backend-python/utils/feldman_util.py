@@ -0,0 +1,327 @@
+"""
+Feldman 可验证秘密共享工具类
+在 2048 位素数模群的 256 位素数阶子群上对多项式系数做承诺，任一分片均可独立对照承诺校验，
+并支持随机线性组合的批量校验
+"""
+
+import hashlib
+import secrets
+
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from utils.random_pool_util import RandomPoolUtil
+from utils.share_codec_util import BinaryShare, ShareCodecUtil
+
+# 群参数：P 为 2048 位素数，Q 为 256 位素数且 Q | P-1，G 为 Q 阶子群的生成元
+# （参数为随机生成，可由 FeldmanVSSUtil.check_group 复核）
+_P = int(
+    '884c5259a3f0bbdf1bcb20d6afe5fba65d7f5dc2a3d6d951ac84990e05380d5c1d0367805555ced61f5ea06f494e2661'
+    '2eb8f81f9b095492760d1f85c891d44c875ed306e890973d7efbf1338f94947e6d437035d205b14c91a54d8171a45078'
+    '8cd9464129d08093a77b50474de15d687db78291599852280ec0f64b985f956b6a24e77f898be237dd2e0277ef4f2f5a'
+    '9da673850a2bf8f7e44f4f52f3be0960e8562ee3f2c45a36b5dad57a6e9c4018f0cb8aa1dfc312dd47fe21506e997ba4'
+    'dd403bb5c65b8ecf7a607b0ed03efd72d44a937ccbc0b3f5aae2d584421a8f55c3a04a3613ad6e13c958b8534324c8b5'
+    '211d5190464937c6a9b70dd713675ea9',
+    16,
+)
+_Q = int('93020f867f3a93b4600b70cae5247acd3d2ec508e67ace98e56e3fde1aefe2e9', 16)
+_G = int(
+    '2793e346b61755dfda8615665a474541d02b62449a0c7429aae9f949bd00b5644a9bfb82a3b11eedf5f59423e8f66ab0'
+    '9d549e38ff369ba9abff4c379119bebb459977b82d345c0c2b73587c87be1a0c6aacb2a271d312b7dc8f7b3fac317c46'
+    '72bb240f65ad231a75f942d1039b1d352043322e513dcae11067b7bbd6869a5c0330a784eccc56dfd7905a2087f3b232'
+    'b2d66610fa73a1a639a8e31acbe4ed5e9b30f0d3035e3278c869fa38be347c0f2b7be5db2c0f1146f79b55082a6988d1'
+    'dc07f466ba0bb45f4246345853ce5360a93f44682045514ea3d478958f60825f3ec250c5f5b5830fbffaaa4d74768440'
+    '6118e3db25f848054d4dc73b7d5e3993',
+    16,
+)
+
+# 固定基 G 的窗口宽度（位），预计算表为 ceil(256 / 8) × 256 个群元素，约 2MB
+_WINDOW_BITS = 8
+
+# 底数少于该数量时多重幂退化为逐个模幂
+_MULTI_POW_MIN_BASES = 16
+
+# 批量校验随机系数的位数（小指数测试），错误分片通过校验的概率不超过 2^-64
+_BATCH_CHALLENGE_BITS = 64
+
+# (x, y, 承诺) 三元组
+ShareItem = Tuple[int, int, Tuple[int, ...]]
+
+
+class FeldmanVSSUtil:
+    """Feldman 可验证秘密共享（素数域 Z_Q 上的 Shamir 共享 + 系数承诺 C_t = G^a_t mod P）"""
+
+    P = _P
+    Q = _Q
+    G = _G
+
+    SCHEME = ShareCodecUtil.SCHEME_FELDMAN_ZQ
+    SECRET_SIZE = 32
+    ELEMENT_SIZE = 256
+    MAX_SHARES = 255
+
+    @classmethod
+    def check_group(cls) -> bool:
+        """复核群参数：Q 整除 P-1，G 的阶为 Q"""
+        return (cls.P - 1) % cls.Q == 0 and cls.G != 1 and pow(cls.G, cls.Q, cls.P) == 1
+
+    @classmethod
+    def pow_g(cls, exponent: int) -> int:
+        """固定基模幂 G^exponent mod P，查表后只需约 32 次模乘"""
+        exponent %= cls.Q
+        table = _fixed_base_table()
+        mask = (1 << _WINDOW_BITS) - 1
+
+        result = 1
+        window = 0
+        while exponent:
+            digit = exponent & mask
+            if digit:
+                result = result * table[window][digit] % cls.P
+            exponent >>= _WINDOW_BITS
+            window += 1
+        return result
+
+    @classmethod
+    def multi_pow(cls, bases: Sequence[int], exponents: Sequence[int]) -> int:
+        """
+        多重幂 prod(b_i^e_i) mod P（Pippenger 桶算法）
+
+        每个窗口内按数位把底数归入桶中，再用前缀积一次求出各桶的加权乘积，
+        模乘次数约为 (位数 / c) × (底数个数 + 2^(c+1))，远少于逐个模幂
+        """
+        if len(bases) < _MULTI_POW_MIN_BASES:
+            # 底数很少时桶的开销超过收益，直接逐个模幂（内置 pow 为C实现）
+            result = 1
+            for base, exponent in zip(bases, exponents):
+                result = result * pow(base, exponent, cls.P) % cls.P
+            return result
+
+        max_bits = max(exponent.bit_length() for exponent in exponents)
+        if max_bits == 0:
+            return 1
+        window_bits = max(1, min(16, len(bases).bit_length() - 2))
+        mask = (1 << window_bits) - 1
+
+        result = 1
+        for window in range((max_bits - 1) // window_bits, -1, -1):
+            for _ in range(window_bits):
+                result = result * result % cls.P
+
+            shift = window * window_bits
+            buckets: Dict[int, int] = {}
+            for base, exponent in zip(bases, exponents):
+                digit = (exponent >> shift) & mask
+                if digit:
+                    bucket = buckets.get(digit)
+                    buckets[digit] = base if bucket is None else bucket * base % cls.P
+
+            # sum(d * bucket_d) 以前缀积计算：running 依次累乘高位桶，total 累乘 running
+            running = 1
+            total = 1
+            for digit in range(mask, 0, -1):
+                bucket = buckets.get(digit)
+                if bucket is not None:
+                    running = running * bucket % cls.P
+                if running != 1:
+                    total = total * running % cls.P
+            result = result * total % cls.P
+        return result
+
+    @classmethod
+    def random_secret(cls) -> int:
+        """生成 Z_Q 上的随机秘密"""
+        return RandomPoolUtil.default().randbelow_many(cls.Q, 1)[0]
+
+    @classmethod
+    def derive_key(cls, secret: int, size: int = 32) -> bytes:
+        """由秘密派生对称密钥"""
+        return hashlib.sha256(secret.to_bytes(cls.SECRET_SIZE, 'big')).digest()[:size]
+
+    @classmethod
+    def split(cls, secret: int, k: int, n: int) -> Tuple[List[int], List[int]]:
+        """
+        分割秘密并生成承诺
+
+        Args:
+            secret: Z_Q 上的秘密
+            k: 阈值
+            n: 总分片数
+
+        Returns:
+            (x=1..n 处的分片值, 系数承诺列表)
+        """
+        if k < 1:
+            raise ValueError('阈值必须大于0')
+        if k > n:
+            raise ValueError('阈值不能大于总分片数')
+        if n > cls.MAX_SHARES:
+            raise ValueError(f'总分片数不能超过{cls.MAX_SHARES}')
+
+        coefficients = [secret % cls.Q] + RandomPoolUtil.default().randbelow_many(cls.Q, k - 1)
+        commitments = [cls.pow_g(coefficient) for coefficient in coefficients]
+
+        shares = []
+        for x in range(1, n + 1):
+            # 霍纳法则求值
+            y = 0
+            for coefficient in reversed(coefficients):
+                y = (y * x + coefficient) % cls.Q
+            shares.append(y)
+        return shares, commitments
+
+    @classmethod
+    def lagrange_basis_at_zero(cls, xs: Sequence[int]) -> Tuple[int, ...]:
+        """Z_Q 上 x=0 处的拉格朗日基（按 x 坐标集合缓存）"""
+        return _lagrange_basis_at_zero(tuple(int(x) for x in xs))
+
+    @classmethod
+    def recover(cls, xs: Sequence[int], ys: Sequence[int]) -> int:
+        """由 k 个分片恢复秘密"""
+        basis = cls.lagrange_basis_at_zero(xs)
+        return sum(weight * y for weight, y in zip(basis, ys)) % cls.Q
+
+    @classmethod
+    def public_share(cls, x: int, commitments: Sequence[int]) -> int:
+        """由承诺计算 x 处分片的公开值 G^f(x) = prod(C_t^(x^t))"""
+        expected = 1
+        power = 1
+        for commitment in commitments:
+            expected = expected * pow(commitment, power, cls.P) % cls.P
+            power = power * x % cls.Q
+        return expected
+
+    @classmethod
+    def verify_share(cls, x: int, y: int, commitments: Sequence[int]) -> bool:
+        """校验单个分片：G^y == prod(C_t^(x^t))"""
+        return cls.pow_g(y) == cls.public_share(x, commitments)
+
+    @classmethod
+    def batch_verify(cls, items: Sequence[ShareItem]) -> bool:
+        """
+        批量校验分片
+
+        对每个分片取随机系数 r_i，校验 G^(sum r_i*y_i) == prod_t C_t^(sum r_i*x_i^t)。
+        同一组承诺下的分片先在指数上合并，右侧为 (订单数 × k) 个底数的多重幂，
+        以 Pippenger 桶算法一次计算
+
+        Args:
+            items: (x, y, 承诺) 列表，承诺需为元组以便按订单合并
+
+        Returns:
+            全部分片有效时返回True
+        """
+        if not items:
+            return True
+
+        left_exponent = 0
+        right_exponents: Dict[Tuple[int, ...], List[int]] = {}
+        for x, y, commitments in items:
+            r = secrets.randbits(_BATCH_CHALLENGE_BITS) | 1
+            left_exponent += r * y
+
+            exponents = right_exponents.setdefault(commitments, [0] * len(commitments))
+            power = r
+            for t in range(len(commitments)):
+                exponents[t] += power
+                power = power * x % cls.Q
+
+        # 右侧指数约为 64 + 8t 位，无需对 Q 取模（取模反而会放大到 256 位）
+        bases = []
+        exponents = []
+        for commitments, commitment_exponents in right_exponents.items():
+            bases.extend(commitments)
+            exponents.extend(commitment_exponents)
+        return cls.pow_g(left_exponent) == cls.multi_pow(bases, exponents)
+
+    @classmethod
+    def find_invalid(cls, items: Sequence[ShareItem]) -> List[int]:
+        """
+        定位无效分片：整体批量校验通过即返回，否则二分后分别校验
+
+        Returns:
+            无效分片在 items 中的下标
+        """
+        if cls.batch_verify(items):
+            return []
+        if len(items) == 1:
+            return [0]
+
+        middle = len(items) // 2
+        invalid = cls.find_invalid(items[:middle])
+        invalid.extend(middle + index for index in cls.find_invalid(items[middle:]))
+        return invalid
+
+    @classmethod
+    def encode_shares(cls, shares: Sequence[int], k: int, n: int) -> List[bytes]:
+        """将分片值编码为二进制分片"""
+        return [
+            ShareCodecUtil.encode(cls.SCHEME, k, n, i + 1, y.to_bytes(cls.SECRET_SIZE, 'big'))
+            for i, y in enumerate(shares)
+        ]
+
+    @classmethod
+    def parse_share(cls, share: BinaryShare) -> Tuple[int, int]:
+        """解析二进制分片，返回 (x, y)"""
+        if share.scheme != cls.SCHEME:
+            raise ValueError('不支持的分片格式')
+        return share.x, int.from_bytes(share.payload, 'big')
+
+    @classmethod
+    def recover_parsed(cls, parsed_shares: Sequence[BinaryShare]) -> int:
+        """由已解析的分片恢复秘密"""
+        if not parsed_shares:
+            raise ValueError('分片列表为空')
+        k = parsed_shares[0].k
+        if len(parsed_shares) < k:
+            raise ValueError(f'分片数量不足，需要至少{k}个分片')
+
+        points = [cls.parse_share(share) for share in parsed_shares[:k]]
+        return cls.recover([x for x, _ in points], [y for _, y in points])
+
+    @classmethod
+    def encode_commitments(cls, commitments: Sequence[int]) -> bytes:
+        """编码承诺（每个群元素定长 256 字节）"""
+        return b''.join(commitment.to_bytes(cls.ELEMENT_SIZE, 'big') for commitment in commitments)
+
+    @classmethod
+    def decode_commitments(cls, data: bytes) -> Tuple[int, ...]:
+        """解析承诺"""
+        if len(data) % cls.ELEMENT_SIZE:
+            raise ValueError('承诺数据长度无效')
+        return tuple(
+            int.from_bytes(data[offset : offset + cls.ELEMENT_SIZE], 'big')
+            for offset in range(0, len(data), cls.ELEMENT_SIZE)
+        )
+
+
+@lru_cache(maxsize=1)
+def _fixed_base_table() -> Tuple[Tuple[int, ...], ...]:
+    """预计算 table[i][d] = G^(d * 2^(8i)) mod P"""
+    table = []
+    base = _G
+    for _ in range(-(-_Q.bit_length() // _WINDOW_BITS)):
+        row = [1]
+        for _ in range((1 << _WINDOW_BITS) - 1):
+            row.append(row[-1] * base % _P)
+        table.append(tuple(row))
+        base = row[-1] * base % _P
+    return tuple(table)
+
+
+@lru_cache(maxsize=256)
+def _lagrange_basis_at_zero(xs: Tuple[int, ...]) -> Tuple[int, ...]:
+    """按 x 坐标元组缓存 Z_Q 上 x=0 处的拉格朗日基"""
+    if len(set(xs)) != len(xs):
+        raise ValueError('分片的x坐标重复')
+
+    basis = []
+    for i, xi in enumerate(xs):
+        numerator = 1
+        denominator = 1
+        for j, xj in enumerate(xs):
+            if i != j:
+                numerator = numerator * (-xj) % _Q
+                denominator = denominator * (xi - xj) % _Q
+        basis.append(numerator * pow(denominator, -1, _Q) % _Q)
+    return tuple(basis)
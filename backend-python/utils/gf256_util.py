@@ -0,0 +1,523 @@
+"""
+GF(2^8) 有限域运算与按字节的秘密共享引擎
+基于 NumPy 对数/反对数表实现向量化运算
+"""
+
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from utils.random_pool_util import RandomPoolUtil
+from utils.share_codec_util import BinaryShare, ShareCodecUtil, read_exact
+
+
+def _build_tables(polynomial: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    构建以 3 为生成元的反对数表、对数表以及由二者导出的 256×256 乘法表
+
+    反对数表长度取 512，使 LOG[a] + LOG[b] 无需再取模
+    """
+    exp_table = np.zeros(512, dtype=np.uint8)
+    log_table = np.zeros(256, dtype=np.int32)
+
+    value = 1
+    for power in range(255):
+        exp_table[power] = value
+        log_table[value] = power
+        # 乘以生成元 3：v * 3 = v * 2 ^ v
+        doubled = value << 1
+        if doubled & 0x100:
+            doubled ^= polynomial
+        value = doubled ^ value
+    exp_table[255:510] = exp_table[:255]
+
+    mul_table = exp_table[log_table[:, None] + log_table[None, :]]
+    mul_table[0, :] = 0
+    mul_table[:, 0] = 0
+    return exp_table, log_table, mul_table
+
+
+class GF256Util:
+    """GF(2^8) 有限域运算工具类（AES 不可约多项式 x^8+x^4+x^3+x+1）"""
+
+    POLYNOMIAL = 0x11B
+
+    EXP, LOG, MUL = _build_tables(POLYNOMIAL)
+
+    @classmethod
+    def mul(cls, a: int, b: int) -> int:
+        """标量乘法"""
+        if a == 0 or b == 0:
+            return 0
+        return int(cls.EXP[cls.LOG[a] + cls.LOG[b]])
+
+    @classmethod
+    def inv(cls, a: int) -> int:
+        """标量乘法逆元"""
+        if a == 0:
+            raise ValueError('0在GF(256)中没有逆元')
+        return int(cls.EXP[255 - cls.LOG[a]])
+
+    @classmethod
+    def pow(cls, a: int, e: int) -> int:
+        """标量幂运算"""
+        if e == 0:
+            return 1
+        if a == 0:
+            return 0
+        return int(cls.EXP[(int(cls.LOG[a]) * e) % 255])
+
+    @classmethod
+    def mul_vec(cls, scalars: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        向量化乘法，按 NumPy 广播规则逐元素计算 scalars * values
+
+        Args:
+            scalars: uint8 数组
+            values: uint8 数组
+
+        Returns:
+            广播后形状的 uint8 数组
+        """
+        scalars = np.asarray(scalars, dtype=np.uint8)
+        values = np.asarray(values, dtype=np.uint8)
+        product = cls.EXP[cls.LOG[scalars] + cls.LOG[values]]
+        return np.where((scalars == 0) | (values == 0), np.uint8(0), product)
+
+    @classmethod
+    def matmul(cls, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        有限域矩阵乘法 left(m×k) · right(k×L)
+
+        右矩阵每一行只转换一次索引，随后对每个系数做一次整行查表（MUL[c].take），
+        Python 层循环次数为 m×k，与字节长度 L 无关
+        """
+        left = np.asarray(left, dtype=np.uint8)
+        right = np.asarray(right, dtype=np.uint8)
+        result = np.zeros((left.shape[0], right.shape[1]), dtype=np.uint8)
+        for j in range(left.shape[1]):
+            row = right[j]
+            index = None
+            for i in range(left.shape[0]):
+                coeff = left[i, j]
+                if coeff == 0:
+                    continue
+                if coeff == 1:
+                    result[i] ^= row
+                    continue
+                if index is None:
+                    index = row.astype(np.intp)
+                result[i] ^= cls.MUL[coeff].take(index)
+        return result
+
+    @classmethod
+    def vandermonde(cls, xs: Sequence[int], k: int) -> np.ndarray:
+        """生成范德蒙矩阵 V[i, j] = xs[i]^j"""
+        xs = np.asarray(xs, dtype=np.int32)
+        powers = np.arange(k, dtype=np.int32)
+        exponents = (cls.LOG[xs][:, None] * powers[None, :]) % 255
+        matrix = cls.EXP[exponents]
+        matrix[:, 0] = 1
+        return matrix.astype(np.uint8)
+
+    @classmethod
+    def invert_matrix(cls, matrix: np.ndarray) -> np.ndarray:
+        """高斯-约当消元求方阵的逆（k 通常不超过 10，逐元素计算即可）"""
+        size = matrix.shape[0]
+        work = [
+            [int(value) for value in row] + [1 if i == j else 0 for j in range(size)] for i, row in enumerate(matrix)
+        ]
+
+        for col in range(size):
+            pivot = next((row for row in range(col, size) if work[row][col] != 0), None)
+            if pivot is None:
+                raise ValueError('矩阵不可逆')
+            work[col], work[pivot] = work[pivot], work[col]
+
+            pivot_inv = cls.inv(work[col][col])
+            work[col] = [cls.mul(value, pivot_inv) for value in work[col]]
+
+            for row in range(size):
+                factor = work[row][col]
+                if row != col and factor != 0:
+                    work[row] = [
+                        value ^ cls.mul(factor, pivot_value) for value, pivot_value in zip(work[row], work[col])
+                    ]
+
+        return np.array([row[size:] for row in work], dtype=np.uint8)
+
+    @classmethod
+    def lagrange_basis_at_zero(cls, xs: Sequence[int]) -> np.ndarray:
+        """
+        计算在 x=0 处的拉格朗日基 l_i(0) = Π_{j≠i} x_j / (x_i - x_j)
+
+        GF(2^8) 中减法即异或；结果按 x 坐标元组缓存在 LRU 中，返回只读数组
+        """
+        return _lagrange_basis_at_zero(tuple(int(x) for x in xs))
+
+    @classmethod
+    def lagrange_matrix(cls, from_xs: Sequence[int], to_xs: Sequence[int]) -> np.ndarray:
+        """
+        计算插值矩阵 M[i, j] = l_j(to_xs[i])，l_j 为以 from_xs 为节点的拉格朗日基
+
+        M · Y 即由 from_xs 处的取值求出同一多项式在 to_xs 处的取值；结果按坐标元组缓存，返回只读数组
+        """
+        return _lagrange_matrix(tuple(int(x) for x in from_xs), tuple(int(x) for x in to_xs))
+
+
+@lru_cache(maxsize=256)
+def _lagrange_matrix(from_xs: Tuple[int, ...], to_xs: Tuple[int, ...]) -> np.ndarray:
+    """插值矩阵的实际计算，按坐标元组缓存"""
+    if len(set(from_xs)) != len(from_xs):
+        raise ValueError('插值节点重复')
+
+    matrix = np.zeros((len(to_xs), len(from_xs)), dtype=np.uint8)
+    for j, xj in enumerate(from_xs):
+        denominator = 1
+        for m, xm in enumerate(from_xs):
+            if m != j:
+                denominator = GF256Util.mul(denominator, xj ^ xm)
+        denominator_inv = GF256Util.inv(denominator)
+        for i, x in enumerate(to_xs):
+            numerator = 1
+            for m, xm in enumerate(from_xs):
+                if m != j:
+                    numerator = GF256Util.mul(numerator, x ^ xm)
+            matrix[i, j] = GF256Util.mul(numerator, denominator_inv)
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=256)
+def _lagrange_basis_at_zero(xs: Tuple[int, ...]) -> np.ndarray:
+    """拉格朗日基的实际计算，按 x 坐标元组缓存"""
+    if len(set(xs)) != len(xs):
+        raise ValueError('分片的x坐标重复')
+    if any(x == 0 or x > 255 for x in xs):
+        raise ValueError('分片的x坐标必须在1-255之间')
+
+    basis = np.zeros(len(xs), dtype=np.uint8)
+    for i, xi in enumerate(xs):
+        numerator = 1
+        denominator = 1
+        for j, xj in enumerate(xs):
+            if i != j:
+                numerator = GF256Util.mul(numerator, xj)
+                denominator = GF256Util.mul(denominator, xi ^ xj)
+        basis[i] = GF256Util.mul(numerator, GF256Util.inv(denominator))
+    basis.setflags(write=False)
+    return basis
+
+
+class GF256SecretSharing:
+    """按字节的 Shamir 秘密共享（GF(256)），支持任意长度的秘密"""
+
+    SCHEME = ShareCodecUtil.SCHEME_SHAMIR_GF256
+    MAX_SHARES = 255
+
+    # 流式分割的默认块大小，内存占用约为 (n + k + 1) × 块大小，与载荷总大小无关
+    STREAM_CHUNK_SIZE = 1024 * 1024
+
+    @staticmethod
+    def _check_params(k: int, n: int):
+        """校验门限参数"""
+        if k < 1:
+            raise ValueError('阈值必须大于0')
+        if k > n:
+            raise ValueError('阈值不能大于总分片数')
+        if n > GF256SecretSharing.MAX_SHARES:
+            raise ValueError(f'总分片数不能超过{GF256SecretSharing.MAX_SHARES}')
+
+    @classmethod
+    def split(cls, secret: bytes, k: int, n: int) -> np.ndarray:
+        """
+        将字节串分割为 n 个分片
+
+        所有 x 点 × 所有字节在一次矩阵运算中求值：shares = V(n×k) · C(k×L)，
+        其中 C 的第 0 行为秘密本身，其余行为 CSPRNG 随机数池分发的随机系数
+
+        Args:
+            secret: 秘密字节串
+            k: 阈值
+            n: 总分片数
+
+        Returns:
+            形状为 (n, L) 的 uint8 数组，第 i 行为 x=i+1 处的分片
+        """
+        cls._check_params(k, n)
+        length = len(secret)
+
+        coefficients = np.empty((k, length), dtype=np.uint8)
+        coefficients[0] = np.frombuffer(secret, dtype=np.uint8)
+        if k > 1:
+            coefficients[1:] = RandomPoolUtil.default().random_array((k - 1, length))
+
+        xs = np.arange(1, n + 1)
+        return GF256Util.matmul(GF256Util.vandermonde(xs, k), coefficients)
+
+    @classmethod
+    def split_many(cls, payloads: Sequence[bytes], k: int, n: int) -> List[np.ndarray]:
+        """
+        批量分割多个秘密
+
+        每个字节拥有独立的多项式，因此所有载荷首尾相接打包进一个连续缓冲区即可，
+        无需填充；全部随机系数通过一次 CSPRNG 读取生成，所有多项式在一次矩阵运算中求值
+
+        Args:
+            payloads: 秘密字节串列表（长度可不同）
+            k: 阈值
+            n: 总分片数
+
+        Returns:
+            与 payloads 一一对应的 (n, L_i) uint8 数组列表（共享同一块内存的视图）
+        """
+        if not payloads:
+            return []
+
+        lengths = np.fromiter((len(payload) for payload in payloads), dtype=np.int64, count=len(payloads))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        packed = b''.join(payloads)
+
+        shares = cls.split(packed, k, n)
+        return [shares[:, offsets[i] : offsets[i + 1]] for i in range(len(payloads))]
+
+    @classmethod
+    def recover(cls, xs: Sequence[int], ys: np.ndarray) -> bytes:
+        """
+        由 k 个分片恢复秘密
+
+        拉格朗日基按排序后的 x 坐标集合缓存，恢复只需对每个字节列做一次点积
+
+        Args:
+            xs: 分片的 x 坐标
+            ys: 形状为 (k, L) 的 uint8 数组
+
+        Returns:
+            秘密字节串
+        """
+        order = np.argsort(xs, kind='stable')
+        basis = GF256Util.lagrange_basis_at_zero(np.asarray(xs)[order])
+        ys = np.asarray(ys, dtype=np.uint8)[order]
+        secret = GF256Util.matmul(basis[None, :], ys)
+        return secret[0].tobytes()
+
+    @classmethod
+    def recover_many(cls, items: Sequence[Tuple[Sequence[int], np.ndarray]]) -> List[bytes]:
+        """
+        批量恢复多个秘密
+
+        x 坐标集合相同的秘密共用同一组拉格朗日基，其分片按列拼接后一次求值
+
+        Args:
+            items: (xs, ys) 列表，ys 形状为 (k, L_i)
+
+        Returns:
+            与 items 一一对应的秘密字节串列表
+        """
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for index, (xs, _) in enumerate(items):
+            groups.setdefault(tuple(sorted(int(x) for x in xs)), []).append(index)
+
+        results: List[bytes] = [b''] * len(items)
+        for x_set, indices in groups.items():
+            columns = []
+            for index in indices:
+                xs, ys = items[index]
+                order = np.argsort(xs, kind='stable')
+                columns.append(np.asarray(ys, dtype=np.uint8)[order])
+
+            lengths = [column.shape[1] for column in columns]
+            basis = GF256Util.lagrange_basis_at_zero(x_set)
+            packed = GF256Util.matmul(basis[None, :], np.concatenate(columns, axis=1))[0]
+
+            offset = 0
+            for index, length in zip(indices, lengths):
+                results[index] = packed[offset : offset + length].tobytes()
+                offset += length
+        return results
+
+    @classmethod
+    def split_payload(cls, payload: bytes, k: int, n: int) -> List[bytes]:
+        """分割字节串秘密，返回二进制编码的分片"""
+        return cls._encode_shares(cls.split(payload, k, n), k, n)
+
+    @classmethod
+    def split_payloads(cls, payloads: Sequence[bytes], k: int, n: int) -> List[List[bytes]]:
+        """批量分割字节串秘密，返回每个秘密对应的二进制分片列表"""
+        return [cls._encode_shares(ys, k, n) for ys in cls.split_many(payloads, k, n)]
+
+    @classmethod
+    def split_secret(cls, secret: str, k: int, n: int) -> List[bytes]:
+        """分割字符串秘密，返回二进制编码的分片"""
+        return cls.split_payload(secret.encode('utf-8'), k, n)
+
+    @classmethod
+    def split_secrets(cls, secrets: Sequence[str], k: int, n: int) -> List[List[bytes]]:
+        """批量分割字符串秘密，返回每个秘密对应的二进制分片列表"""
+        return cls.split_payloads([secret.encode('utf-8') for secret in secrets], k, n)
+
+    @classmethod
+    def _encode_shares(cls, ys: np.ndarray, k: int, n: int) -> List[bytes]:
+        """将分片矩阵编码为二进制分片"""
+        return [ShareCodecUtil.encode(cls.SCHEME, k, n, i + 1, ys[i]) for i in range(n)]
+
+    @classmethod
+    def parse_share(cls, share: bytes) -> BinaryShare:
+        """解析二进制分片（零拷贝）"""
+        parsed = ShareCodecUtil.decode(share)
+        if parsed.scheme != cls.SCHEME:
+            raise ValueError('不支持的分片格式')
+        return parsed
+
+    @classmethod
+    def _parse_shares(cls, shares: Sequence[bytes]) -> Tuple[List[int], np.ndarray]:
+        """解析一组二进制分片，返回前 k 个分片的 x 坐标与分片矩阵"""
+        if not shares:
+            raise ValueError('分片列表为空')
+        return cls._stack_parsed([cls.parse_share(share) for share in shares])
+
+    @classmethod
+    def _stack_parsed(cls, parsed_shares: Sequence[BinaryShare]) -> Tuple[List[int], np.ndarray]:
+        """整理已解析的分片，返回前 k 个分片的 x 坐标与分片矩阵"""
+        if not parsed_shares:
+            raise ValueError('分片列表为空')
+        if any(share.scheme != cls.SCHEME for share in parsed_shares):
+            raise ValueError('不支持的分片格式')
+
+        k = parsed_shares[0].k
+        if len(parsed_shares) < k:
+            raise ValueError(f'分片数量不足，需要至少{k}个分片')
+
+        parsed_shares = parsed_shares[:k]
+        if len({share.payload.nbytes for share in parsed_shares}) != 1:
+            raise ValueError('分片长度不一致')
+
+        xs = [share.x for share in parsed_shares]
+        ys = np.stack([np.frombuffer(share.payload, dtype=np.uint8) for share in parsed_shares])
+        return xs, ys
+
+    @classmethod
+    def recover_payload(cls, shares: Sequence[bytes]) -> bytes:
+        """由二进制分片恢复字节串秘密"""
+        xs, ys = cls._parse_shares(shares)
+        return cls.recover(xs, ys)
+
+    @classmethod
+    def recover_parsed(cls, parsed_shares: Sequence[BinaryShare]) -> bytes:
+        """由已解析的分片恢复字节串秘密（用于一个分片内存放多条记录的场景）"""
+        xs, ys = cls._stack_parsed(parsed_shares)
+        return cls.recover(xs, ys)
+
+    @classmethod
+    def recover_payloads(cls, share_lists: Sequence[Sequence[bytes]]) -> List[bytes]:
+        """批量恢复字节串秘密，x 坐标集合相同的秘密共用一组拉格朗日基"""
+        return cls.recover_many([cls._parse_shares(shares) for shares in share_lists])
+
+    @classmethod
+    def recover_secret(cls, shares: Sequence[bytes]) -> str:
+        """由二进制分片恢复字符串秘密"""
+        return cls.recover_payload(shares).decode('utf-8')
+
+    @classmethod
+    def recover_secrets(cls, share_lists: Sequence[Sequence[bytes]]) -> List[str]:
+        """批量恢复字符串秘密，x 坐标集合相同的秘密共用一组拉格朗日基"""
+        return [secret.decode('utf-8') for secret in cls.recover_payloads(share_lists)]
+
+    @classmethod
+    def iter_split_stream(
+        cls, reader: BinaryIO, k: int, n: int, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[np.ndarray]:
+        """
+        按块分割输入流
+
+        Args:
+            reader: 二进制输入流
+            k: 阈值
+            n: 总分片数
+            chunk_size: 块大小
+
+        Yields:
+            每块对应的 (n, chunk) 分片矩阵
+        """
+        cls._check_params(k, n)
+        while True:
+            chunk = read_exact(reader, chunk_size)
+            if not chunk:
+                return
+            yield cls.split(chunk, k, n)
+
+    @classmethod
+    def split_stream(
+        cls, reader: BinaryIO, writers: Sequence[BinaryIO], k: int, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> int:
+        """
+        流式分割：输入流按块分割后直接写入 n 个输出流（文件、socket.makefile('wb') 等）
+
+        每个输出流由若干条带 CRC32 的分片记录组成，每块一条
+
+        Args:
+            reader: 二进制输入流
+            writers: n 个二进制输出流，第 i 个对应 x=i+1
+            k: 阈值
+            chunk_size: 块大小
+
+        Returns:
+            已处理的输入字节数
+        """
+        n = len(writers)
+        total = 0
+        for ys in cls.iter_split_stream(reader, k, n, chunk_size):
+            for i, writer in enumerate(writers):
+                row = memoryview(ys[i])
+                writer.write(ShareCodecUtil.encode_header(cls.SCHEME, k, n, i + 1, row))
+                writer.write(row)
+            total += ys.shape[1]
+        return total
+
+    @classmethod
+    def iter_reconstruct_stream(cls, readers: Sequence[BinaryIO]) -> Iterator[bytes]:
+        """
+        按块由分片流恢复秘密，只读取前 k 个输入流
+
+        Args:
+            readers: 至少 k 个分片输入流
+
+        Yields:
+            恢复出的秘密块
+        """
+        if not readers:
+            raise ValueError('分片列表为空')
+
+        first = ShareCodecUtil.read_record(readers[0])
+        if first is None:
+            return
+        k = first.k
+        if len(readers) < k:
+            raise ValueError(f'分片数量不足，需要至少{k}个分片')
+        readers = readers[:k]
+
+        records = [first] + [ShareCodecUtil.read_record(reader) for reader in readers[1:]]
+        while True:
+            if any(record is None for record in records):
+                raise ValueError('分片流长度不一致')
+            xs, ys = cls._stack_parsed(records)
+            yield cls.recover(xs, ys)
+
+            records = [ShareCodecUtil.read_record(reader) for reader in readers]
+            if all(record is None for record in records):
+                return
+
+    @classmethod
+    def reconstruct_stream(cls, readers: Sequence[BinaryIO], writer: BinaryIO) -> int:
+        """
+        流式恢复：由分片输入流恢复秘密并直接写入输出流
+
+        Returns:
+            写入的字节数
+        """
+        total = 0
+        for chunk in cls.iter_reconstruct_stream(readers):
+            writer.write(chunk)
+            total += len(chunk)
+        return total
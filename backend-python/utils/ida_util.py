@@ -0,0 +1,129 @@
+"""
+信息分散算法（Rabin IDA）工具类
+在GF(256)上将数据编码为 n 个分片，每个分片约为 |data|/k，任意 k 个分片即可还原
+"""
+
+import struct
+
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from utils.gf256_util import GF256Util
+from utils.share_codec_util import BinaryShare, ShareCodecUtil
+
+# 数据前置4字节长度，用于去除还原后的填充
+_LENGTH_PREFIX = struct.Struct('>I')
+
+
+class IDAUtil:
+    """Rabin 信息分散算法"""
+
+    SCHEME = ShareCodecUtil.SCHEME_IDA_GF256
+    MAX_FRAGMENTS = 255
+
+    @staticmethod
+    def _check_params(k: int, n: int):
+        """校验分散参数"""
+        if k < 1:
+            raise ValueError('阈值必须大于0')
+        if k > n:
+            raise ValueError('阈值不能大于总分片数')
+        if n > IDAUtil.MAX_FRAGMENTS:
+            raise ValueError(f'总分片数不能超过{IDAUtil.MAX_FRAGMENTS}')
+
+    @classmethod
+    def disperse(cls, data: bytes, k: int, n: int) -> np.ndarray:
+        """
+        将数据分散为 n 个分片
+
+        数据（含长度前缀）按行切成 k 段组成矩阵 D(k×m)，分片 F = V(n×k) · D，
+        V 为 x=1..n 的范德蒙矩阵，任意 k 行线性无关
+
+        Args:
+            data: 原始数据
+            k: 还原所需分片数
+            n: 总分片数
+
+        Returns:
+            形状为 (n, m) 的 uint8 数组，m = ceil((len(data) + 4) / k)
+        """
+        cls._check_params(k, n)
+        framed_length = _LENGTH_PREFIX.size + len(data)
+        stripe = -(-framed_length // k)
+
+        buffer = np.zeros(k * stripe, dtype=np.uint8)
+        _LENGTH_PREFIX.pack_into(buffer, 0, len(data))
+        buffer[_LENGTH_PREFIX.size : framed_length] = np.frombuffer(data, dtype=np.uint8)
+
+        matrix = GF256Util.vandermonde(np.arange(1, n + 1), k)
+        return GF256Util.matmul(matrix, buffer.reshape(k, stripe))
+
+    @classmethod
+    def reconstruct(cls, xs: Sequence[int], fragments: np.ndarray) -> bytes:
+        """
+        由任意 k 个分片还原数据
+
+        Args:
+            xs: 分片的 x 坐标（长度为 k）
+            fragments: 形状为 (k, m) 的 uint8 数组
+
+        Returns:
+            原始数据
+        """
+        inverse = _inverse_vandermonde(tuple(int(x) for x in xs))
+        buffer = GF256Util.matmul(inverse, np.asarray(fragments, dtype=np.uint8)).reshape(-1)
+
+        (length,) = _LENGTH_PREFIX.unpack_from(buffer)
+        if length > buffer.size - _LENGTH_PREFIX.size:
+            raise ValueError('分片数据损坏，长度前缀无效')
+        return buffer[_LENGTH_PREFIX.size : _LENGTH_PREFIX.size + length].tobytes()
+
+    @classmethod
+    def disperse_payload(cls, data: bytes, k: int, n: int) -> List[bytes]:
+        """分散数据，返回二进制编码的分片"""
+        fragments = cls.disperse(data, k, n)
+        return [ShareCodecUtil.encode(cls.SCHEME, k, n, i + 1, fragments[i]) for i in range(n)]
+
+    @classmethod
+    def reconstruct_payload(cls, shares: Sequence[bytes]) -> bytes:
+        """由二进制编码的分片还原数据"""
+        parsed = [ShareCodecUtil.decode(share) for share in shares]
+        return cls.reconstruct_parsed(parsed)
+
+    @classmethod
+    def reconstruct_parsed(cls, parsed: Sequence[BinaryShare]) -> bytes:
+        """由已解析的分片还原数据"""
+        if not parsed:
+            raise ValueError('分片列表为空')
+        if any(share.scheme != cls.SCHEME for share in parsed):
+            raise ValueError('不支持的分片格式')
+
+        k = parsed[0].k
+        if len(parsed) < k:
+            raise ValueError(f'分片数量不足，需要至少{k}个分片')
+
+        parsed = parsed[:k]
+        if len({share.payload.nbytes for share in parsed}) != 1:
+            raise ValueError('分片长度不一致')
+
+        xs, fragments = _stack(parsed)
+        return cls.reconstruct(xs, fragments)
+
+
+def _stack(parsed: Sequence[BinaryShare]) -> Tuple[List[int], np.ndarray]:
+    """将已解析分片整理为 x 坐标列表与分片矩阵"""
+    xs = [share.x for share in parsed]
+    fragments = np.stack([np.frombuffer(share.payload, dtype=np.uint8) for share in parsed])
+    return xs, fragments
+
+
+@lru_cache(maxsize=256)
+def _inverse_vandermonde(xs: Tuple[int, ...]) -> np.ndarray:
+    """按 x 坐标元组缓存范德蒙子矩阵的逆"""
+    if len(set(xs)) != len(xs):
+        raise ValueError('分片的x坐标重复')
+    inverse = GF256Util.invert_matrix(GF256Util.vandermonde(xs, len(xs)))
+    inverse.setflags(write=False)
+    return inverse
@@ -0,0 +1,140 @@
+"""
+Merkle树工具类
+对一个批次的分片构建Merkle树：整批校验只需顺序流式计算根哈希，单个分片用 O(log n) 的证明校验
+"""
+
+import hashlib
+
+from typing import List, Sequence, Tuple
+
+# 叶子与内部节点使用不同前缀，防止第二原像攻击
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+
+# 证明中每一步：兄弟节点方向(1) + 兄弟节点哈希(32)
+_SIBLING_LEFT = 0
+_SIBLING_RIGHT = 1
+_STEP_SIZE = 1 + hashlib.sha256().digest_size
+
+
+class MerkleRootBuilder:
+    """
+    流式计算Merkle根
+
+    只保存每一层尚未配对的子树根，内存占用为 O(log n)，叶子按顺序逐个加入
+    """
+
+    def __init__(self):
+        self._stack: List[Tuple[int, bytes]] = []
+        self.count = 0
+
+    def add(self, leaf: bytes):
+        """加入一个叶子哈希"""
+        level, node = 0, leaf
+        while self._stack and self._stack[-1][0] == level:
+            _, left = self._stack.pop()
+            node = MerkleUtil.node_hash(left, node)
+            level += 1
+        self._stack.append((level, node))
+        self.count += 1
+
+    def root(self) -> bytes:
+        """当前已加入叶子的Merkle根"""
+        if not self._stack:
+            raise ValueError('Merkle树没有叶子')
+        node = self._stack[-1][1]
+        for _, left in reversed(self._stack[:-1]):
+            node = MerkleUtil.node_hash(left, node)
+        return node
+
+
+class MerkleUtil:
+    """
+    Merkle树（SHA-256）
+
+    叶子哈希为 H(0x00 || 数据)，内部节点为 H(0x01 || 左 || 右)，某一层节点数为奇数时最后一个节点直接提升到上一层，
+    与 merklelib 的构造方式一致；证明编码为若干个 (兄弟方向, 兄弟哈希) 步骤，被提升的层不占步骤
+    """
+
+    @staticmethod
+    def leaf_hash(data: bytes) -> bytes:
+        """叶子哈希"""
+        return hashlib.sha256(_LEAF_PREFIX + data).digest()
+
+    @staticmethod
+    def node_hash(left: bytes, right: bytes) -> bytes:
+        """内部节点哈希"""
+        return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+    @classmethod
+    def shard_leaf(cls, shard_id: str, checksum: str) -> bytes:
+        """分片的叶子哈希，同时绑定分片ID与分片数据的SHA-256校验和，分片被替换或挪用都会改变根哈希"""
+        return cls.leaf_hash(f'{shard_id}:{checksum}'.encode('utf-8'))
+
+    @staticmethod
+    def root(leaves: Sequence[bytes]) -> bytes:
+        """计算一组叶子哈希的Merkle根"""
+        builder = MerkleRootBuilder()
+        for leaf in leaves:
+            builder.add(leaf)
+        return builder.root()
+
+    @classmethod
+    def build(cls, leaves: Sequence[bytes]) -> Tuple[bytes, List[bytes]]:
+        """
+        构建Merkle树
+
+        Args:
+            leaves: 按顺序排列的叶子哈希
+
+        Returns:
+            (根哈希, 每个叶子的编码证明)
+        """
+        if not leaves:
+            raise ValueError('Merkle树没有叶子')
+
+        levels = [list(leaves)]
+        while len(levels[-1]) > 1:
+            nodes = levels[-1]
+            parents = [cls.node_hash(nodes[i], nodes[i + 1]) for i in range(0, len(nodes) - 1, 2)]
+            if len(nodes) % 2:
+                parents.append(nodes[-1])
+            levels.append(parents)
+
+        proofs = []
+        for index in range(len(leaves)):
+            steps = []
+            position = index
+            for nodes in levels[:-1]:
+                sibling = position ^ 1
+                if sibling < len(nodes):
+                    side = _SIBLING_LEFT if sibling < position else _SIBLING_RIGHT
+                    steps.append(bytes((side,)) + nodes[sibling])
+                position //= 2
+            proofs.append(b''.join(steps))
+        return levels[-1][0], proofs
+
+    @staticmethod
+    def decode_proof(proof: bytes) -> List[Tuple[str, bytes]]:
+        """解析编码证明为 [(兄弟方向 'left'/'right', 兄弟哈希)]"""
+        if len(proof) % _STEP_SIZE:
+            raise ValueError('Merkle证明长度无效')
+        steps = []
+        for offset in range(0, len(proof), _STEP_SIZE):
+            side = proof[offset]
+            if side not in (_SIBLING_LEFT, _SIBLING_RIGHT):
+                raise ValueError('Merkle证明格式无效')
+            steps.append(('left' if side == _SIBLING_LEFT else 'right', proof[offset + 1 : offset + _STEP_SIZE]))
+        return steps
+
+    @classmethod
+    def verify_proof(cls, leaf: bytes, proof: bytes, root: bytes) -> bool:
+        """用证明从叶子哈希逐层计算到根，与给定根哈希比较"""
+        try:
+            steps = cls.decode_proof(proof)
+        except ValueError:
+            return False
+        node = leaf
+        for side, sibling in steps:
+            node = cls.node_hash(sibling, node) if side == 'left' else cls.node_hash(node, sibling)
+        return node == root
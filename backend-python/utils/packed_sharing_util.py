@@ -0,0 +1,196 @@
+"""
+打包秘密共享（Packed Secret Sharing）工具类
+在GF(256)上将多个秘密嵌入同一个多项式的不同求值点，一批字段值只产生 n 个分片
+"""
+
+import struct
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from utils.gf256_util import GF256Util
+from utils.random_pool_util import RandomPoolUtil
+from utils.share_codec_util import BinaryShare, ShareCodecUtil
+
+# 值序列的帧格式：数量(4) + 每个值的长度(4) + 值
+_UINT32 = struct.Struct('>I')
+
+
+class PackedSharingUtil:
+    """
+    打包秘密共享
+
+    每个多项式次数为 k + l - 2，在 l 个秘密点取值为 l 个秘密字节，在 k - 1 个随机点取值为随机字节，
+    分片为多项式在 x=1..n 处的取值。任意 k - 1 个分片不泄露任何秘密，恢复需要 k + l - 1 个分片。
+    秘密点与随机点取 x=255 向下的连续坐标，因此要求 n + k + l - 1 <= 255
+
+    一批字段值编码为一个字节流后均分为 l 路，每一列 l 个字节共用一个多项式，
+    每个分片大小约为 (字段总字节数 + 帧开销) / l
+    """
+
+    SCHEME = ShareCodecUtil.SCHEME_PACKED_GF256
+    MAX_POINTS = 255
+
+    @classmethod
+    def threshold(cls, k: int, pack_size: int) -> int:
+        """恢复所需的分片数"""
+        return k + pack_size - 1
+
+    @classmethod
+    def _check_params(cls, k: int, n: int, pack_size: int):
+        """校验打包参数"""
+        if k < 1:
+            raise ValueError('阈值必须大于0')
+        if pack_size < 1:
+            raise ValueError('打包数量必须大于0')
+        if cls.threshold(k, pack_size) > n:
+            raise ValueError('阈值与打包数量之和减1不能大于总分片数')
+        if n + cls.threshold(k, pack_size) > cls.MAX_POINTS:
+            raise ValueError(f'总分片数与恢复阈值之和不能超过{cls.MAX_POINTS}')
+
+    @staticmethod
+    def _secret_points(pack_size: int) -> Tuple[int, ...]:
+        """秘密所在的求值点"""
+        return tuple(range(255, 255 - pack_size, -1))
+
+    @staticmethod
+    def _anchor_points(k: int, pack_size: int) -> Tuple[int, ...]:
+        """确定多项式的全部节点：秘密点在前，随机点在后"""
+        return tuple(range(255, 255 - (k + pack_size - 1), -1))
+
+    @staticmethod
+    def _frame(values: Sequence[bytes]) -> bytes:
+        """将值序列编码为单个字节流"""
+        parts = [_UINT32.pack(len(values))]
+        for value in values:
+            parts.append(_UINT32.pack(len(value)))
+            parts.append(value)
+        return b''.join(parts)
+
+    @staticmethod
+    def _unframe(data: bytes) -> List[bytes]:
+        """解析字节流中的值序列（忽略末尾填充）"""
+        view = memoryview(data)
+        (count,) = _UINT32.unpack_from(view, 0)
+        offset = _UINT32.size
+        values = []
+        for _ in range(count):
+            if offset + _UINT32.size > len(view):
+                raise ValueError('分片数据损坏，字段帧无效')
+            (length,) = _UINT32.unpack_from(view, offset)
+            offset += _UINT32.size
+            if offset + length > len(view):
+                raise ValueError('分片数据损坏，字段帧无效')
+            values.append(bytes(view[offset : offset + length]))
+            offset += length
+        return values
+
+    @classmethod
+    def split(cls, values: Sequence[bytes], k: int, n: int, pack_size: int) -> np.ndarray:
+        """
+        将一批值打包分割为 n 个分片
+
+        Args:
+            values: 待分割的值（长度可不同）
+            k: 阈值，少于 k 个分片不泄露任何信息
+            n: 总分片数
+            pack_size: 每个多项式打包的秘密数量 l
+
+        Returns:
+            形状为 (n, L) 的 uint8 数组，第 i 行为 x=i+1 处的分片，L = ceil(帧长度 / l)
+        """
+        cls._check_params(k, n, pack_size)
+        framed = cls._frame(values)
+        width = -(-len(framed) // pack_size)
+
+        secrets = np.zeros(pack_size * width, dtype=np.uint8)
+        secrets[: len(framed)] = np.frombuffer(framed, dtype=np.uint8)
+        return cls.split_secrets(secrets.reshape(pack_size, width), k, n)
+
+    @classmethod
+    def split_secrets(cls, secrets: np.ndarray, k: int, n: int) -> np.ndarray:
+        """
+        将秘密矩阵打包分割为 n 个分片
+
+        Args:
+            secrets: 形状为 (l, L) 的 uint8 数组，每一列的 l 个字节共用一个多项式
+            k: 阈值
+            n: 总分片数
+
+        Returns:
+            形状为 (n, L) 的 uint8 数组，第 i 行为 x=i+1 处的分片
+        """
+        pack_size, width = secrets.shape
+        cls._check_params(k, n, pack_size)
+
+        anchors = np.empty((k + pack_size - 1, width), dtype=np.uint8)
+        anchors[:pack_size] = secrets
+        if k > 1:
+            anchors[pack_size:] = RandomPoolUtil.default().random_array((k - 1, width))
+
+        matrix = GF256Util.lagrange_matrix(cls._anchor_points(k, pack_size), range(1, n + 1))
+        return GF256Util.matmul(matrix, anchors)
+
+    @classmethod
+    def secret_basis(cls, xs: Sequence[int], pack_size: int) -> np.ndarray:
+        """由 xs 处的分片求各秘密点取值的插值矩阵，形状为 (l, len(xs))，秘密矩阵 = 插值矩阵 · 分片矩阵"""
+        return GF256Util.lagrange_matrix(xs, cls._secret_points(pack_size))
+
+    @classmethod
+    def recover(cls, xs: Sequence[int], ys: np.ndarray, pack_size: int) -> List[bytes]:
+        """
+        由 k + l - 1 个分片恢复全部值
+
+        Args:
+            xs: 分片的 x 坐标
+            ys: 形状为 (k + l - 1, L) 的 uint8 数组
+            pack_size: 打包数量 l
+
+        Returns:
+            值列表
+        """
+        if len(set(xs)) != len(xs):
+            raise ValueError('分片的x坐标重复')
+        secrets = GF256Util.matmul(cls.secret_basis(xs, pack_size), np.asarray(ys, dtype=np.uint8))
+        return cls._unframe(secrets.tobytes())
+
+    @classmethod
+    def split_values(cls, values: Sequence[bytes], k: int, n: int, pack_size: int) -> List[bytes]:
+        """
+        打包分割，返回二进制编码的分片
+
+        头部 k 字段记录恢复阈值 k + l - 1，载荷首字节记录打包数量 l
+        """
+        ys = cls.split(values, k, n, pack_size)
+        threshold = cls.threshold(k, pack_size)
+        prefix = bytes((pack_size,))
+        return [ShareCodecUtil.encode(cls.SCHEME, threshold, n, i + 1, prefix + ys[i].tobytes()) for i in range(n)]
+
+    @classmethod
+    def recover_values(cls, shares: Sequence[bytes]) -> List[bytes]:
+        """由二进制编码的分片恢复全部值"""
+        return cls.recover_parsed([ShareCodecUtil.decode(share) for share in shares])
+
+    @classmethod
+    def recover_parsed(cls, parsed: Sequence[BinaryShare]) -> List[bytes]:
+        """由已解析的分片恢复全部值"""
+        if not parsed:
+            raise ValueError('分片列表为空')
+        if any(share.scheme != cls.SCHEME for share in parsed):
+            raise ValueError('不支持的分片格式')
+
+        threshold = parsed[0].k
+        if len(parsed) < threshold:
+            raise ValueError(f'分片数量不足，需要至少{threshold}个分片')
+
+        parsed = parsed[:threshold]
+        if len({share.payload.nbytes for share in parsed}) != 1:
+            raise ValueError('分片长度不一致')
+        if len({share.payload[0] for share in parsed}) != 1:
+            raise ValueError('分片打包参数不一致')
+
+        pack_size = parsed[0].payload[0]
+        xs = [share.x for share in parsed]
+        ys = np.stack([np.frombuffer(share.payload[1:], dtype=np.uint8) for share in parsed])
+        return cls.recover(xs, ys, pack_size)
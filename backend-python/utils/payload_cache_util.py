@@ -0,0 +1,186 @@
+"""
+载荷缓存工具类
+按字节数限制容量的LRU缓存，条目带有效期，可使用进程内随机密钥加密缓存内容
+"""
+
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, NamedTuple, Optional, Set, Tuple
+
+from config.settings import settings
+from utils.crypto_util import CryptoUtil
+
+
+class _Entry(NamedTuple):
+    value: bytes
+    expires_at: float
+    tags: Tuple[Hashable, ...]
+
+
+class PayloadCacheUtil:
+    """
+    字节载荷的LRU缓存
+
+    - 容量按载荷字节数计算，超出 max_bytes 时淘汰最久未使用的条目，单个超过容量的载荷不缓存
+    - 条目在 ttl 秒后过期，读取时惰性清理
+    - 条目可关联标签，按标签批量失效（例如同一订单的所有缓存条目）
+    - encrypt=True 时以进程内随机生成的密钥进行 AES-GCM 加密，键作为附加认证数据，
+      密钥只存在于内存中，fork 出的子进程会清空缓存并重新生成密钥
+    - 线程安全；命中、未命中、淘汰、过期与失效次数可通过 stats() 导出
+    """
+
+    _default: Optional['PayloadCacheUtil'] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int, ttl: float, encrypt: bool = False, enabled: bool = True):
+        """
+        Args:
+            max_bytes: 缓存载荷的总字节数上限
+            ttl: 条目有效期（秒）
+            encrypt: 是否加密缓存内容
+            enabled: 关闭时 get 总是未命中，put 不缓存
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.encrypt = encrypt
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """清空缓存与统计，重新生成加密密钥"""
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._tag_index: Dict[Hashable, Set[Hashable]] = {}
+        self._bytes = 0
+        self._key = os.urandom(32) if self.encrypt else None
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    @staticmethod
+    def _associated_data(key: Hashable) -> bytes:
+        return repr(key).encode('utf-8')
+
+    def _remove(self, key: Hashable) -> Optional[_Entry]:
+        """在持有锁时调用：移除条目及其标签索引"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= len(entry.value)
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        return entry
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """读取缓存，未命中或已过期时返回None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            value, cache_key = entry.value, self._key
+        if cache_key is None:
+            return value
+        return CryptoUtil.decrypt_aes_gcm(value, cache_key, self._associated_data(key))
+
+    def put(self, key: Hashable, value: bytes, tags: Iterable[Hashable] = ()):
+        """写入缓存（同一个键的旧条目被替换）"""
+        if not self.enabled:
+            return
+        cache_key = self._key
+        if cache_key is not None:
+            value = CryptoUtil.encrypt_aes_gcm(value, cache_key, self._associated_data(key))
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            if cache_key is not self._key:
+                # fork 后密钥已更换，丢弃用旧密钥加密的数据
+                return
+            self._remove(key)
+            entry = _Entry(value, time.monotonic() + self.ttl, tuple(tags))
+            self._entries[key] = entry
+            self._bytes += len(value)
+            for tag in entry.tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """使单个条目失效"""
+        with self._lock:
+            removed = self._remove(key) is not None
+            if removed:
+                self._counters['invalidations'] += 1
+            return removed
+
+    def invalidate_tags(self, tags: Iterable[Hashable]) -> int:
+        """使关联了任一标签的条目失效，返回失效的条目数"""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self._counters['invalidations'] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """清空缓存（保留统计）"""
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """缓存统计"""
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hit_ratio': self._counters['hits'] / lookups if lookups else 0.0,
+            }
+
+    @classmethod
+    def default(cls) -> 'PayloadCacheUtil':
+        """进程内共享的解密订单缓存，按 DECRYPT_CACHE_* 设置创建"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls(
+                        max_bytes=settings.DECRYPT_CACHE_MAX_BYTES,
+                        ttl=settings.DECRYPT_CACHE_TTL_SECONDS,
+                        encrypt=settings.DECRYPT_CACHE_ENCRYPT,
+                        enabled=settings.DECRYPT_CACHE_ENABLED,
+                    )
+        return cls._default
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        """fork 后子进程中的回调：清空继承的缓存并更换密钥"""
+        cls._default_lock = threading.Lock()
+        if cls._default is not None:
+            cls._default._lock = threading.Lock()
+            cls._default._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=PayloadCacheUtil._after_fork_in_child)
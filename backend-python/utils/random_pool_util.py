@@ -0,0 +1,147 @@
+"""
+批量CSPRNG随机数池工具类
+以大块 os.urandom 读取填充 NumPy 缓冲区，按批次分发随机系数，后台线程预先填充下一块
+"""
+
+import math
+import os
+import threading
+import weakref
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+
+
+class RandomPoolUtil:
+    """
+    缓冲的CSPRNG随机数池
+
+    - 双缓冲：当前块用尽时切换到后台线程已填充好的下一块，并立即开始填充新的下一块
+    - 分发的随机数只被使用一次，每块都是新读取的 os.urandom 数据，块不会被复用
+    - 超过块大小的请求直接读取 os.urandom，不经过缓冲
+    - 线程安全；fork 出的子进程会清空继承的缓冲区，避免父子进程得到相同的随机数，
+      spawn 方式启动的进程池工作进程各自创建独立的池
+    """
+
+    _default: Optional['RandomPoolUtil'] = None
+    _default_lock = threading.Lock()
+    _instances: 'weakref.WeakSet[RandomPoolUtil]' = weakref.WeakSet()
+
+    def __init__(self, block_size: Optional[int] = None, background_refill: bool = True):
+        """
+        Args:
+            block_size: 每次从 os.urandom 读取的字节数，默认取 RANDOM_POOL_BLOCK_SIZE
+            background_refill: 是否在后台线程中预先填充下一块
+        """
+        self.block_size = block_size or settings.RANDOM_POOL_BLOCK_SIZE
+        self.background_refill = background_refill
+        self._lock = threading.Lock()
+        self._reset()
+        RandomPoolUtil._instances.add(self)
+
+    def _reset(self):
+        """清空缓冲区（初始化及 fork 后的子进程中调用）"""
+        self._pid = os.getpid()
+        self._current = np.empty(0, dtype=np.uint8)
+        self._offset = 0
+        self._next: Optional[np.ndarray] = None
+        self._refilling = False
+
+    def _read_block(self) -> np.ndarray:
+        return np.frombuffer(os.urandom(self.block_size), dtype=np.uint8)
+
+    def _refill_next(self):
+        """后台线程：填充下一块"""
+        block = self._read_block()
+        with self._lock:
+            if self._pid == os.getpid() and self._next is None:
+                self._next = block
+            self._refilling = False
+
+    def _schedule_refill(self):
+        """在持有锁时调用，按需启动后台填充"""
+        if not self.background_refill or self._refilling or self._next is not None:
+            return
+        self._refilling = True
+        threading.Thread(target=self._refill_next, name='random-pool-refill', daemon=True).start()
+
+    def _take(self, size: int) -> np.ndarray:
+        """取出 size 个随机字节（只读视图，调用方不得修改）"""
+        if size > self.block_size:
+            return np.frombuffer(os.urandom(size), dtype=np.uint8)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            if self._current.size - self._offset < size:
+                if self._next is not None:
+                    self._current, self._next = self._next, None
+                else:
+                    self._current = self._read_block()
+                self._offset = 0
+                self._schedule_refill()
+
+            chunk = self._current[self._offset : self._offset + size]
+            self._offset += size
+            return chunk
+
+    def random_bytes(self, size: int) -> bytes:
+        """获取 size 个随机字节"""
+        return self._take(size).tobytes()
+
+    def random_array(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        获取指定形状的 uint8 随机数组（只读），用于一次生成整批多项式的随机系数
+        """
+        return self._take(math.prod(shape)).reshape(shape)
+
+    def randbelow_many(self, bound: int, count: int) -> List[int]:
+        """
+        生成 count 个 [0, bound) 内均匀分布的随机整数
+
+        按 bound 的位数截取随机字节后拒绝采样，每批按期望接受率多取一些字节，减少循环次数
+        """
+        if bound <= 0:
+            raise ValueError('上界必须大于0')
+        if count <= 0:
+            return []
+
+        bits = bound.bit_length()
+        width = (bits + 7) // 8
+        mask = (1 << bits) - 1
+        results: List[int] = []
+        while len(results) < count:
+            missing = count - len(results)
+            batch = missing + (missing >> 1) + 1
+            data = self._take(batch * width).tobytes()
+            for offset in range(0, batch * width, width):
+                value = int.from_bytes(data[offset : offset + width], 'big') & mask
+                if value < bound:
+                    results.append(value)
+                    if len(results) == count:
+                        break
+        return results
+
+    @classmethod
+    def default(cls) -> 'RandomPoolUtil':
+        """获取进程内共享的默认随机数池"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        """fork 后子进程中的回调：清空所有池的缓冲区，并重建锁（父进程的锁可能处于持有状态）"""
+        cls._default_lock = threading.Lock()
+        for pool in list(cls._instances):
+            pool._lock = threading.Lock()
+            pool._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=RandomPoolUtil._after_fork_in_child)
@@ -0,0 +1,196 @@
+"""
+分片重分享（proactive re-sharing）工具类
+不恢复秘密，将一组 (k, n) 分片转换为新的 (k', n') 分片，或在 k、n 不变时刷新分片
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.feldman_util import FeldmanVSSUtil
+from utils.gf256_util import GF256SecretSharing, GF256Util
+from utils.ida_util import IDAUtil
+from utils.packed_sharing_util import PackedSharingUtil
+from utils.share_codec_util import BinaryShare, ShareCodecUtil
+
+
+class ReshareUtil:
+    """
+    线性重分享协议（Desmedt-Jajodia）
+
+    1. 每个原持有者 i 只对自己的分片 s_i 做一次 (k', n') 秘密共享，得到子分片 s_ij，发送给新持有者 j
+    2. 新持有者 j 以原分片坐标的拉格朗日基 λ_i 合并：s'_j = Σ λ_i · s_ij
+
+    由于 Σ λ_i · s_i = s，新分片位于常数项为 s 的 k'-1 次多项式上，整个过程不出现秘密本身。
+    GF(256) 分片与 Feldman 分片均适用；Feldman 分片的子分片附带承诺，新持有者可校验
+    子分片与原承诺一致，新承诺由子承诺按 λ_i 合并得到。
+    打包分片有 l 个秘密点，各秘密点的拉格朗日基不同：原持有者按自己在每个秘密点的基 λ_im 构造 l 个秘密
+    λ_im · s_i 并做 (k', n') 打包子共享，新持有者直接相加子分片，打包数量 l 保持不变
+    """
+
+    @classmethod
+    def gf256_subshares(cls, share: BinaryShare, k_new: int, n_new: int) -> np.ndarray:
+        """原持有者：对自己的GF(256)分片做子共享，返回 (n', L) 子分片矩阵"""
+        return GF256SecretSharing.split(bytes(share.payload), k_new, n_new)
+
+    @classmethod
+    def gf256_combine(cls, xs_old: Sequence[int], subshares: Sequence[np.ndarray]) -> np.ndarray:
+        """新持有者（批量）：按拉格朗日基合并子分片，返回 (n', L) 新分片矩阵"""
+        basis = GF256Util.lagrange_basis_at_zero(xs_old).reshape(1, -1)
+        n_new, length = subshares[0].shape
+        stacked = np.stack(subshares).reshape(len(subshares), n_new * length)
+        return GF256Util.matmul(basis, stacked).reshape(n_new, length)
+
+    @classmethod
+    def packed_subshares(cls, share: BinaryShare, xs_old: Sequence[int], k_new: int, n_new: int) -> np.ndarray:
+        """原持有者：以自己分片在各秘密点的加权值为秘密做打包子共享，返回 (n', L) 子分片矩阵"""
+        pack_size = share.payload[0]
+        weights = PackedSharingUtil.secret_basis(xs_old, pack_size)[:, list(xs_old).index(share.x)]
+        ys = np.frombuffer(share.payload[1:], dtype=np.uint8)
+        secrets = GF256Util.matmul(weights.reshape(-1, 1), ys.reshape(1, -1))
+        return PackedSharingUtil.split_secrets(secrets, k_new, n_new)
+
+    @classmethod
+    def packed_combine(cls, subshares: Sequence[np.ndarray]) -> np.ndarray:
+        """新持有者（批量）：子分片逐字节相加（GF(256)中加法即异或），返回 (n', L) 新分片矩阵"""
+        return np.bitwise_xor.reduce(np.stack(subshares), axis=0)
+
+    @classmethod
+    def feldman_subshares(cls, share: BinaryShare, k_new: int, n_new: int) -> Tuple[List[int], List[int]]:
+        """原持有者：对自己的Feldman分片做子共享，返回 (子分片值, 子承诺)"""
+        _, y = FeldmanVSSUtil.parse_share(share)
+        return FeldmanVSSUtil.split(y, k_new, n_new)
+
+    @classmethod
+    def feldman_combine(
+        cls,
+        xs_old: Sequence[int],
+        commitments: Sequence[int],
+        sub_values: Sequence[Sequence[int]],
+        sub_commitments: Sequence[Sequence[int]],
+    ) -> Tuple[List[int], List[int]]:
+        """
+        新持有者（批量）：校验并合并Feldman子分片
+
+        Args:
+            xs_old: 原分片坐标
+            commitments: 原承诺
+            sub_values: 每个原持有者发出的子分片值
+            sub_commitments: 每个原持有者发布的子承诺
+
+        Returns:
+            (新分片值, 新承诺)
+        """
+        # 子承诺常数项必须等于原分片的公开值，保证原持有者共享的确实是自己的分片
+        for x, sub_commitment in zip(xs_old, sub_commitments):
+            if sub_commitment[0] != FeldmanVSSUtil.public_share(x, commitments):
+                raise ValueError(f'分片 x={x} 的子承诺与原承诺不一致')
+
+        items = [
+            (j, values[j - 1], tuple(sub_commitment))
+            for values, sub_commitment in zip(sub_values, sub_commitments)
+            for j in range(1, len(values) + 1)
+        ]
+        if not FeldmanVSSUtil.batch_verify(items):
+            raise ValueError('子分片与子承诺不一致')
+
+        basis = FeldmanVSSUtil.lagrange_basis_at_zero(xs_old)
+        n_new = len(sub_values[0])
+        values = [
+            sum(weight * sub[j] for weight, sub in zip(basis, sub_values)) % FeldmanVSSUtil.Q for j in range(n_new)
+        ]
+        new_commitments = [
+            FeldmanVSSUtil.multi_pow([sub[t] for sub in sub_commitments], basis) for t in range(len(sub_commitments[0]))
+        ]
+        return values, new_commitments
+
+    @classmethod
+    def reshare_shards(
+        cls, shards: Sequence[bytes], commitments: Optional[bytes], k_new: int, n_new: int
+    ) -> Tuple[List[bytes], Optional[bytes]]:
+        """
+        重分享一个订单的分片
+
+        每个分片的首条记录（订单载荷或数据密钥分片）按线性协议重分享；分散模式的第二条记录为公开的
+        密文分片，由任意 k 个分片还原密文后按 (k', n') 重新分散，同样无需解密。
+        打包分片保持原打包数量 l，新分片头部的阈值为恢复所需的 k' + l - 1
+
+        Args:
+            shards: 至少 k 个原分片
+            commitments: 原Feldman承诺（直接共享模式为None）
+            k_new: 新阈值
+            n_new: 新总分片数
+
+        Returns:
+            (n' 个新分片, 新承诺)
+        """
+        records = [ShareCodecUtil.decode_all(shard) for shard in shards]
+        if not records:
+            raise ValueError('分片列表为空')
+
+        k_old = records[0][0].k
+        if len(records) < k_old:
+            raise ValueError(f'分片数量不足，需要至少{k_old}个分片')
+        records = records[:k_old]
+
+        key_shares = [record[0] for record in records]
+        xs_old = [share.x for share in key_shares]
+        scheme = key_shares[0].scheme
+        if any(share.scheme != scheme for share in key_shares):
+            raise ValueError('分片格式不一致')
+
+        new_commitments = None
+        if scheme == FeldmanVSSUtil.SCHEME:
+            if commitments is None:
+                raise ValueError('缺少Feldman承诺')
+            dealt = [cls.feldman_subshares(share, k_new, n_new) for share in key_shares]
+            values, combined = cls.feldman_combine(
+                xs_old,
+                FeldmanVSSUtil.decode_commitments(commitments),
+                [sub_values for sub_values, _ in dealt],
+                [sub_commitments for _, sub_commitments in dealt],
+            )
+            new_shares = FeldmanVSSUtil.encode_shares(values, k_new, n_new)
+            new_commitments = FeldmanVSSUtil.encode_commitments(combined)
+        elif scheme == GF256SecretSharing.SCHEME:
+            subshares = [cls.gf256_subshares(share, k_new, n_new) for share in key_shares]
+            ys = cls.gf256_combine(xs_old, subshares)
+            new_shares = [ShareCodecUtil.encode(scheme, k_new, n_new, j + 1, ys[j]) for j in range(n_new)]
+        elif scheme == PackedSharingUtil.SCHEME:
+            if len({(share.payload.nbytes, share.payload[0]) for share in key_shares}) != 1:
+                raise ValueError('分片打包参数不一致')
+            prefix = bytes(key_shares[0].payload[:1])
+            subshares = [cls.packed_subshares(share, xs_old, k_new, n_new) for share in key_shares]
+            ys = cls.packed_combine(subshares)
+            threshold = PackedSharingUtil.threshold(k_new, prefix[0])
+            new_shares = [
+                ShareCodecUtil.encode(scheme, threshold, n_new, j + 1, prefix + ys[j].tobytes()) for j in range(n_new)
+            ]
+        else:
+            raise ValueError('不支持的分片格式')
+
+        if len(records[0]) > 1:
+            ciphertext = IDAUtil.reconstruct_parsed([record[1] for record in records])
+            fragments = IDAUtil.disperse_payload(ciphertext, k_new, n_new)
+            new_shares = [share + fragment for share, fragment in zip(new_shares, fragments)]
+
+        return new_shares, new_commitments
+
+    @classmethod
+    def reshare_many(
+        cls, items: Sequence[Tuple[Sequence[bytes], Optional[bytes]]], k_new: int, n_new: int
+    ) -> List[Tuple[Optional[List[bytes]], Optional[bytes], Optional[str]]]:
+        """
+        批量重分享（可提交到进程池执行）
+
+        Returns:
+            (新分片, 新承诺, 错误信息) 列表，单个订单失败不影响其他订单
+        """
+        results = []
+        for shards, commitments in items:
+            try:
+                new_shares, new_commitments = cls.reshare_shards(shards, commitments, k_new, n_new)
+                results.append((new_shares, new_commitments, None))
+            except ValueError as e:
+                results.append((None, None, str(e)))
+        return results
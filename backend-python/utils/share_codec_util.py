@@ -0,0 +1,153 @@
+"""
+分片二进制编码工具类
+版本化的定长头部 + 原始字节载荷，解析基于 memoryview，不复制载荷
+"""
+
+import struct
+import zlib
+
+from typing import BinaryIO, List, NamedTuple, Optional
+
+BytesLike = bytes | bytearray | memoryview
+
+
+class BinaryShare(NamedTuple):
+    """解析后的二进制分片"""
+
+    version: int
+    scheme: int
+    k: int
+    n: int
+    x: int
+    payload: memoryview
+
+
+class ShareCodecUtil:
+    """
+    分片二进制编解码
+
+    头部布局（大端，共 13 字节）:
+        version(1) | scheme(1) | k(1) | n(1) | x(1) | payload_length(4) | crc32(4)
+    """
+
+    VERSION = 1
+
+    # 分片方案编号
+    SCHEME_SHAMIR_GF256 = 1
+    SCHEME_IDA_GF256 = 2
+    SCHEME_FELDMAN_ZQ = 3
+    SCHEME_PACKED_GF256 = 4
+
+    HEADER = struct.Struct('>BBBBBII')
+    HEADER_SIZE = HEADER.size
+
+    @classmethod
+    def encode(cls, scheme: int, k: int, n: int, x: int, payload: BytesLike) -> bytes:
+        """
+        编码分片
+
+        Args:
+            scheme: 分片方案编号
+            k: 阈值
+            n: 总分片数
+            x: 分片的 x 坐标
+            payload: 分片载荷
+
+        Returns:
+            二进制分片
+        """
+        return cls.encode_header(scheme, k, n, x, payload) + memoryview(payload).cast('B')
+
+    @classmethod
+    def encode_header(cls, scheme: int, k: int, n: int, x: int, payload: BytesLike) -> bytes:
+        """只编码头部，载荷可随后直接写入文件或套接字，避免拼接复制"""
+        payload = memoryview(payload).cast('B')
+        return cls.HEADER.pack(cls.VERSION, scheme, k, n, x, payload.nbytes, zlib.crc32(payload))
+
+    @classmethod
+    def decode(cls, data: BytesLike, verify: bool = True) -> BinaryShare:
+        """
+        解析分片，载荷以 memoryview 形式返回（零拷贝）
+
+        Args:
+            data: 二进制分片
+            verify: 是否校验 CRC32
+
+        Returns:
+            BinaryShare
+        """
+        view = memoryview(data).cast('B')
+        if view.nbytes < cls.HEADER_SIZE:
+            raise ValueError('分片数据过短')
+
+        version, scheme, k, n, x, length, checksum = cls.HEADER.unpack_from(view)
+        if version != cls.VERSION:
+            raise ValueError(f'不支持的分片版本: {version}')
+        if view.nbytes != cls.HEADER_SIZE + length:
+            raise ValueError('分片长度与头部不一致')
+
+        payload = view[cls.HEADER_SIZE :]
+        if verify and zlib.crc32(payload) != checksum:
+            raise ValueError('分片校验和不匹配')
+
+        return BinaryShare(version, scheme, k, n, x, payload)
+
+    @classmethod
+    def decode_all(cls, data: BytesLike, verify: bool = True) -> List[BinaryShare]:
+        """解析首尾相接存放的多个分片记录（如密钥分片 + 密文分片）"""
+        view = memoryview(data).cast('B')
+        records = []
+        offset = 0
+        while offset < view.nbytes:
+            if view.nbytes - offset < cls.HEADER_SIZE:
+                raise ValueError('分片数据过短')
+            length = cls.HEADER.unpack_from(view, offset)[5]
+            end = offset + cls.HEADER_SIZE + length
+            records.append(cls.decode(view[offset:end], verify))
+            offset = end
+        return records
+
+    @classmethod
+    def read_record(cls, reader: BinaryIO, verify: bool = True) -> Optional[BinaryShare]:
+        """
+        从流中读取一条分片记录
+
+        Args:
+            reader: 二进制输入流（文件、socket.makefile('rb') 等）
+            verify: 是否校验 CRC32
+
+        Returns:
+            BinaryShare，流已结束时返回None
+        """
+        header = read_exact(reader, cls.HEADER_SIZE)
+        if not header:
+            return None
+        if len(header) < cls.HEADER_SIZE:
+            raise ValueError('分片流被截断')
+
+        length = cls.HEADER.unpack_from(header)[5]
+        payload = read_exact(reader, length)
+        if len(payload) < length:
+            raise ValueError('分片流被截断')
+        return cls.decode(header + payload, verify)
+
+    @classmethod
+    def verify(cls, data: BytesLike) -> bool:
+        """校验分片格式与 CRC32（支持多条记录）"""
+        try:
+            return len(cls.decode_all(data)) > 0
+        except (ValueError, TypeError, struct.error):
+            return False
+
+
+def read_exact(reader: BinaryIO, size: int) -> bytes:
+    """读取恰好 size 字节，流结束时返回实际读到的字节（管道、套接字的 read 可能返回较少数据）"""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = reader.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return chunks[0] if len(chunks) == 1 else b''.join(chunks)